@@ -28,7 +28,6 @@ from rich.padding import Padding
 from rich.status import Status
 from rich.text import Text
 from rich.theme import Theme
-from rich.traceback import install
 from rich.tree import Tree
 from tabulate import tabulate
 
@@ -2474,6 +2473,7 @@ def main():
         spinner = Status('Initializing spinner', spinner=CLITheme.SPINNER, spinner_style=CLITheme.SPINNER_STYLE, console=console)
 
         if cli_config == 'rich':
+            from rich.traceback import install
             install(console=console, word_wrap=True, width=min(console.width, MAX_TRACEBACK_WIDTH))  # Make rich exception tracebacks the default.
             logger = setup_rich_logger(module_name=__name__, logger_name='user', verbose=args.verbose, console=console)
         else:
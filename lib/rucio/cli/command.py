@@ -21,10 +21,8 @@ import click
 from rich.console import Console
 from rich.status import Status
 from rich.theme import Theme
-from rich.traceback import install
 
 from rucio import version
-from rucio.cli.bin_legacy.rucio import ping, test_server, whoami_account
 from rucio.cli.utils import Arguments, exception_handler, get_client, setup_gfal2_logger, signal_handler
 from rucio.client.richclient import MAX_TRACEBACK_WIDTH, MIN_CONSOLE_WIDTH, CLITheme, get_cli_config, get_pager, setup_rich_logger
 from rucio.common.utils import setup_logger
@@ -206,6 +204,7 @@ def main(
     ctx.obj.tablefmt = 'psql'
 
     if use_rich:
+        from rich.traceback import install
         install(console=console, word_wrap=True, width=min(console.width, MAX_TRACEBACK_WIDTH))  # Make rich exception tracebacks the default.
         logger = setup_rich_logger(module_name=__name__, logger_name="user", verbose=verbose, console=console)
     else:
@@ -270,6 +269,7 @@ def _teardown(ctx):
 @main.command(name="whoami", help="Get information about account whose token is used")
 @click.pass_context
 def exe_whoami(ctx):
+    from rucio.cli.bin_legacy.rucio import whoami_account
     args = Arguments({"no_pager": ctx.obj.no_pager})
     whoami_account(args, ctx.obj.client, ctx.obj.logger, ctx.obj.console, ctx.obj.spinner)
 
@@ -277,6 +277,7 @@ def exe_whoami(ctx):
 @main.command(name="ping", help="Ping Rucio server")
 @click.pass_context
 def exe_ping(ctx):
+    from rucio.cli.bin_legacy.rucio import ping
     args = Arguments({"no_pager": ctx.obj.no_pager})
     ping(args, ctx.obj.client, ctx.obj.logger, ctx.obj.console, ctx.obj.spinner)
 
@@ -284,5 +285,6 @@ def exe_ping(ctx):
 @main.command(name="test-server", help="Test client against the server")
 @click.pass_context
 def exe_test_server(ctx):
+    from rucio.cli.bin_legacy.rucio import test_server
     args = Arguments({"no_pager": ctx.obj.no_pager})
     test_server(args, ctx.obj.client, ctx.obj.logger, ctx.obj.console, ctx.obj.spinner)
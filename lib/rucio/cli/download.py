@@ -37,7 +37,7 @@ from rucio.common.config import config_get_float
 @click.option(
     "--transfer-timeout",
     type=float,
-    default=config_get_float("download", "transfer_timeout", False, None),
+    default=config_get_float("download", "transfer_timeout", False, None, check_config_table=False),
     help="Transfer timeout (in seconds). Default: computed dynamically from --transfer-speed-timeout. If set to any value >= 0, --transfer-speed-timeout is ignored.",
 )  # NOQA: E501
 @click.option("--transfer-speed-timeout", type=float, default=None, help="Minimum allowed average transfer speed (in KBps). Default: 500. Used to dynamically compute the timeout if --transfer-timeout not set. Is not supported for --pfn.")  # NOQA: E501
@@ -33,7 +33,7 @@ from rucio.common.config import config_get_float
 @click.option("--protocol", help="Force the protocol to use")
 @click.option("--pfn", help="Specify the exact PFN for the upload")
 @click.option("--lfn", help="Specify the exact LFN for the upload")
-@click.option("--transfer-timeout", type=float, default=config_get_float("upload", "transfer_timeout", False, 360), help="Transfer timeout (in seconds)")
+@click.option("--transfer-timeout", type=float, default=config_get_float("upload", "transfer_timeout", False, 360, check_config_table=False), help="Transfer timeout (in seconds)")
 @click.option("-r", "--recursive", is_flag=True, default=False, help="Convert recursively the folder structure into collections")
 @click.pass_context
 def upload_command(ctx, file_paths, rse, lifetime, expiration_date, scope, impl, no_register, register_after_upload, summary, guid, protocol, pfn, lfn, transfer_timeout, recursive):
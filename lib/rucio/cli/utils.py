@@ -21,12 +21,11 @@ import subprocess  # noqa: S404 -- subprocess used for external commands
 import sys
 import traceback
 from configparser import NoOptionError, NoSectionError
-from functools import wraps
-from typing import Optional, Union
+from functools import cache, wraps
+from typing import TYPE_CHECKING, Optional, Union
 
 import click
 
-from rucio.client.client import Client
 from rucio.common.config import config_get
 from rucio.common.exception import (
     AccessDenied,
@@ -46,13 +45,22 @@ from rucio.common.exception import (
 )
 from rucio.common.utils import extract_scope, setup_logger
 
+if TYPE_CHECKING:
+    from rucio.client.client import Client
+
 SUCCESS = 0
 FAILURE = 1
 
 
-def exception_handler(function):
+@cache
+def _exception_logger() -> logging.Logger:
+    # Set up once: setup_logger reads the configuration file, and every CLI function is decorated
     verbosity = ("-v" in sys.argv) or ("--verbose" in sys.argv)
-    logger = setup_logger(module_name=__name__, logger_name="user", verbose=verbosity)
+    return setup_logger(module_name=__name__, logger_name="user", verbose=verbosity)
+
+
+def exception_handler(function):
+    logger = _exception_logger()
 
     @wraps(function)
     def new_funct(*args, **kwargs):
@@ -207,6 +215,9 @@ def get_client(args, logger):
     else:
         creds = None
 
+    # Imported here rather than at module level, so that the CLI starts without the whole client stack (e.g. for --help)
+    from rucio.client.client import Client
+
     try:
         client = Client(rucio_host=args.host, auth_host=args.auth_host, account=args.issuer, auth_type=auth_type, creds=creds, ca_cert=args.ca_certificate, timeout=args.timeout, user_agent=args.user_agent, vo=args.vo, logger=logger)
     except CannotAuthenticate as error:
@@ -276,7 +287,7 @@ def scope_exists(client: 'Client', scope: str) -> None:
         raise ScopeNotFound
 
 
-def get_scope(did: str, client: Client) -> tuple[str, str]:
+def get_scope(did: str, client: 'Client') -> tuple[str, str]:
     try:
         scope, name = extract_scope(did)
         return scope, name
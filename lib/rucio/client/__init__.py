@@ -12,4 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .client import Client  # noqa: F401
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .client import Client  # noqa: F401
+
+__all__ = ['Client']
+
+
+def __getattr__(name: str) -> Any:
+    # Client pulls every sub-client: only import it when it is used, so that importing
+    # a single client module (e.g. from the CLI) stays fast
+    if name == 'Client':
+        from .client import Client
+        return Client
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
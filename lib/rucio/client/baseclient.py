@@ -21,20 +21,26 @@ import getpass
 import json
 import os
 import secrets
+import socket
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from configparser import NoOptionError, NoSectionError
 from os import environ, fdopen, geteuid, makedirs
 from shutil import move
 from tempfile import mkstemp
-from typing import TYPE_CHECKING, Any, Optional
+from threading import RLock
+from types import GeneratorType
+from typing import TYPE_CHECKING, Any, Optional, TypeVar, Union
 from urllib.parse import urlparse
 
 import requests
 from dogpile.cache import make_region
 from requests import Response, Session
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError
 from requests.status_codes import codes
+from urllib3.connection import HTTPConnection
 
 from rucio import version
 from rucio.common import exception
@@ -42,12 +48,15 @@ from rucio.common.config import config_get, config_get_bool, config_get_int, con
 from rucio.common.constants import DEFAULT_VO, HTTPMethod
 from rucio.common.exception import CannotAuthenticate, ClientProtocolNotFound, ClientProtocolNotSupported, ConfigNotFound, MissingClientParameter, MissingModuleException, NoAuthInformation, ServerConnectionException
 from rucio.common.extra import import_extras
-from rucio.common.utils import build_url, get_tmp_dir, my_key_generator, parse_response, setup_logger, ssh_sign, wlcg_token_discovery
+from rucio.common.metadatacache import get_metadata_cache
+from rucio.common.utils import build_url, get_tmp_dir, my_key_generator, parse_response, parse_response_lines, setup_logger, ssh_sign, wlcg_token_discovery
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
+    from collections.abc import Callable, Generator, Iterable, Iterator
     from logging import Logger
 
+T = TypeVar('T')
+
 EXTRA_MODULES = import_extras(['requests_kerberos'])
 
 if EXTRA_MODULES['requests_kerberos']:
@@ -61,7 +70,12 @@ REGION = make_region(function_key_generator=my_key_generator).configure(
 )
 
 STATUS_CODES_TO_RETRY = [502, 503, 504]
+# Header of the paginated listings giving the cursor of the next page
+NEXT_CURSOR_HEADER = 'X-Rucio-Next-Cursor'
 MAX_RETRY_BACK_OFF_SECONDS = 10
+# Connections kept alive per host; also the default concurrency of BaseClient.bulk_call
+DEFAULT_POOL_SIZE = 10
+JSON_STREAM_CHUNK_SIZE = 1024 * 1024
 
 
 @REGION.cache_on_arguments(namespace='host_to_choose')
@@ -83,6 +97,26 @@ def _expand_path(path: str) -> str:
     return os.path.abspath(os.path.expanduser(os.path.expandvars(path)))
 
 
+def _cached_response(url: str, body: bytes) -> Response:
+    """Build the successful JSON response holding a body from the metadata cache."""
+    response = Response()
+    response.status_code = codes.ok
+    response.url = url
+    response.headers['Content-Type'] = 'application/json'
+    response.encoding = 'utf-8'
+    response._content = body
+    response._content_consumed = True
+    return response
+
+
+class KeepAliveHTTPAdapter(HTTPAdapter):
+    """HTTP adapter enabling TCP keep-alive probes on the pooled connections."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault('socket_options', HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)])
+        super().init_poolmanager(*args, **kwargs)
+
+
 class BaseClient:
 
     """Main client class for accessing Rucio resources. Handles the authentication."""
@@ -131,7 +165,12 @@ class BaseClient:
         """
 
         self.logger = logger
-        self.session = Session()
+        # The session is shared by all the threads using this client: the connection pool is thread-safe
+        self.pool_size = max(1, config_get_int('client', 'pool_size', False, DEFAULT_POOL_SIZE))
+        self.session = self._create_session()
+        self._token_lock = RLock()
+        # Opt-in persistent cache of slowly changing metadata, see _send_request(cache_kind=...)
+        self.metadata_cache = get_metadata_cache()
         self.user_agent = "%s/%s" % (user_agent, version.version_string())  # e.g. "rucio-clients/0.2.13"
         sys.argv[0] = sys.argv[0].split('/')[-1]
         self.script_id = '::'.join(sys.argv[0:2])
@@ -242,6 +281,64 @@ class BaseClient:
         except ValueError:
             self.logger.debug('request_retries must be an integer. Taking default.')
 
+    def _create_session(self) -> Session:
+        """
+        Create the HTTP session, with a pool of pool_size keep-alive connections per host.
+        TCP keep-alive probes prevent idle pooled connections from being silently dropped by firewalls.
+        """
+        session = Session()
+        for prefix in ('http://', 'https://'):
+            session.mount(prefix, KeepAliveHTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size))
+        return session
+
+    def bulk_call(
+            self,
+            function: "Callable[..., T]",
+            arguments: "Iterable[Union[tuple, dict[str, Any]]]",
+            num_threads: Optional[int] = None,
+            return_exceptions: bool = False
+    ) -> list[Union[T, Exception]]:
+        """
+        Call a client method once per set of arguments, concurrently, over the pooled connections.
+        Meant for many independent requests (e.g. get_metadata of thousands of DIDs), which
+        would otherwise each pay one round trip. Generators returned by the method are consumed
+        by the worker threads, so the streamed responses are read concurrently as well.
+
+        Parameters
+        ----------
+        function :
+            The method to call, e.g. client.get_metadata.
+        arguments :
+            One tuple of positional arguments or dictionary of keyword arguments per call.
+        num_threads :
+            The number of concurrent calls. Defaults to the size of the connection pool.
+        return_exceptions :
+            If True, the exception raised by a call is returned in place of its result.
+            Otherwise the first exception is raised.
+
+        Returns
+        -------
+        list
+            The results, in the order of the arguments. Generators are returned as lists.
+        """
+        def _call(args: "Union[tuple, dict[str, Any]]") -> "Union[T, Exception]":
+            try:
+                result = function(**args) if isinstance(args, dict) else function(*args)
+                if isinstance(result, GeneratorType):
+                    result = list(result)
+                return result
+            except Exception as error:
+                if return_exceptions:
+                    return error
+                raise
+
+        arguments = list(arguments)
+        num_threads = min(num_threads or self.pool_size, len(arguments))
+        if num_threads <= 1:
+            return [_call(args) for args in arguments]
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            return list(executor.map(_call, arguments))
+
     def _get_auth_tokens(self) -> tuple[Optional[str], str, str, str]:
         # if token file path is defined in the rucio.cfg file, use that file. Currently this prevents authenticating as another user or VO.
         auth_token_file_path = config_get('client', 'auth_token_file_path', False, None)
@@ -412,19 +509,50 @@ class BaseClient:
     def _load_json_data(self, response: requests.Response) -> 'Generator[Any, Any, Any]':
         """
         Helper method to correctly load json data based on the content type of the http response.
+        The compressed responses (Content-Encoding gzip, or zstd when urllib3 supports it) are
+        decoded by requests, which advertises the codings it can decode in Accept-Encoding.
 
         :param response: the response received from the server.
         """
         if 'content-type' in response.headers and response.headers['content-type'] == 'application/x-json-stream':
-            for line in response.iter_lines():
-                if line:
-                    yield parse_response(line)
+            # Large chunks split in bulk: iter_lines reads 512 bytes at a time
+            yield from parse_response_lines(response.iter_content(chunk_size=JSON_STREAM_CHUNK_SIZE))
         elif 'content-type' in response.headers and response.headers['content-type'] == 'application/json':
             yield parse_response(response.text)
         else:  # Exception ?
             if response.text:
                 yield response.text
 
+    def _list_pages(self, url: str, page_size: int, params: Optional[dict[str, Any]] = None) -> 'Iterator[Any]':
+        """
+        Helper method to read a listing paginated by the server with the limit and cursor parameters.
+        The next page is requested as soon as a page is received, while the caller consumes it.
+        The first page is requested before returning, so that its errors are raised by the call.
+
+        :param url: the http url of the listing.
+        :param page_size: the number of items per page.
+        :param params: the other query parameters of the listing.
+        :returns: an iterator over the items of all the pages.
+        """
+        params = dict(params or {}, limit=page_size)
+
+        def _get_page(cursor: Optional[str]) -> tuple[list[Any], Optional[str]]:
+            r = self._send_request(url, method=HTTPMethod.GET, params=dict(params, cursor=cursor) if cursor else params)
+            if r.status_code != codes.ok:
+                exc_cls, exc_msg = self._get_exception(headers=r.headers, status_code=r.status_code, data=r.content)
+                raise exc_cls(exc_msg)
+            return list(self._load_json_data(r)), r.headers.get(NEXT_CURSOR_HEADER)
+
+        def _pages(items: list[Any], cursor: Optional[str]) -> 'Iterator[Any]':
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                while cursor:
+                    next_page = executor.submit(_get_page, cursor)
+                    yield from items
+                    items, cursor = next_page.result()
+            yield from items
+
+        return _pages(*_get_page(None))
+
     def _reduce_data(self, data, maxlen: int = 132) -> str:
         if isinstance(data, dict):
             data = json.dumps(data)
@@ -443,10 +571,26 @@ class BaseClient:
         self.logger.warning("Waiting {}s due to reason: {} ".format(sleep_time, reason))
         time.sleep(sleep_time)
 
+    def _metadata_cache_key(self, url: str) -> str:
+        """The key of a request in the metadata cache: the same url may give different answers in different VOs."""
+        return '%s:%s' % (self.vo, url)
+
+    def _discard_cached(self, cache_kind: str, url: str) -> None:
+        """
+        Remove a response from the metadata cache, e.g. if its content turns out to be mutable.
+
+        :param cache_kind: the kind given to _send_request.
+        :param url: the url given to _send_request.
+        """
+        if self.metadata_cache is not None:
+            self.metadata_cache.delete(cache_kind, self._metadata_cache_key(url))
+
     def _send_request(self, url, method, headers=None, data=None, params=None, stream=False, get_token=False,
-                      cert=None, auth=None, verify=None):
+                      cert=None, auth=None, verify=None, cache_kind=None):
         """
         Helper method to send requests to the rucio server. Gets a new token and retries if an unauthorized error is returned.
+        GET requests given a cache_kind are served from the metadata cache if it is enabled and holds a fresh entry,
+        and expired entries are revalidated with their ETag.
 
         :param url: the http url to use.
         :param headers: additional http headers to send.
@@ -458,6 +602,8 @@ class BaseClient:
         :param auth: (optional) auth tuple to enable Basic/Digest/Custom HTTP Auth.
         :param verify: (optional) either a boolean, in which case it controls whether we verify the server's TLS
                        certificate, or a string, in which case it must be a path to a CA bundle to use.
+        :param cache_kind: (optional) the kind of metadata requested (e.g. 'rse'), selecting the time-to-live of the
+                           cached response. The query string must be part of the url.
         :return: the HTTP return body.
         """
         hds = {'X-Rucio-Auth-Token': self.auth_token, 'X-Rucio-VO': self.vo,
@@ -469,6 +615,18 @@ class BaseClient:
 
         if headers is not None:
             hds.update(headers)
+
+        cache_key = cache_entry = None
+        if cache_kind and method == HTTPMethod.GET and self.metadata_cache is not None:
+            cache_key = self._metadata_cache_key(url)
+            cache_entry = self.metadata_cache.get(cache_kind, cache_key)
+            if cache_entry is not None:
+                if cache_entry.fresh:
+                    self.logger.debug("HTTP request: %s %s served from the metadata cache" % (method.value, url))
+                    return _cached_response(url, cache_entry.body)
+                if cache_entry.etag:
+                    hds['If-None-Match'] = cache_entry.etag
+
         if verify is None:
             verify = self.ca_cert or False  # Maybe unnecessary but make sure to convert "" -> False
 
@@ -518,14 +676,23 @@ class BaseClient:
                 continue
 
             if result is not None and result.status_code == codes.unauthorized and not get_token:  # pylint: disable-msg=E1101
-                self.session = Session()
-                self.__get_token()
+                # Keep the pooled connections; only one thread gets a new token, the others reuse it
+                with self._token_lock:
+                    if self.auth_token == hds['X-Rucio-Auth-Token']:
+                        self.session.cookies.clear()
+                        self.__get_token()
                 hds['X-Rucio-Auth-Token'] = self.auth_token
             else:
                 break
 
         if result is None:
             raise ServerConnectionException
+        if cache_key is not None:
+            if result.status_code == codes.not_modified and cache_entry is not None:
+                self.metadata_cache.refresh(cache_kind, cache_key)
+                return _cached_response(url, cache_entry.body)
+            if result.status_code == codes.ok:
+                self.metadata_cache.set(cache_kind, cache_key, result.content, result.headers.get('ETag'))
         return result
 
     def __get_token_userpass(self) -> bool:
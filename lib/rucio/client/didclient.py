@@ -40,7 +40,8 @@ class DIDClient(BaseClient):
             filters: "Sequence[dict[str, Any]]",
             did_type: Literal['all', 'collection', 'dataset', 'container', 'file'] = 'collection',
             long: bool = False,
-            recursive: bool = False
+            recursive: bool = False,
+            page_size: Optional[int] = None
     ) -> "Iterator[dict[str, Any]]":
         """
         List all data identifiers in a scope which match a given pattern.
@@ -60,6 +61,9 @@ class DIDClient(BaseClient):
                 Long format option to display more information for each DID.
             recursive :
                 Recursively list DIDs content.
+            page_size :
+                If set and not recursive, the DIDs are requested by pages of this size, ordered by name,
+                instead of in a single response. The next page is fetched while the current one is read.
         """
         path = '/'.join([self.DIDS_BASEURL, quote_plus(scope), 'dids', 'search'])
 
@@ -79,6 +83,8 @@ class DIDClient(BaseClient):
         }
 
         url = build_url(choice(self.list_hosts), path=path, params=payload)
+        if page_size and not recursive:
+            return self._list_pages(url, page_size)
 
         r = self._send_request(url, method=HTTPMethod.GET)
 
@@ -485,7 +491,8 @@ class DIDClient(BaseClient):
     def list_content(
             self,
             scope: str,
-            name: str
+            name: str,
+            page_size: Optional[int] = None
     ) -> "Iterator[dict[str, Any]]":
         """
         List data identifier contents.
@@ -496,10 +503,15 @@ class DIDClient(BaseClient):
             The scope name.
         name :
             The data identifier name.
+        page_size :
+            If set, the contents are requested by pages of this size, ordered by scope and name,
+            instead of in a single response. The next page is fetched while the current one is read.
         """
 
         path = '/'.join([self.DIDS_BASEURL, quote_plus(scope), quote_plus(name), 'dids'])
         url = build_url(choice(self.list_hosts), path=path)
+        if page_size:
+            return self._list_pages(url, page_size)
         r = self._send_request(url, method=HTTPMethod.GET)
         if r.status_code == codes.ok:
             return self._load_json_data(r)
@@ -614,9 +626,13 @@ class DIDClient(BaseClient):
         elif dynamic:
             params['dynamic_depth'] = 'FILE'
         url = build_url(choice(self.list_hosts), path=path, params=params)
-        r = self._send_request(url, method=HTTPMethod.GET)
+        r = self._send_request(url, method=HTTPMethod.GET, cache_kind='did')
         if r.status_code == codes.ok:
-            return next(self._load_json_data(r))
+            did = next(self._load_json_data(r))
+            if did.get('type') != 'FILE':
+                # Only the file metadata (size, checksums) is immutable; collections change as content is attached
+                self._discard_cached('did', url)
+            return did
         else:
             exc_cls, exc_msg = self._get_exception(headers=r.headers, status_code=r.status_code, data=r.content)
             raise exc_cls(exc_msg)
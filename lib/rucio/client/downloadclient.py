@@ -23,21 +23,24 @@ import shutil
 import signal
 import subprocess  # noqa: S404 -- subprocess used for external commands
 import time
+import zlib
 from queue import Empty, Queue, deque
-from threading import Thread
+from threading import BoundedSemaphore, Event, Lock, Thread
 from typing import TYPE_CHECKING, Any, Optional
+from urllib.parse import urlparse
 
 from rucio import version
 from rucio.client.client import Client
-from rucio.common.checksum import CHECKSUM_ALGO_DICT, GLOBALLY_SUPPORTED_CHECKSUMS, PREFERRED_CHECKSUM, adler32
+from rucio.common.checksum import BLOCK_SIZE, CHECKSUM_ALGO_DICT, GLOBALLY_SUPPORTED_CHECKSUMS, PREFERRED_CHECKSUM, adler32, adler32_combine
 from rucio.common.client import detect_client_location
-from rucio.common.config import config_get
+from rucio.common.config import config_get, config_get_int
 from rucio.common.constants import DEFAULT_VO
 from rucio.common.didtype import DID
-from rucio.common.exception import InputValidationError, NoFilesDownloaded, NotAllFilesDownloaded, RucioException
+from rucio.common.exception import InputValidationError, NoFilesDownloaded, NotAllFilesDownloaded, RucioException, UnsupportedOperation
 from rucio.common.pcache import Pcache
 from rucio.common.utils import execute, extract_scope, generate_uuid, parse_replicas_from_file, parse_replicas_from_string, send_trace, sizefmt
 from rucio.rse import rsemanager as rsemgr
+from rucio.rse.protocols.protocol import RSEProtocol
 
 if TYPE_CHECKING:
     from collections.abc import Iterable, Iterator
@@ -198,6 +201,9 @@ class DownloadClient:
 
         self.client_location = detect_client_location()
 
+        # Cleared when the server turns out not to provide replica plans, to use the metalink instead
+        self._use_replicas_plan = True
+
         self.is_tape_excluded = True
         self.is_admin = False
         if check_admin:
@@ -222,6 +228,18 @@ class DownloadClient:
         self.use_cea_threshold = 10
         self.extraction_tools = []
 
+        # Concurrency limits of the download threads. A value of 0 disables the per-RSE or per-host limit.
+        self.max_threads = config_get_int('download', 'max_threads', False, 5)
+        self.max_threads_per_rse = config_get_int('download', 'max_threads_per_rse', False, 0)
+        self.max_threads_per_host = config_get_int('download', 'max_threads_per_host', False, 0)
+        self._semaphores = {}
+        self._semaphores_lock = Lock()
+        # Files of at least segmented_min_size bytes are downloaded in segments of segment_size bytes, fetched
+        # concurrently by segment_threads threads from all the sources able to read byte ranges. 0 disables it.
+        self.segmented_min_size = config_get_int('download', 'segmented_min_size', False, 0)
+        self.segment_size = max(1, config_get_int('download', 'segment_size', False, 64 * 1024 * 1024))
+        self.segment_threads = max(1, config_get_int('download', 'segment_threads', False, 4))
+
         # unzip <archive_file_path> <did_name> -d <dest_dir_path>
         extract_args = '%(archive_file_path)s %(file_to_extract)s -d %(dest_dir_path)s'
         self.extraction_tools.append(BaseExtractionTool('unzip', '-v', extract_args, logger=self.logger))
@@ -569,9 +587,8 @@ class DownloadClient:
         logger = self.logger
 
         num_files = len(input_items)
-        nlimit = 5
         num_threads = max(1, num_threads)
-        num_threads = min(num_files, num_threads, nlimit)
+        num_threads = min(num_files, num_threads, max(1, self.max_threads))
 
         input_queue = Queue()
         output_queue = Queue()
@@ -620,6 +637,7 @@ class DownloadClient:
         """
         This function runs as long as there are items in the input queue,
         downloads them and stores the output in the output queue.
+        The connected protocols are reused for all the items downloaded by this worker.
         (This function is meant to be used as class internal only)
 
         Parameters
@@ -638,6 +656,7 @@ class DownloadClient:
         logger = self.logger
 
         logger(logging.DEBUG, '%sStart processing queued downloads' % log_prefix)
+        protocols = {}
         while True:
             try:
                 item = input_queue.get_nowait()
@@ -646,7 +665,7 @@ class DownloadClient:
             try:
                 trace = copy.deepcopy(self.trace_tpl)
                 trace.update(trace_custom_fields)
-                download_result = self._download_item(item, trace, traces_copy_out, log_prefix)
+                download_result = self._download_item(item, trace, traces_copy_out, log_prefix, protocols=protocols)
                 output_queue.put(download_result)
             except KeyboardInterrupt:
                 logger(logging.WARNING, 'You pressed Ctrl+C! Exiting gracefully')
@@ -658,6 +677,257 @@ class DownloadClient:
                 item["clientState"] = "FAILED"
                 output_queue.put(item)
 
+        for protocol in protocols.values():
+            try:
+                protocol.close()
+            except Exception as error:
+                logger(logging.DEBUG, '%sFailed to close protocol: %s' % (log_prefix, error))
+
+    def _get_semaphores(self, rse_name: str, pfn: str) -> list[BoundedSemaphore]:
+        """
+        Get the semaphores limiting the number of concurrent downloads from the RSE and from the host of the PFN.
+        (This function is meant to be used as class internal only)
+
+        Parameters
+        ----------
+        rse_name :
+            Name of the RSE the file is downloaded from
+        pfn :
+            PFN of the file
+
+        Returns
+        -------
+
+            List of semaphores to acquire, in this order, before downloading
+        """
+        limits = []
+        if self.max_threads_per_rse > 0:
+            limits.append((('rse', rse_name), self.max_threads_per_rse))
+        if self.max_threads_per_host > 0:
+            limits.append((('host', urlparse(pfn).netloc or rse_name), self.max_threads_per_host))
+
+        semaphores = []
+        with self._semaphores_lock:
+            for key, limit in limits:
+                if key not in self._semaphores:
+                    self._semaphores[key] = BoundedSemaphore(limit)
+                semaphores.append(self._semaphores[key])
+        return semaphores
+
+    def _get_ranged_sources(
+            self,
+            item: dict[str, Any],
+            log_prefix: str
+    ) -> list[tuple[dict[str, Any], dict[str, Any]]]:
+        """
+        Get the sources of an item whose protocol can download byte ranges.
+        (This function is meant to be used as class internal only)
+
+        Parameters
+        ----------
+        item :
+            Dictionary describing the item to download
+        log_prefix :
+            String that will be put at the beginning of every log message
+
+        Returns
+        -------
+
+            List of (source, RSE info) tuples, in the order of the sources of the item
+        """
+        ranged_sources = []
+        for source in item.get('sources') or []:
+            try:
+                rse = rsemgr.get_rse_info(source['rse'], vo=self.client.vo)
+                protocol = rsemgr.create_protocol(rse, operation='read', scheme=source['pfn'].split(':')[0], impl=item.get('impl'),
+                                                  auth_token=self.auth_token, logger=self.logger)
+            except Exception as error:
+                self.logger(logging.DEBUG, '%sCannot use %s for a segmented download: %s' % (log_prefix, source['pfn'], error))
+                continue
+            if type(protocol).get_range is not RSEProtocol.get_range:
+                ranged_sources.append((source, rse))
+        return ranged_sources
+
+    def _download_segmented(
+            self,
+            item: dict[str, Any],
+            trace: dict[str, Any],
+            log_prefix: str
+    ) -> bool:
+        """
+        Download a file in segments fetched concurrently from all its sources able to read byte ranges.
+        The segments are written into the preallocated temporary file and their Adler-32 checksums are
+        combined to verify the file without reading it again. A failed segment is retried on the next source.
+        (This function is meant to be used as class internal only)
+
+        Parameters
+        ----------
+        item :
+            Dictionary describing the item to download
+        trace :
+            Dictionary representing a pattern of trace that will be send
+        log_prefix :
+            String that will be put at the beginning of every log message
+
+        Returns
+        -------
+
+            True if the file was downloaded and verified; otherwise the temporary file is removed
+        """
+        logger = self.logger
+        did_str = '%s:%s' % (item['scope'], item['name'])
+        ranged_sources = self._get_ranged_sources(item, log_prefix)
+        if not ranged_sources:
+            logger(logging.DEBUG, '%sNo source of %s supports byte ranges' % (log_prefix, did_str))
+            return False
+
+        size = item['bytes']
+        temp_file_path = item['temp_file_path']
+        with open(temp_file_path, 'wb') as temp_file:
+            temp_file.truncate(size)
+            if hasattr(os, 'posix_fallocate'):
+                try:
+                    os.posix_fallocate(temp_file.fileno(), 0, size)
+                except OSError as error:
+                    logger(logging.DEBUG, '%sCannot preallocate %s: %s' % (log_prefix, temp_file_path, error))
+
+        segment_queue = Queue()
+        segments = [(offset, min(self.segment_size, size - offset)) for offset in range(0, size, self.segment_size)]
+        for index, (offset, length) in enumerate(segments):
+            segment_queue.put((index, offset, length, 0))
+        segment_adlers = [None] * len(segments)
+        failed = Event()
+
+        trace['remoteSite'] = ranged_sources[0][0]['rse']
+        trace['clientState'] = FileDownloadState.DOWNLOAD_ATTEMPT
+        trace['protocol'] = ranged_sources[0][0]['pfn'].split(':')[0]
+        logger(logging.INFO, '%sDownloading %s in %s segments from %s' % (log_prefix, did_str, len(segments),
+                                                                          ', '.join(source['rse'] for source, _ in ranged_sources)))
+
+        transfer_timeout = self._compute_actual_transfer_timeout(item)
+        threads = [Thread(target=self._segment_worker,
+                          kwargs={'segment_queue': segment_queue,
+                                  'segment_adlers': segment_adlers,
+                                  'failed': failed,
+                                  'ranged_sources': ranged_sources,
+                                  'item': item,
+                                  'transfer_timeout': transfer_timeout,
+                                  'log_prefix': log_prefix})
+                   for _ in range(min(self.segment_threads, len(segments)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if failed.is_set() or None in segment_adlers:
+            logger(logging.WARNING, '%sSegmented download of %s failed' % (log_prefix, did_str))
+            trace['clientState'] = FileDownloadState.FAILED
+            os.unlink(temp_file_path)
+            return False
+
+        if not item.get('merged_options', {}).get('ignore_checksum', False):
+            rucio_checksum = item.get('adler32')
+            if rucio_checksum:
+                local_adler = 1
+                for (_, length), segment_adler in zip(segments, segment_adlers):
+                    local_adler = adler32_combine(local_adler, segment_adler, length)
+                local_checksum = '%08x' % local_adler
+                verified = rucio_checksum == local_checksum
+            else:
+                verified, rucio_checksum, local_checksum = _verify_checksum(item, temp_file_path)
+            if not verified:
+                logger(logging.WARNING, '%sChecksum validation failed for file: %s' % (log_prefix, did_str))
+                logger(logging.DEBUG, 'Local checksum: %s, Rucio checksum: %s' % (local_checksum, rucio_checksum))
+                trace['clientState'] = FileDownloadState.FAIL_VALIDATE
+                trace['stateReason'] = 'Checksum validation failed: Local checksum: %s, Rucio checksum: %s' % (local_checksum, rucio_checksum)
+                os.unlink(temp_file_path)
+                return False
+        return True
+
+    def _segment_worker(
+            self,
+            segment_queue: Queue,
+            segment_adlers: list[Optional[int]],
+            failed: Event,
+            ranged_sources: list[tuple[dict[str, Any], dict[str, Any]]],
+            item: dict[str, Any],
+            transfer_timeout: Optional[int],
+            log_prefix: str
+    ) -> None:
+        """
+        This function runs as long as there are segments in the queue, downloads them into the
+        temporary file of the item and stores the Adler-32 checksum of each segment.
+        Each worker connects its own protocols.
+        (This function is meant to be used as class internal only)
+
+        Parameters
+        ----------
+        segment_queue :
+            Queue of (index, offset, length, attempt) tuples
+        segment_adlers :
+            List where the Adler-32 checksum of each segment is stored at its index
+        failed :
+            Event set when a segment failed on all the sources
+        ranged_sources :
+            List of (source, RSE info) tuples able to download byte ranges
+        item :
+            Dictionary describing the item to download
+        transfer_timeout :
+            Timeout of each range download
+        log_prefix :
+            String that will be put at the beginning of every log message
+        """
+        logger = self.logger
+        temp_file_path = item['temp_file_path']
+        max_attempts = 2 * len(ranged_sources)
+        protocols = {}
+        try:
+            while not failed.is_set():
+                try:
+                    index, offset, length, attempt = segment_queue.get_nowait()
+                except Empty:
+                    break
+                # Spread the segments over the sources; a failed segment is retried on the next source
+                source, rse = ranged_sources[(index + attempt) % len(ranged_sources)]
+                pfn = source['pfn']
+                protocol_key = (source['rse'], pfn.split(':')[0])
+
+                semaphores = self._get_semaphores(source['rse'], pfn)
+                for semaphore in semaphores:
+                    semaphore.acquire()
+                try:
+                    protocol = protocols.get(protocol_key)
+                    if protocol is None:
+                        protocol = rsemgr.create_protocol(rse, operation='read', scheme=protocol_key[1], impl=item.get('impl'),
+                                                          auth_token=self.auth_token, logger=logger)
+                        protocol.connect()
+                        protocols[protocol_key] = protocol
+                    protocol.get_range(pfn, temp_file_path, offset, length, transfer_timeout=transfer_timeout)
+                except Exception as error:
+                    logger(logging.DEBUG, '%sFailed to download bytes %s-%s from %s: %s' % (log_prefix, offset, offset + length - 1, pfn, error))
+                    protocol = protocols.pop(protocol_key, None)
+                    if protocol is not None:
+                        try:
+                            protocol.close()
+                        except Exception:
+                            pass
+                    if attempt + 1 < max_attempts:
+                        segment_queue.put((index, offset, length, attempt + 1))
+                    else:
+                        failed.set()
+                    continue
+                finally:
+                    for semaphore in reversed(semaphores):
+                        semaphore.release()
+
+                segment_adlers[index] = _adler32_of_range(temp_file_path, offset, length)
+        finally:
+            for protocol in protocols.values():
+                try:
+                    protocol.close()
+                except Exception as error:
+                    logger(logging.DEBUG, '%sFailed to close protocol: %s' % (log_prefix, error))
+
     @staticmethod
     def _compute_actual_transfer_timeout(item: dict[str, Any]) -> int:
         """
@@ -701,7 +971,8 @@ class DownloadClient:
             item: dict[str, Any],
             trace: dict[str, Any],
             traces_copy_out: Optional[list[dict[str, Any]]],
-            log_prefix: str = ''
+            log_prefix: str = '',
+            protocols: Optional[dict[tuple[str, str, Optional[str]], "RSEProtocol"]] = None
     ) -> dict[str, Any]:
         """
         Downloads the given item and sends traces for success/failure.
@@ -717,6 +988,9 @@ class DownloadClient:
             Reference to an external list, where the traces should be uploaded
         log_prefix :
             String that will be put at the beginning of every log message
+        protocols :
+            Optional: connected protocols by (RSE, scheme, impl), reused across items and closed by the caller.
+            If None, a new protocol is connected and closed for this item.
 
         Returns
         -------
@@ -821,6 +1095,13 @@ class DownloadClient:
         # try different PFNs until one succeeded
         temp_file_path = item['temp_file_path']
         success = False
+        if self.segmented_min_size > 0 and (item.get('bytes') or 0) >= self.segmented_min_size and not pcache and not item.get('archive_items'):
+            start_time = time.time()
+            success = self._download_segmented(item, trace, log_prefix)
+            end_time = time.time()
+            if not success:
+                logger(logging.INFO, '%sFalling back to a single source download of %s' % (log_prefix, did_str))
+                self._send_trace(trace)
         i = 0
         while not success and i < len(sources):
             source = sources[i]
@@ -851,14 +1132,19 @@ class DownloadClient:
             if impl:
                 logger(logging.INFO, '%sUsing Implementation (impl): %s ' % (log_prefix, impl))
 
-            try:
-                protocol = rsemgr.create_protocol(rse, operation='read', scheme=scheme, impl=impl, auth_token=self.auth_token, logger=logger)
-                protocol.connect()
-            except Exception as error:
-                logger(logging.WARNING, '%sFailed to create protocol for PFN: %s' % (log_prefix, pfn))
-                logger(logging.DEBUG, 'scheme: %s, exception: %s' % (scheme, error))
-                trace['stateReason'] = str(error)
-                continue
+            protocol_key = (rse_name, scheme, impl)
+            protocol = protocols.get(protocol_key) if protocols is not None else None
+            if protocol is None:
+                try:
+                    protocol = rsemgr.create_protocol(rse, operation='read', scheme=scheme, impl=impl, auth_token=self.auth_token, logger=logger)
+                    protocol.connect()
+                except Exception as error:
+                    logger(logging.WARNING, '%sFailed to create protocol for PFN: %s' % (log_prefix, pfn))
+                    logger(logging.DEBUG, 'scheme: %s, exception: %s' % (scheme, error))
+                    trace['stateReason'] = str(error)
+                    continue
+                if protocols is not None:
+                    protocols[protocol_key] = protocol
 
             logger(logging.INFO, '%sUsing PFN: %s' % (log_prefix, pfn))
             attempt = 0
@@ -872,6 +1158,9 @@ class DownloadClient:
                     logger(logging.DEBUG, '%sDeleting existing temporary file: %s' % (log_prefix, temp_file_path))
                     os.unlink(temp_file_path)
 
+                semaphores = self._get_semaphores(rse_name, pfn)
+                for semaphore in semaphores:
+                    semaphore.acquire()
                 start_time = time.time()
 
                 try:
@@ -881,8 +1170,10 @@ class DownloadClient:
                     logger(logging.DEBUG, error)
                     trace['clientState'] = FileDownloadState.FAILED
                     trace['stateReason'] = str(error)
-
-                end_time = time.time()
+                finally:
+                    end_time = time.time()
+                    for semaphore in reversed(semaphores):
+                        semaphore.release()
 
                 if success and not item.get('merged_options', {}).get('ignore_checksum', False):
                     verified, rucio_checksum, local_checksum = _verify_checksum(item, temp_file_path)
@@ -897,7 +1188,12 @@ class DownloadClient:
                     logger(logging.WARNING, '%sDownload attempt failed. Try %s/%s' % (log_prefix, attempt, retries))
                     self._send_trace(trace)
 
-            protocol.close()
+            if protocols is None:
+                protocol.close()
+            elif not success:
+                # Do not reuse a connection to a source which failed
+                protocols.pop(protocol_key, None)
+                protocol.close()
 
         if not success:
             logger(logging.ERROR, '%sFailed to download file %s' % (log_prefix, did_str))
@@ -1360,6 +1656,36 @@ class DownloadClient:
             if not any_did_resolved and '*' not in did_name:
                 yield {'scope': scope, 'name': did_name}
 
+    def _list_file_sources(
+            self,
+            dids: list[dict[str, str]],
+            **kwargs
+    ) -> list[dict[str, Any]]:
+        """
+        List the files of DIDs with their sources sorted by priority, in a single request.
+        The compact replica plan of the server is used, or the metalink if the server
+        does not provide it.
+
+        Parameters
+        ----------
+        dids :
+            The DIDs, as dictionaries with the scope and the name.
+        **kwargs :
+            The options of the replica listing, as accepted by ``ReplicaClient.list_replicas_plan``.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            A dictionary per file, in the format of ``parse_replicas_metalink``.
+        """
+        if self._use_replicas_plan:
+            try:
+                return self.client.list_replicas_plan(dids, **kwargs)
+            except UnsupportedOperation:
+                self.logger(logging.DEBUG, 'The server does not provide replica plans, using the metalink')
+                self._use_replicas_plan = False
+        return parse_replicas_from_string(self.client.list_replicas(dids, metalink=True, **kwargs))  # type: ignore
+
     def _resolve_and_merge_input_items(
             self,
             input_items: list[dict[str, Any]],
@@ -1469,7 +1795,7 @@ class DownloadClient:
                           for item in item_group
                           for did in item.get('dids')}
 
-            # since we're using metalink we need to explicitly give all schemes
+            # without forced schemes, the server resolves all the supported ones
             schemes = item.get('force_scheme')
             if schemes:
                 schemes = schemes if isinstance(schemes, list) else [schemes]
@@ -1496,17 +1822,15 @@ class DownloadClient:
             if nrandom:
                 logger(logging.INFO, 'Selecting %d random replicas from DID(s): %s' % (nrandom, [str(did) for did in input_dids]))
 
-            metalink_str = self.client.list_replicas([{'scope': did.scope, 'name': did.name} for did in input_dids],
-                                                     schemes=schemes,
-                                                     ignore_availability=False,
-                                                     rse_expression=rse_expression,
-                                                     client_location=self.client_location,
-                                                     sort=sort,
-                                                     resolve_archives=not item.get('no_resolve_archives'),
-                                                     resolve_parents=True,
-                                                     nrandom=nrandom,
-                                                     metalink=True)
-            file_items = parse_replicas_from_string(metalink_str)  # type: ignore
+            file_items = self._list_file_sources([{'scope': did.scope, 'name': did.name} for did in input_dids],
+                                                 schemes=schemes,
+                                                 ignore_availability=False,
+                                                 rse_expression=rse_expression,
+                                                 client_location=self.client_location,
+                                                 sort=sort,
+                                                 resolve_archives=not item.get('no_resolve_archives'),
+                                                 resolve_parents=True,
+                                                 nrandom=nrandom)
             for file in file_items:
                 if impl:
                     file['impl'] = impl
@@ -1994,6 +2318,19 @@ class DownloadClient:
         return supported_impl
 
 
+def _adler32_of_range(path: str, offset: int, length: int) -> int:
+    value = 1
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        while length:
+            block = f.read(min(BLOCK_SIZE, length))
+            if not block:
+                raise RucioException('Unexpected end of file %s' % path)
+            value = zlib.adler32(block, value)
+            length -= len(block)
+    return value
+
+
 def _verify_checksum(
         item: dict[str, Any],
         path: str
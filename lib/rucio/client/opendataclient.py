@@ -34,7 +34,7 @@ class OpenDataClient(BaseClient):
     opendata_public_dids_base_url = f"{opendata_public_base_url}/dids"
     opendata_private_dids_base_url = f"{opendata_private_base_url}/dids"
 
-    opendata_host_from_config = config_get('client', 'opendata_host', raise_exception=False, default=None)
+    opendata_host_from_config = config_get('client', 'opendata_host', raise_exception=False, default=None, check_config_table=False)
 
     def get_opendata_host(self, *, public: bool) -> str:
         """
@@ -21,7 +21,8 @@ from requests.status_codes import codes
 
 from rucio.client.baseclient import BaseClient, choice
 from rucio.common.constants import HTTPMethod
-from rucio.common.utils import build_url, chunks, render_json
+from rucio.common.exception import UnsupportedOperation
+from rucio.common.utils import build_url, chunks, parse_replicas_plan, render_json
 
 
 class ReplicaClient(BaseClient):
@@ -252,6 +253,80 @@ class ReplicaClient(BaseClient):
         exc_cls, exc_msg = self._get_exception(headers=r.headers, status_code=r.status_code, data=r.content)
         raise exc_cls(exc_msg)
 
+    def list_replicas_plan(self, dids, schemes=None, ignore_availability=True,
+                           rse_expression=None, client_location=None, sort=None,
+                           domain=None, signature_lifetime=None, nrandom=None,
+                           resolve_archives=True, resolve_parents=False):
+        """
+        List the file replicas of many data identifiers (DIDs) in one compact response,
+        to plan their download. Contrary to the metalink of list_replicas, all the sources
+        are returned as columns which are decoded without XML parsing.
+
+        Parameters
+        ----------
+        dids:
+            The list of data identifiers (DIDs) like :
+            [{'scope': <scope1>, 'name': <name1>}, {'scope': <scope2>, 'name': <name2>}, ...]
+        schemes:
+            A list of schemes to filter the replicas. (e.g. file, http, ...). All the supported schemes by default.
+        ignore_availability:
+            Also include replicas from blocked RSEs into the list
+        rse_expression:
+            The RSE expression to restrict replicas on a set of RSEs.
+        client_location:
+            Client location dictionary for PFN modification {'ip', 'fqdn', 'site', 'latitude', 'longitude'}
+        sort:
+            Sort the replicas: ``geoip`` - based on src/dst IP topographical distance
+        domain:
+            Define the domain. Choose from ['wan', 'lan', 'all']. Otherwise, the server will choose based on the client's location.
+        signature_lifetime:
+            If supported, in seconds, restrict the lifetime of the signed PFN.
+        nrandom:
+            pick N random replicas. If the initial number of replicas is smaller than N, returns all replicas.
+        resolve_archives:
+            When set to True, find archives which contain the replicas.
+        resolve_parents:
+            When set to True, find all parent datasets which contain the replicas.
+
+        Returns
+        -------
+
+            A list of dictionaries, one per file, in the format of ``parse_replicas_metalink``.
+
+        Raises
+        ------
+        UnsupportedOperation
+            If the server does not provide the replica plans.
+        """
+        data = {'dids': dids,
+                'domain': domain,
+                'ignore_availability': ignore_availability,
+                'resolve_archives': resolve_archives,
+                'resolve_parents': resolve_parents}
+        if schemes:
+            data['schemes'] = schemes
+        if rse_expression:
+            data['rse_expression'] = rse_expression
+        if client_location:
+            data['client_location'] = client_location
+        if sort:
+            data['sort'] = sort
+        if signature_lifetime:
+            data['signature_lifetime'] = signature_lifetime
+        if nrandom:
+            data['nrandom'] = nrandom
+
+        url = build_url(choice(self.list_hosts),
+                        path='/'.join([self.REPLICAS_BASEURL, 'plan']))
+        r = self._send_request(url, method=HTTPMethod.POST, data=dumps(data))
+        if r.status_code == codes.ok:
+            return parse_replicas_plan(next(self._load_json_data(r)))
+        if r.status_code in (codes.not_found, codes.method_not_allowed) and 'ExceptionClass' not in r.headers:
+            # Servers without the endpoint route the request to another view, or to none
+            raise UnsupportedOperation('The server does not provide replica plans')
+        exc_cls, exc_msg = self._get_exception(headers=r.headers, status_code=r.status_code, data=r.content)
+        raise exc_cls(exc_msg)
+
     def list_suspicious_replicas(self, rse_expression=None, younger_than=None, nattempts=None):
         """
         List file replicas tagged as suspicious.
@@ -302,7 +302,7 @@ def get_cli_config() -> str:
 
     :returns: CLI type (Rich or tabulate)
     """
-    cli_type = config_get('experimental', 'cli', raise_exception=False, default='tabulate').lower()
+    cli_type = config_get('experimental', 'cli', raise_exception=False, default='tabulate', check_config_table=False).lower()
     if cli_type not in ['rich', 'tabulate']:
         cli_type = 'tabulate'
     return cli_type
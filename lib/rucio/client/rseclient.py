@@ -54,7 +54,7 @@ class RSEClient(BaseClient):
         path = '/'.join([self.RSE_BASEURL, rse])
         url = build_url(choice(self.list_hosts), path=path)
 
-        r = self._send_request(url, method=HTTPMethod.GET)
+        r = self._send_request(url, method=HTTPMethod.GET, cache_kind='rse')
         if r.status_code == codes.ok:
             rse_dict = loads(r.text)
             return rse_dict
@@ -367,7 +367,7 @@ class RSEClient(BaseClient):
         params['protocol_domain'] = protocol_domain
         url = build_url(choice(self.list_hosts), path=path, params=params)
 
-        r = self._send_request(url, method=HTTPMethod.GET)
+        r = self._send_request(url, method=HTTPMethod.GET, cache_kind='rse')
         if r.status_code == codes.ok:
             protocols = loads(r.text)
             return protocols
@@ -368,13 +368,16 @@ class RuleClient(BaseClient):
         exc_cls, exc_msg = self._get_exception(r.headers, r.status_code)
         raise exc_cls(exc_msg)
 
-    def list_replication_rules(self, filters: Optional[dict[str, Any]] = None) -> "Iterator[dict[str, Any]]":
+    def list_replication_rules(self, filters: Optional[dict[str, Any]] = None, page_size: Optional[int] = None) -> "Iterator[dict[str, Any]]":
         """
         List all replication rules which match a filter
         Parameters
         ----------
         filers:
             dictionary of attributes by which the rules should be filtered
+        page_size:
+            If set, the rules are requested by pages of this size, ordered by id, instead of
+            in a single response. The next page is fetched while the current one is read.
 
         Returns
         -------
@@ -383,6 +386,8 @@ class RuleClient(BaseClient):
         filters = filters or {}
         path = self.RULE_BASEURL + '/'
         url = build_url(choice(self.list_hosts), path=path)
+        if page_size:
+            return self._list_pages(url, page_size, params=filters)
         r = self._send_request(url, method=HTTPMethod.GET, params=filters)
         if r.status_code == codes.ok:
             return self._load_json_data(r)
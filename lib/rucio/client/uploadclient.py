@@ -21,13 +21,15 @@ import os.path
 import random
 import socket
 import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Final, Optional, Union, cast
 
 from rucio import version
 from rucio.client.client import Client
 from rucio.common.bittorrent import bittorrent_v2_merkle_sha256
-from rucio.common.checksum import GLOBALLY_SUPPORTED_CHECKSUMS, adler32, md5
+from rucio.common.checksum import GLOBALLY_SUPPORTED_CHECKSUMS, checksums
 from rucio.common.client import detect_client_location
 from rucio.common.config import config_get, config_get_bool, config_get_int
 from rucio.common.constants import DEFAULT_VO, RseAttr
@@ -46,7 +48,7 @@ from rucio.common.exception import (
     ScopeNotFound,
     ServiceUnavailable,
 )
-from rucio.common.utils import execute, generate_uuid, make_valid_did, retry, send_trace
+from rucio.common.utils import chunks, execute, generate_uuid, make_valid_did, retry, send_trace
 from rucio.rse import rsemanager as rsemgr
 
 if TYPE_CHECKING:
@@ -333,12 +335,6 @@ class UploadClient:
             upload_client.upload([dir_item], traces_copy_out=traces)
             ```
         """
-        # helper to get rse from rse_expression:
-        def _pick_random_rse(rse_expression: str) -> dict[str, Any]:
-            rses = [r['rse'] for r in self.client.list_rses(rse_expression)]  # can raise InvalidRSEExpression
-            random.shuffle(rses)
-            return rses[0]
-
         logger = self.logger
         self.trace['uuid'] = generate_uuid()
 
@@ -348,33 +344,10 @@ class UploadClient:
 
         # check if RSE of every file is available for writing
         # and cache rse settings
-        registered_dataset_dids = set()
-        registered_file_dids = set()
-        rse_expression = None
-        for file in files:
-            rse_expression = file['rse']
-            rse = self.rse_expressions.setdefault(rse_expression, _pick_random_rse(rse_expression))
-
-            if not self.rses.get(rse):
-                rse_settings = self.rses.setdefault(rse, rsemgr.get_rse_info(rse, vo=self.client.vo))
-                if not ignore_availability and rse_settings['availability_write'] != 1:
-                    raise RSEWriteBlocked('%s is not available for writing. No actions have been taken' % rse)
-
-            dataset_scope = file.get('dataset_scope')
-            dataset_name = file.get('dataset_name')
-            file['rse'] = rse
-            if dataset_scope and dataset_name:
-                dataset_did_str = ('%s:%s' % (dataset_scope, dataset_name))
-                file['dataset_did_str'] = dataset_did_str
-                registered_dataset_dids.add(dataset_did_str)
-
-            registered_file_dids.add('%s:%s' % (file['did_scope'], file['did_name']))
-        wrong_dids = registered_file_dids.intersection(registered_dataset_dids)
-        if len(wrong_dids):
-            raise InputValidationError('DIDs used to address both files and datasets: %s' % str(wrong_dids))
+        self._resolve_rses(files, ignore_availability=ignore_availability)
         logger(logging.DEBUG, 'Input validation done.')
 
-        # clear this set again to ensure that we only try to register datasets once
+        # ensure that we only try to register datasets once
         registered_dataset_dids = set()
         num_succeeded = 0
         summary = []
@@ -404,7 +377,6 @@ class UploadClient:
             file_did = {'scope': file['did_scope'], 'name': file['did_name']}
             dataset_did_str = file.get('dataset_did_str')
             rse_settings = self.rses[rse]
-            rse_sign_service = rse_settings.get('sign_url', None)
             is_deterministic = rse_settings.get('deterministic', True)
             if not is_deterministic and not pfn:
                 logger(logging.ERROR, 'PFN has to be defined for NON-DETERMINISTIC RSE.')
@@ -415,16 +387,7 @@ class UploadClient:
                 no_register = True
 
             # resolving local area networks
-            domain = 'wan'
-            rse_attributes = {}
-            try:
-                rse_attributes = self.client.list_rse_attributes(rse)
-            except Exception:
-                logger(logging.WARNING, 'Attributes of the RSE: %s not available.' % rse)
-            if self.client_location and 'lan' in rse_settings['domain'] and RseAttr.SITE in rse_attributes:
-                if self.client_location['site'] == rse_attributes[RseAttr.SITE]:
-                    domain = 'lan'
-            logger(logging.DEBUG, '{} domain is used for the upload'.format(domain))
+            rse_attributes, domain = self._get_rse_attributes_and_domain(rse, rse_settings)
 
             # FIXME:
             # Rewrite preferred_impl selection - also check test_upload.py/test_download.py and fix impl order (see FIXME there)
@@ -495,58 +458,13 @@ class UploadClient:
                     continue
 
             # protocol handling and upload
-            protocols = rsemgr.get_protocols_ordered(rse_settings=rse_settings,
-                                                     operation='write',
-                                                     scheme=force_scheme,
-                                                     domain=domain,
-                                                     impl=impl)
-            protocols.reverse()
-            success = False
-            state_reason = ''
-            logger(logging.DEBUG, str(protocols))
-            while not success and len(protocols):
-                protocol = protocols.pop()
-                cur_scheme = protocol['scheme']
-                logger(logging.INFO, 'Trying upload with %s to %s' % (cur_scheme, rse))
-                lfn: "LFNDict" = {'name': file['did_name'],
-                                  'scope': file['did_scope'],
-                                  'filename': basename}
-
-                for checksum_name in GLOBALLY_SUPPORTED_CHECKSUMS:
-                    if checksum_name in file:
-                        lfn[checksum_name] = file[checksum_name]
-
-                lfn['filesize'] = file['bytes']
-
-                sign_service = None
-                if cur_scheme == 'https':
-                    sign_service = rse_sign_service
-
-                trace['protocol'] = cur_scheme
-                trace['transferStart'] = time.time()
-                logger(logging.DEBUG, 'Processing upload with the domain: {}'.format(domain))
-                try:
-                    pfn = self._upload_item(rse_settings=rse_settings,
-                                            rse_attributes=rse_attributes,
-                                            lfn=lfn,
-                                            source_dir=file['dirname'],
-                                            domain=domain,
-                                            impl=impl,
-                                            force_scheme=cur_scheme,
-                                            force_pfn=pfn,
-                                            transfer_timeout=file.get('transfer_timeout'),
-                                            delete_existing=delete_existing,
-                                            sign_service=sign_service)
-                    logger(logging.DEBUG, 'Upload done.')
-                    success = True
-                    file['upload_result'] = {0: True, 1: None, 'success': True, 'pfn': pfn}  # TODO: needs to be removed
-                except (ServiceUnavailable,
-                        ResourceTemporaryUnavailable,
-                        RSEOperationNotSupported,
-                        RucioException) as error:
-                    logger(logging.WARNING, 'Upload attempt failed')
-                    logger(logging.INFO, 'Exception: %s' % str(error), exc_info=True)
-                    state_reason = str(error)
+            success, state_reason = self._upload_with_protocols(file,
+                                                                rse_settings=rse_settings,
+                                                                rse_attributes=rse_attributes,
+                                                                domain=domain,
+                                                                trace=trace,
+                                                                pfn=pfn,
+                                                                delete_existing=delete_existing)
 
             if success:
                 trace['transferEnd'] = time.time()
@@ -596,26 +514,7 @@ class UploadClient:
                 logger(logging.ERROR, 'Failed to upload file %s' % basename)
 
         if summary_file_path:
-            logger(logging.DEBUG, 'Summary will be available at {}'.format(summary_file_path))
-            final_summary = {}
-            for file in summary:
-                file_scope = file['did_scope']
-                file_name = file['did_name']
-                file_did_str = '%s:%s' % (file_scope, file_name)
-                final_summary[file_did_str] = {'scope': file_scope,
-                                               'name': file_name,
-                                               'bytes': file['bytes'],
-                                               'rse': file['rse'],
-                                               'pfn': file['upload_result'].get('pfn', ''),
-                                               'guid': file['meta']['guid']}
-
-                for checksum_name in GLOBALLY_SUPPORTED_CHECKSUMS:
-                    if checksum_name in file:
-                        final_summary[file_did_str][checksum_name] = file[checksum_name]
-
-            summary_path = Path(summary_file_path)
-            with summary_path.open('w') as summary_file:
-                json.dump(final_summary, summary_file, sort_keys=True, indent=1)
+            self._write_summary(summary, summary_file_path)
 
         if num_succeeded == 0:
             raise NoFilesUploaded()
@@ -623,6 +522,520 @@ class UploadClient:
             raise NotAllFilesUploaded()
         return 0
 
+    def upload_pipelined(
+            self,
+            items: "Iterable[FileToUploadDict]",
+            num_threads: int = 4,
+            summary_file_path: Optional[Union[str, os.PathLike[str]]] = None,
+            traces_copy_out: Optional[list["TraceBaseDict"]] = None,
+            ignore_availability: bool = False,
+            activity: Optional[str] = None,
+            max_threads_per_rse: Optional[int] = None,
+            registration_chunk_size: int = 1000
+    ) -> int:
+        """
+        Uploads many files concurrently and registers them in bulk once they are on storage.
+
+        This is a throughput oriented variant of `upload`, for directories with many files:
+
+        1. Collects the file info, computing the checksums of the local files in parallel.
+
+        2. Creates the datasets, and checks which file DIDs are already registered, with
+            a few bulk calls.
+
+        3. Transfers the files with `num_threads` concurrent uploads, at most
+            `max_threads_per_rse` of them to the same RSE.
+
+        4. Registers the replicas, attaches them to their datasets and creates the file
+            rules in batches of `registration_chunk_size` files.
+
+        Every file is registered after its upload, as with `register_after_upload`, so a
+        failed transfer does not leave a registered but missing replica. Explicit `pfn`
+        values and non-deterministic RSEs are not supported; use `upload` for them.
+
+        Parameters
+        ----------
+        items
+            A sequence of dictionaries describing the files or directories to upload, as
+            for `upload`. The `register_after_upload` key is implied.
+        num_threads
+            The number of concurrent checksum computations and transfers.
+        summary_file_path
+            If specified, a JSON file is created with a summary of each successfully uploaded file.
+        traces_copy_out
+            A list reference for collecting the trace dictionaries of each file.
+        ignore_availability
+            If set to True, the RSE's "write availability" is not enforced.
+        activity
+            The activity of the rules created for files uploaded without a parent dataset.
+        max_threads_per_rse
+            The maximum number of concurrent transfers to one RSE. Defaults to the
+            `[upload] max_threads_per_rse` configuration option; 0 means no limit.
+        registration_chunk_size
+            The maximum number of files registered, attached or protected by a rule in one call.
+
+        Returns
+        -------
+        int
+            Status code (``0`` if all files were uploaded successfully).
+
+        Raises
+        ------
+        NoFilesUploaded
+            Raised if none of the requested files could be uploaded.
+        NotAllFilesUploaded
+            Raised if some files were successfully uploaded, but others failed.
+        RSEWriteBlocked
+            Raised if `ignore_availability=False` but the chosen RSE does not allow writing.
+        InputValidationError
+            Raised if the input items are invalid or use an unsupported option.
+        """
+        logger = self.logger
+        self.trace['uuid'] = generate_uuid()
+        num_threads = max(1, num_threads)
+        if max_threads_per_rse is None:
+            max_threads_per_rse = config_get_int('upload', 'max_threads_per_rse', False, 0)
+
+        files = self._collect_and_validate_file_info(items, num_threads=num_threads)
+        logger(logging.DEBUG, 'Num. of files that upload client is processing: {}'.format(len(files)))
+        self._resolve_rses(files, ignore_availability=ignore_availability)
+        for file in files:
+            if file.get('pfn'):
+                raise InputValidationError('Upload with a given PFN is not supported in pipelined mode: %s' % file['path'])
+            if not self.rses[file['rse']].get('deterministic', True):
+                raise InputValidationError('Pipelined upload to the non-deterministic RSE %s is not supported' % file['rse'])
+        logger(logging.DEBUG, 'Input validation done.')
+
+        rse_contexts = {}
+        for rse in set(file['rse'] for file in files):
+            rse_contexts[rse] = self._get_rse_attributes_and_domain(rse, self.rses[rse])
+
+        # Datasets are created before the transfers, as `upload` does, so that an invalid lifetime is rejected early
+        registered_dataset_dids = set()
+        for file in files:
+            if file.get('dataset_did_str') and not file.get('no_register'):
+                self._register_dataset(file, registered_dataset_dids)
+
+        # File DIDs which are already in the catalog are not registered again, but their checksum must match
+        existing_dids = {}
+        dids_to_check = [{'scope': file['did_scope'], 'name': file['did_name']} for file in files if not file.get('no_register')]
+        for chunk in chunks(dids_to_check, registration_chunk_size):
+            try:
+                for meta in self.client.get_metadata_bulk(chunk):
+                    existing_dids[meta['scope'], meta['name']] = meta
+            except DataIdentifierNotFound:
+                pass
+
+        def _transfer(file: "FileToUploadWithCollectedInfoDict", trace: "TraceBaseDict") -> tuple[bool, str]:
+            rse = file['rse']
+            rse_settings = self.rses[rse]
+            rse_attributes, domain = rse_contexts[rse]
+            file_did = {'scope': file['did_scope'], 'name': file['did_name']}
+            meta = existing_dids.get((file['did_scope'], file['did_name']))
+            if meta and str(meta['adler32']).lstrip('0') != str(file['adler32']).lstrip('0'):
+                logger(logging.ERROR, 'Local checksum %s does not match remote checksum %s' % (file['adler32'], meta['adler32']))
+                return False, 'Checksum mismatch with the registered file DID'
+            delete_existing = False
+            if rsemgr.exists(rse_settings, file_did, domain=domain, scheme=file.get('force_scheme'), impl=file.get('impl'),
+                             auth_token=self.auth_token, vo=self.client.vo, logger=logger):
+                if (file['did_scope'], file['did_name']) in existing_dids or file.get('no_register'):
+                    logger(logging.INFO, 'File %s already exists on RSE. Skipping upload.' % file['basename'])
+                    return False, 'File already exists'
+                logger(logging.INFO, 'File %s already exists on RSE. Previous left overs will be overwritten.' % file['basename'])
+                delete_existing = True
+            return self._upload_with_protocols(file,
+                                               rse_settings=rse_settings,
+                                               rse_attributes=rse_attributes,
+                                               domain=domain,
+                                               trace=trace,
+                                               delete_existing=delete_existing)
+
+        traces = []
+        for file in files:
+            trace = copy.deepcopy(self.trace)
+            if traces_copy_out is not None:
+                traces_copy_out.append(trace)
+            trace['scope'] = file['did_scope']
+            trace['datasetScope'] = file.get('dataset_scope', '')
+            trace['dataset'] = file.get('dataset_name', '')
+            trace['remoteSite'] = file['rse']
+            trace['filesize'] = file['bytes']
+            traces.append(trace)
+
+        # The transfers are queued per RSE and only submitted while their RSE is below `max_threads_per_rse`,
+        # so that no worker of the pool waits for a busy RSE when the transfers to other RSEs could run
+        pending = {}
+        for file, trace in zip(files, traces):
+            pending.setdefault(file['rse'], deque()).append((file, trace))
+        running_per_rse = dict.fromkeys(pending, 0)
+
+        uploaded = []
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            future_to_file = {}
+
+            def _submit_ready() -> None:
+                for rse, queue in pending.items():
+                    while queue and len(future_to_file) < num_threads and (max_threads_per_rse <= 0 or running_per_rse[rse] < max_threads_per_rse):
+                        file, trace = queue.popleft()
+                        future_to_file[executor.submit(_transfer, file, trace)] = (file, trace)
+                        running_per_rse[rse] += 1
+
+            _submit_ready()
+            while future_to_file:
+                done, _ = wait(future_to_file, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file, trace = future_to_file.pop(future)
+                    running_per_rse[file['rse']] -= 1
+                    try:
+                        success, state_reason = future.result()
+                    except Exception as error:
+                        success, state_reason = False, str(error)
+                    if success:
+                        trace['transferEnd'] = time.time()
+                        trace['clientState'] = 'DONE'
+                        file['state'] = 'A'
+                        logger(logging.INFO, 'Successfully uploaded file %s' % file['basename'])
+                        self._send_trace(cast("TraceDict", trace))
+                        uploaded.append(file)
+                    elif state_reason == 'File already exists':
+                        trace['stateReason'] = state_reason
+                    else:
+                        trace['clientState'] = 'FAILED'
+                        trace['stateReason'] = state_reason
+                        self._send_trace(cast('TraceDict', trace))
+                        logger(logging.ERROR, 'Failed to upload file %s' % file['basename'])
+                _submit_ready()
+
+        failed_registrations = self._register_files_bulk([file for file in uploaded if not file.get('no_register')],
+                                                         existing_dids,
+                                                         ignore_availability=ignore_availability,
+                                                         activity=activity,
+                                                         chunk_size=registration_chunk_size)
+        succeeded = [file for file in uploaded if (file['did_scope'], file['did_name']) not in failed_registrations]
+
+        if summary_file_path:
+            self._write_summary(succeeded, summary_file_path)
+
+        if not succeeded:
+            raise NoFilesUploaded()
+        elif len(succeeded) != len(files):
+            raise NotAllFilesUploaded()
+        return 0
+
+    def _resolve_rses(
+            self,
+            files: "Iterable[FileToUploadWithCollectedInfoDict]",
+            ignore_availability: bool = False
+    ) -> None:
+        """
+        Pick the RSE of every file from its RSE expression and cache the RSE settings.
+
+        Parameters
+        ----------
+        files
+            The files to upload. Their `rse` is replaced by the picked RSE and
+            `dataset_did_str` is set for files with a dataset.
+        ignore_availability
+            If set to True, the RSE's "write availability" is not enforced.
+
+        Raises
+        ------
+        RSEWriteBlocked
+            Raised if `ignore_availability=False` but a chosen RSE does not allow writing.
+        InputValidationError
+            Raised if the same DID is used for a file and a dataset.
+        """
+        # helper to get rse from rse_expression:
+        def _pick_random_rse(rse_expression: str) -> dict[str, Any]:
+            rses = [r['rse'] for r in self.client.list_rses(rse_expression)]  # can raise InvalidRSEExpression
+            random.shuffle(rses)
+            return rses[0]
+
+        registered_dataset_dids = set()
+        registered_file_dids = set()
+        for file in files:
+            rse_expression = file['rse']
+            rse = self.rse_expressions.setdefault(rse_expression, _pick_random_rse(rse_expression))
+
+            if not self.rses.get(rse):
+                rse_settings = self.rses.setdefault(rse, rsemgr.get_rse_info(rse, vo=self.client.vo))
+                if not ignore_availability and rse_settings['availability_write'] != 1:
+                    raise RSEWriteBlocked('%s is not available for writing. No actions have been taken' % rse)
+
+            dataset_scope = file.get('dataset_scope')
+            dataset_name = file.get('dataset_name')
+            file['rse'] = rse
+            if dataset_scope and dataset_name:
+                dataset_did_str = ('%s:%s' % (dataset_scope, dataset_name))
+                file['dataset_did_str'] = dataset_did_str
+                registered_dataset_dids.add(dataset_did_str)
+
+            registered_file_dids.add('%s:%s' % (file['did_scope'], file['did_name']))
+        wrong_dids = registered_file_dids.intersection(registered_dataset_dids)
+        if len(wrong_dids):
+            raise InputValidationError('DIDs used to address both files and datasets: %s' % str(wrong_dids))
+
+    def _get_rse_attributes_and_domain(
+            self,
+            rse: str,
+            rse_settings: "RSESettingsDict"
+    ) -> tuple[dict[str, Any], str]:
+        """
+        Get the attributes of the RSE and the network domain to use to upload to it.
+
+        The 'lan' domain is used if the RSE supports it and is at the site of the client.
+
+        Parameters
+        ----------
+        rse
+            The RSE name.
+        rse_settings
+            The dictionary containing the RSE configuration.
+
+        Returns
+        -------
+        tuple[dict[str, Any], str]
+            The RSE attributes (empty if they are not available) and the domain.
+        """
+        domain = 'wan'
+        rse_attributes = {}
+        try:
+            rse_attributes = self.client.list_rse_attributes(rse)
+        except Exception:
+            self.logger(logging.WARNING, 'Attributes of the RSE: %s not available.' % rse)
+        if self.client_location and 'lan' in rse_settings['domain'] and RseAttr.SITE in rse_attributes:
+            if self.client_location['site'] == rse_attributes[RseAttr.SITE]:
+                domain = 'lan'
+        self.logger(logging.DEBUG, '{} domain is used for the upload'.format(domain))
+        return rse_attributes, domain
+
+    def _upload_with_protocols(
+            self,
+            file: "FileToUploadWithCollectedInfoDict",
+            rse_settings: "RSESettingsDict",
+            rse_attributes: dict[str, Any],
+            domain: str,
+            trace: "TraceBaseDict",
+            pfn: Optional[str] = None,
+            delete_existing: bool = False
+    ) -> tuple[bool, str]:
+        """
+        Upload a file, trying the write protocols of the RSE by order of priority until one succeeds.
+
+        Parameters
+        ----------
+        file
+            The file to upload. On success, its `upload_result` is set.
+        rse_settings
+            The dictionary containing the RSE configuration.
+        rse_attributes
+            The attributes of the RSE.
+        domain
+            The network domain to use.
+        trace
+            The trace of the file, updated with the protocol and the transfer start.
+        pfn
+            If provided, forces the use of this PFN for the file location on the storage.
+        delete_existing
+            If True, removes any unregistered file on the storage that matches the PFN.
+
+        Returns
+        -------
+        tuple[bool, str]
+            Whether the upload succeeded, and the reason of the last failure.
+        """
+        logger = self.logger
+        protocols = rsemgr.get_protocols_ordered(rse_settings=rse_settings,
+                                                 operation='write',
+                                                 scheme=file.get('force_scheme'),
+                                                 domain=domain,
+                                                 impl=file.get('impl'))
+        protocols.reverse()
+        success = False
+        state_reason = ''
+        logger(logging.DEBUG, str(protocols))
+        while not success and len(protocols):
+            protocol = protocols.pop()
+            cur_scheme = protocol['scheme']
+            logger(logging.INFO, 'Trying upload with %s to %s' % (cur_scheme, rse_settings['rse']))
+            lfn: "LFNDict" = {'name': file['did_name'],
+                              'scope': file['did_scope'],
+                              'filename': file['basename']}
+
+            for checksum_name in GLOBALLY_SUPPORTED_CHECKSUMS:
+                if checksum_name in file:
+                    lfn[checksum_name] = file[checksum_name]
+
+            lfn['filesize'] = file['bytes']
+
+            sign_service = None
+            if cur_scheme == 'https':
+                sign_service = rse_settings.get('sign_url', None)
+
+            trace['protocol'] = cur_scheme
+            trace['transferStart'] = time.time()
+            logger(logging.DEBUG, 'Processing upload with the domain: {}'.format(domain))
+            try:
+                pfn = self._upload_item(rse_settings=rse_settings,
+                                        rse_attributes=rse_attributes,
+                                        lfn=lfn,
+                                        source_dir=file['dirname'],
+                                        domain=domain,
+                                        impl=file.get('impl'),
+                                        force_scheme=cur_scheme,
+                                        force_pfn=pfn,
+                                        transfer_timeout=file.get('transfer_timeout'),
+                                        delete_existing=delete_existing,
+                                        sign_service=sign_service)
+                logger(logging.DEBUG, 'Upload done.')
+                success = True
+                file['upload_result'] = {0: True, 1: None, 'success': True, 'pfn': pfn}  # TODO: needs to be removed
+            except (ServiceUnavailable,
+                    ResourceTemporaryUnavailable,
+                    RSEOperationNotSupported,
+                    RucioException) as error:
+                logger(logging.WARNING, 'Upload attempt failed')
+                logger(logging.INFO, 'Exception: %s' % str(error), exc_info=True)
+                state_reason = str(error)
+        return success, state_reason
+
+    def _register_files_bulk(
+            self,
+            files: list["FileToUploadWithCollectedInfoDict"],
+            existing_dids: "Mapping[tuple[str, str], Mapping[str, Any]]",
+            ignore_availability: bool = False,
+            activity: Optional[str] = None,
+            chunk_size: int = 1000
+    ) -> set[tuple[str, str]]:
+        """
+        Register uploaded files in the catalog with bulk calls.
+
+        New file DIDs are registered with their replicas in batches, attached to their datasets
+        and, if they have no dataset, protected by a rule. File DIDs which were already
+        registered go through `_register_file`, which checks their checksum.
+
+        Parameters
+        ----------
+        files
+            The uploaded files to register. Their datasets must already exist.
+        existing_dids
+            The metadata of the file DIDs already in the catalog, by (scope, name).
+        ignore_availability
+            If True, creates replication rules even when the RSE is marked unavailable.
+        activity
+            The activity of the rules created for files without a dataset.
+        chunk_size
+            The maximum number of files per call.
+
+        Returns
+        -------
+        set[tuple[str, str]]
+            The (scope, name) of the files whose registration failed.
+        """
+        logger = self.logger
+        failed = set()
+        new_files_per_rse = {}
+        for file in files:
+            key = (file['did_scope'], file['did_name'])
+            if key in existing_dids:
+                try:
+                    self._register_file(file, registered_dataset_dids={file.get('dataset_did_str')},
+                                        ignore_availability=ignore_availability, activity=activity)
+                except Exception as error:
+                    failed.add(key)
+                    logger(logging.ERROR, 'Failed to register file %s: %s' % (file['basename'], str(error)))
+            else:
+                new_files_per_rse.setdefault(file['rse'], []).append(file)
+
+        for rse, rse_files in new_files_per_rse.items():
+            for chunk in chunks(rse_files, chunk_size):
+                try:
+                    self.client.add_replicas(rse=rse, files=[self._convert_file_for_api(file) for file in chunk])
+                    logger(logging.INFO, 'Successfully added %d replicas in Rucio catalogue at %s' % (len(chunk), rse))
+                except Exception as error:
+                    failed.update((file['did_scope'], file['did_name']) for file in chunk)
+                    logger(logging.ERROR, 'Failed to add %d replicas at %s: %s' % (len(chunk), rse, str(error)))
+            if config_get_bool('client', 'register_bittorrent_meta', default=False):
+                for file in rse_files:
+                    if (file['did_scope'], file['did_name']) not in failed:
+                        self._add_bittorrent_meta(file=file)
+
+        registered_new_files = [file for rse_files in new_files_per_rse.values() for file in rse_files
+                                if (file['did_scope'], file['did_name']) not in failed]
+
+        # Attach the new and the existing files to their dataset
+        files_per_dataset = {}
+        for file in files:
+            if file.get('dataset_did_str') and (file['did_scope'], file['did_name']) not in failed:
+                files_per_dataset.setdefault((file['dataset_scope'], file['dataset_name']), []).append(file)
+        for (dataset_scope, dataset_name), dataset_files in files_per_dataset.items():
+            for chunk in chunks(dataset_files, chunk_size):
+                try:
+                    self.client.attach_dids_to_dids([{'scope': dataset_scope,
+                                                      'name': dataset_name,
+                                                      'dids': [{'scope': file['did_scope'], 'name': file['did_name']} for file in chunk]}],
+                                                    ignore_duplicate=True)
+                except Exception as error:
+                    failed.update((file['did_scope'], file['did_name']) for file in chunk)
+                    logger(logging.ERROR, 'Failed to attach files to the dataset %s:%s' % (dataset_scope, dataset_name))
+                    logger(logging.DEBUG, 'Attaching to dataset {}'.format(str(error)))
+
+        # Only need to add rules for new files if no dataset is given
+        files_per_rule = {}
+        for file in registered_new_files:
+            if not file.get('dataset_did_str'):
+                files_per_rule.setdefault((file['rse'], file.get('lifetime')), []).append(file)
+        for (rse, lifetime), rule_files in files_per_rule.items():
+            for chunk in chunks(rule_files, chunk_size):
+                try:
+                    self.client.add_replication_rule([{'scope': file['did_scope'], 'name': file['did_name']} for file in chunk],
+                                                     copies=1,
+                                                     rse_expression=rse,
+                                                     lifetime=lifetime,
+                                                     ignore_availability=ignore_availability,
+                                                     activity=activity)
+                    logger(logging.INFO, 'Successfully added replication rules at %s for %d files' % (rse, len(chunk)))
+                except Exception as error:
+                    failed.update((file['did_scope'], file['did_name']) for file in chunk)
+                    logger(logging.ERROR, 'Failed to add replication rules at %s: %s' % (rse, str(error)))
+        return failed
+
+    def _write_summary(
+            self,
+            files: "Iterable[Mapping[str, Any]]",
+            summary_file_path: Union[str, os.PathLike[str]]
+    ) -> None:
+        """
+        Write the JSON summary of the uploaded files.
+
+        Parameters
+        ----------
+        files
+            The successfully uploaded files.
+        summary_file_path
+            The path of the summary file.
+        """
+        self.logger(logging.DEBUG, 'Summary will be available at {}'.format(summary_file_path))
+        final_summary = {}
+        for file in files:
+            file_scope = file['did_scope']
+            file_name = file['did_name']
+            file_did_str = '%s:%s' % (file_scope, file_name)
+            final_summary[file_did_str] = {'scope': file_scope,
+                                           'name': file_name,
+                                           'bytes': file['bytes'],
+                                           'rse': file['rse'],
+                                           'pfn': file['upload_result'].get('pfn', ''),
+                                           'guid': file['meta']['guid']}
+
+            for checksum_name in GLOBALLY_SUPPORTED_CHECKSUMS:
+                if checksum_name in file:
+                    final_summary[file_did_str][checksum_name] = file[checksum_name]
+
+        summary_path = Path(summary_file_path)
+        with summary_path.open('w') as summary_file:
+            json.dump(final_summary, summary_file, sort_keys=True, indent=1)
+
     def _add_bittorrent_meta(
             self,
             file: "Mapping[str, Any]"
@@ -700,27 +1113,7 @@ class UploadClient:
 
         rse = file['rse']
         dataset_did_str = file.get('dataset_did_str')
-        # register a dataset if we need to
-        if dataset_did_str and dataset_did_str not in registered_dataset_dids:
-            registered_dataset_dids.add(dataset_did_str)
-            try:
-                logger(logging.DEBUG, 'Trying to create dataset: %s' % dataset_did_str)
-                self.client.add_dataset(scope=file['dataset_scope'],
-                                        name=file['dataset_name'],
-                                        meta=file.get('dataset_meta'),
-                                        rules=[{'account': self.client.account,
-                                                'copies': 1,
-                                                'rse_expression': rse,
-                                                'grouping': 'DATASET',
-                                                'lifetime': file.get('lifetime')}])
-                logger(logging.INFO, 'Successfully created dataset %s' % dataset_did_str)
-            except DataIdentifierAlreadyExists:
-                logger(logging.INFO, 'Dataset %s already exists - no rule will be created' % dataset_did_str)
-                if file.get('lifetime') is not None:
-                    raise InputValidationError(
-                        'Dataset %s exists and lifetime %s given. Prohibited to modify parent dataset lifetime.' % (dataset_did_str, file.get('lifetime')))
-        else:
-            logger(logging.DEBUG, 'Skipping dataset registration')
+        self._register_dataset(file, registered_dataset_dids)
 
         file_scope = file['did_scope']
         file_name = file['did_name']
@@ -758,6 +1151,51 @@ class UploadClient:
                                                  activity=activity)
                 logger(logging.INFO, 'Successfully added replication rule at %s' % rse)
 
+    def _register_dataset(
+            self,
+            file: "Mapping[str, Any]",
+            registered_dataset_dids: set[str]
+    ) -> None:
+        """
+        Create the dataset of a file with its rule, unless it was already handled.
+
+        Parameters
+        ----------
+        file
+            A dictionary containing file information, including the optional 'dataset_did_str'.
+        registered_dataset_dids
+            A set of dataset DIDs already registered to avoid duplicates.
+
+        Raises
+        ------
+        InputValidationError
+            If the dataset already exists, but the caller attempts to set a new lifetime for it.
+        """
+        logger = self.logger
+        rse = file['rse']
+        dataset_did_str = file.get('dataset_did_str')
+        # register a dataset if we need to
+        if dataset_did_str and dataset_did_str not in registered_dataset_dids:
+            registered_dataset_dids.add(dataset_did_str)
+            try:
+                logger(logging.DEBUG, 'Trying to create dataset: %s' % dataset_did_str)
+                self.client.add_dataset(scope=file['dataset_scope'],
+                                        name=file['dataset_name'],
+                                        meta=file.get('dataset_meta'),
+                                        rules=[{'account': self.client.account,
+                                                'copies': 1,
+                                                'rse_expression': rse,
+                                                'grouping': 'DATASET',
+                                                'lifetime': file.get('lifetime')}])
+                logger(logging.INFO, 'Successfully created dataset %s' % dataset_did_str)
+            except DataIdentifierAlreadyExists:
+                logger(logging.INFO, 'Dataset %s already exists - no rule will be created' % dataset_did_str)
+                if file.get('lifetime') is not None:
+                    raise InputValidationError(
+                        'Dataset %s exists and lifetime %s given. Prohibited to modify parent dataset lifetime.' % (dataset_did_str, file.get('lifetime')))
+        else:
+            logger(logging.DEBUG, 'Skipping dataset registration')
+
     def _get_file_guid(
             self,
             file: "Mapping[str, Any]"
@@ -821,8 +1259,8 @@ class UploadClient:
         """
         Collects and returns essential file descriptors (e.g., size, checksums, GUID, etc.).
 
-        This method computes the file's size, calculates its Adler-32 and MD5 checksums,
-        and retrieves the file's GUID. These values, along with other existing fields from
+        This method computes the file's size, calculates its Adler-32 and MD5 checksums
+        in a single pass over the file, and retrieves the file's GUID. These values, along with other existing fields from
         the input dictionary, are returned in a new dictionary.
 
         Parameters
@@ -845,8 +1283,10 @@ class UploadClient:
         new_item['basename'] = os.path.basename(filepath)
 
         new_item['bytes'] = os.stat(filepath).st_size
-        new_item['adler32'] = adler32(filepath)
-        new_item['md5'] = md5(filepath)
+        # Both checksums are computed while reading the file only once
+        file_checksums = checksums(filepath, ['adler32', 'md5'])
+        new_item['adler32'] = file_checksums['adler32']
+        new_item['md5'] = file_checksums['md5']
         new_item['meta'] = {'guid': self._get_file_guid(new_item)}
         new_item['state'] = 'C'
         if not new_item.get('did_scope'):
@@ -858,7 +1298,8 @@ class UploadClient:
 
     def _collect_and_validate_file_info(
             self,
-            items: "Iterable[FileToUploadDict]"
+            items: "Iterable[FileToUploadDict]",
+            num_threads: int = 1
     ) -> list["FileToUploadWithCollectedInfoDict"]:
         """
         Collect and verify local file info for upload, optionally registering folders as
@@ -890,6 +1331,9 @@ class UploadClient:
 
             * **`recursive`** (optional):
                 Whether to traverse directories recursively
+        num_threads
+            The number of files whose checksums are computed concurrently. Files found
+            by a recursive traversal are always processed sequentially.
 
         Returns
         -------
@@ -903,7 +1347,8 @@ class UploadClient:
             If no valid files are found.
         """
         logger = self.logger
-        files: list["FileToUploadWithCollectedInfoDict"] = []
+        # Either a (path, item) tuple for a file whose info must be collected or a list of already collected files
+        entries: list[Union[tuple["PathTypeAlias", "FileToUploadDict"], list["FileToUploadWithCollectedInfoDict"]]] = []
         for item in items:
             path = item.get('path')
             pfn = item.get('pfn')
@@ -927,23 +1372,36 @@ class UploadClient:
             if os.path.isdir(path) and not recursive:
                 dname, subdirs, fnames = next(os.walk(path))
                 for fname in fnames:
-                    file = self._collect_file_info(os.path.join(dname, fname), item)
-                    files.append(file)
+                    entries.append((os.path.join(dname, fname), item))
                 if not len(fnames) and not len(subdirs):
                     logger(logging.WARNING, 'Skipping %s because it is empty.' % dname)
                 elif not len(fnames):
                     logger(logging.WARNING,
                            'Skipping %s because it has no files in it. Subdirectories are not supported.' % dname)
             elif os.path.isdir(path) and recursive:
-                files.extend(cast("list[FileToUploadWithCollectedInfoDict]", self._collect_files_recursive(item)))
+                entries.append(cast("list[FileToUploadWithCollectedInfoDict]", self._collect_files_recursive(item)))
             elif os.path.isfile(path) and not recursive:
-                file = self._collect_file_info(path, item)
-                files.append(file)
+                entries.append((path, item))
             elif os.path.isfile(path) and recursive:
                 logger(logging.WARNING, 'Skipping %s because of --recursive flag' % path)
             else:
                 logger(logging.WARNING, 'No such file or directory: %s' % path)
 
+        to_collect = [entry for entry in entries if isinstance(entry, tuple)]
+        if num_threads > 1 and len(to_collect) > 1:
+            # The checksum functions release the GIL while hashing, so the files are read and hashed concurrently
+            with ThreadPoolExecutor(max_workers=num_threads) as executor:
+                collected = iter(list(executor.map(lambda entry: self._collect_file_info(*entry), to_collect)))
+        else:
+            collected = (self._collect_file_info(*entry) for entry in to_collect)
+
+        files: list["FileToUploadWithCollectedInfoDict"] = []
+        for entry in entries:
+            if isinstance(entry, tuple):
+                files.append(next(collected))
+            else:
+                files.extend(entry)
+
         if not len(files):
             raise InputValidationError('No valid input files given')
 
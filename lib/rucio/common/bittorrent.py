@@ -11,19 +11,32 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import copy
 import hashlib
 import itertools
 import math
 import os
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import TYPE_CHECKING, Any, Optional, Union
 
 from rucio.common.exception import RucioException
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
     from _typeshed import FileDescriptorOrPath
 
+# by the bittorrent v2 specification, the block size and the
+# minimum piece size are both fixed to 16KiB
+_BLOCK_SIZE = 16384
+_BLOCK_SIZE_POW2 = 14  # 2 ** 14 == 16 KiB
+# sha256 requires 2 ** 5 == 32 Bytes == 256 bits
+_BLOCK_PADDING = bytes(32)
+# The file is read and hashed by chunks of whole pieces, of at least this size
+_CHUNK_SIZE = 8 * 1024 * 1024
+
 
 def _next_pow2(num: int) -> int:
     if not num:
@@ -71,7 +84,37 @@ def bittorrent_v2_piece_length(file_size: int) -> int:
     return 2 ** _bittorrent_v2_piece_length_pow2(file_size)
 
 
-def bittorrent_v2_merkle_sha256(file: "FileDescriptorOrPath") -> tuple[bytes, bytes, int]:
+def _merkle_root(leafs: "Sequence[bytes]", nb_levels: int, padding: bytes) -> bytes:
+    """
+    Build the root of the merkle hash tree from the (possibly incomplete) leafs layer.
+    If len(leafs) < 2 ** nb_levels, it will be padded with the padding repeated as many times
+    as needed to have 2 ** nb_levels leafs in total.
+
+    Each level is built in one batch. The subtrees made only of padding all have the same
+    hash, so it is computed once per level instead of once per node.
+    """
+    nodes = list(leafs)
+    for _ in range(nb_levels):
+        if len(nodes) % 2:
+            nodes.append(padding)
+        nodes = [hashlib.sha256(nodes[i] + nodes[i + 1]).digest() for i in range(0, len(nodes), 2)]
+        padding = hashlib.sha256(padding + padding).digest()
+    return nodes[0] if nodes else padding
+
+
+def _piece_hashes(data: bytes, block_per_piece_pow2: int) -> list[bytes]:
+    """
+    Compute the merkle roots of the pieces contained in data, a chunk of the file starting
+    at a piece boundary. Only the last piece of the chunk can be incomplete.
+    """
+    view = memoryview(data)
+    block_hashes = [hashlib.sha256(view[i:i + _BLOCK_SIZE]).digest() for i in range(0, len(view), _BLOCK_SIZE)]
+    block_per_piece = 2 ** block_per_piece_pow2
+    return [_merkle_root(block_hashes[i:i + block_per_piece], nb_levels=block_per_piece_pow2, padding=_BLOCK_PADDING)
+            for i in range(0, len(block_hashes), block_per_piece)]
+
+
+def bittorrent_v2_merkle_sha256(file: "FileDescriptorOrPath", num_threads: "Optional[int]" = None) -> tuple[bytes, bytes, int]:
     """
     Compute the .torrent v2 hash tree for the given file.
     (http://www.bittorrent.org/beps/bep_0052.html)
@@ -79,83 +122,52 @@ def bittorrent_v2_merkle_sha256(file: "FileDescriptorOrPath") -> tuple[bytes, by
     tree of the file, the 'piece layers' as described in the
     previous BEP, and the chosen `piece size`
 
-    This function will read the file in chunks of 16KiB
-    (which is the imposed block size by bittorrent v2) and compute
-    the sha256 hash of each block. When enough blocks are read
-    to form a `piece`, will compute the merkle hash root of the
-    piece from the hashes of its blocks. At the end, the hashes
-    of pieces are combined to create the global pieces_root.
-    """
+    The file is read in large chunks aligned on the pieces. The sha256
+    hash of each 16KiB block (which is the imposed block size by
+    bittorrent v2) and the merkle hash root of each piece are computed
+    chunk by chunk, in worker threads if num_threads > 1: hashlib
+    releases the GIL while hashing, so the chunks are hashed on several
+    cores while the next ones are read. At the end, the hashes of pieces
+    are combined to create the global pieces_root.
 
-    # by the bittorrent v2 specification, the block size and the
-    # minimum piece size are both fixed to 16KiB
-    block_size = 16384
-    block_size_pow2 = 14  # 2 ** 14 == 16 KiB
-    # sha256 requires 2 ** 5 == 32 Bytes == 256 bits
-    hash_size = 32
-
-    def _merkle_root(leafs: list[bytes], nb_levels: int, padding: bytes) -> bytes:
-        """
-        Build the root of the merkle hash tree from the (possibly incomplete) leafs layer.
-        If len(leafs) < 2 ** nb_levels, it will be padded with the padding repeated as many times
-        as needed to have 2 ** nb_levels leafs in total.
-        """
-        nodes = copy.copy(leafs)
-        level = nb_levels
-
-        while level > 0:
-            for i in range(2 ** (level - 1)):
-                node1 = nodes[2 * i] if 2 * i < len(nodes) else padding
-                node2 = nodes[2 * i + 1] if 2 * i + 1 < len(nodes) else padding
-                h = hashlib.sha256(node1)
-                h.update(node2)
-                if i < len(nodes):
-                    nodes[i] = h.digest()
-                else:
-                    nodes.append(h.digest())
-            level -= 1
-        return nodes[0] if nodes else padding
+    :param file: file name
+    :param num_threads: The number of hashing threads; by default one per CPU, up to 8.
+    """
+    if num_threads is None:
+        num_threads = min(os.cpu_count() or 1, 8)
 
     file_size = os.stat(file).st_size
     piece_length_pow2 = _bittorrent_v2_piece_length_pow2(file_size)
 
-    block_per_piece_pow2 = piece_length_pow2 - block_size_pow2
+    block_per_piece_pow2 = piece_length_pow2 - _BLOCK_SIZE_POW2
     piece_length = 2 ** piece_length_pow2
-    block_per_piece = 2 ** block_per_piece_pow2
     piece_num = math.ceil(file_size / piece_length)
+    chunk_size = max(_CHUNK_SIZE // piece_length, 1) * piece_length
 
-    remaining = file_size
-    remaining_in_block = min(file_size, block_size)
-    block_hashes = []
+    read = 0
     piece_hashes = []
-    current_hash = hashlib.sha256()
-    block_padding = bytes(hash_size)
     with open(file, 'rb') as f:
-        while True:
-            data = f.read(remaining_in_block)
-            if not data:
-                break
-
-            current_hash.update(data)
-
-            remaining_in_block -= len(data)
-            remaining -= len(data)
-
-            if not remaining_in_block:
-                block_hashes.append(current_hash.digest())
-                if len(block_hashes) == block_per_piece or not remaining:
-                    piece_hashes.append(_merkle_root(block_hashes, nb_levels=block_per_piece_pow2, padding=block_padding))
-                    block_hashes = []
-                current_hash = hashlib.sha256()
-                remaining_in_block = min(block_size, remaining)
-
-            if not remaining:
-                break
+        chunks = iter(partial(f.read, chunk_size), b'')
+        if num_threads > 1:
+            with ThreadPoolExecutor(max_workers=num_threads) as executor:
+                # Bound the number of chunks in memory
+                pending = deque()
+                for data in chunks:
+                    read += len(data)
+                    if len(pending) >= 2 * num_threads:
+                        piece_hashes.extend(pending.popleft().result())
+                    pending.append(executor.submit(_piece_hashes, data, block_per_piece_pow2))
+                while pending:
+                    piece_hashes.extend(pending.popleft().result())
+        else:
+            for data in chunks:
+                read += len(data)
+                piece_hashes.extend(_piece_hashes(data, block_per_piece_pow2))
 
-    if remaining or remaining_in_block or len(piece_hashes) != piece_num:
+    if read != file_size or len(piece_hashes) != piece_num:
         raise RucioException(f'Error while computing merkle sha256 of {file}')
 
-    piece_padding = _merkle_root([], nb_levels=block_per_piece_pow2, padding=block_padding)
+    piece_padding = _merkle_root([], nb_levels=block_per_piece_pow2, padding=_BLOCK_PADDING)
     pieces_root = _merkle_root(piece_hashes, nb_levels=_next_pow2(piece_num), padding=piece_padding)
     pieces_layers = b''.join(piece_hashes) if len(piece_hashes) > 1 else b''
 
@@ -12,17 +12,39 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import TYPE_CHECKING, Optional
+import inspect
+import pickle  # noqa: S403 -- values written by this process only
+import time
+from collections import OrderedDict
+from functools import wraps
+from threading import Event, Lock
+from typing import TYPE_CHECKING, Any, Optional, TypeVar
 
+from dogpile.cache.api import NO_VALUE
+from dogpile.cache.backends.memcached import PyMemcacheBackend
+from dogpile.cache.backends.null import NullBackend
+from dogpile.cache.proxy import ProxyBackend
 from dogpile.cache.region import CacheRegion
+from typing_extensions import ParamSpec
 
-from rucio.common.config import config_get, is_client
+from rucio.common.config import config_get, config_get_bool, config_get_float, config_get_int, is_client
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Hashable, Iterable, Mapping, Sequence
+
+T = TypeVar('T')
+P = ParamSpec('P')
 
 
 CACHE_URL = config_get('cache', 'url', False, '127.0.0.1:11211', check_config_table=False)
+LOCAL_EXPIRATION_TIME = config_get_int('cache', 'local_expiration_time', False, 5, check_config_table=False)
+LOCAL_SIZE = config_get_int('cache', 'local_size', False, 1000, check_config_table=False)
+# Interval in seconds between two updates of the hit and miss counters of the local caches
+METRICS_INTERVAL = 10
+# Concurrent identical reads of the gateway are executed once, and their result served for this many seconds
+COALESCE_READS = config_get_bool('cache', 'coalesce_reads', False, True, check_config_table=False)
+COALESCE_EXPIRATION_TIME = config_get_float('cache', 'coalesce_expiration_time', False, 1.0, check_config_table=False)
+COALESCE_SIZE = config_get_int('cache', 'coalesce_size', False, 10000, check_config_table=False)
 
 ENABLE_CACHING = True
 _mc_client = None
@@ -79,32 +101,359 @@ class MemcacheRegion(CacheRegion):
             self.configure('dogpile.cache.null')
 
 
-class CacheKey:
+_COUNTER_LOCK = Lock()
+
+
+def incr_counter(region: CacheRegion, key: str, delta: int) -> Optional[int]:
+    """
+    Add delta to the integer counter kept in the region at key, created at 0.
+
+    With memcached, the counter is updated by the server with incr, so that the concurrent
+    updates of several processes all count. With the other backends, the update is only
+    atomic within this process.
+
+    :param region: The cache region.
+    :param key: The key of the counter, which must not be used for other values.
+    :param delta: The non-negative number to add, 0 to read the counter.
+    :returns: The new value of the counter, or None if it cannot be kept.
     """
-    Helper class to generate cache keys
-    based on sections and options.
+    backend = region.backend
+    while isinstance(backend, ProxyBackend):
+        backend = backend.proxied
+    if isinstance(backend, NullBackend):
+        return None
+    if isinstance(backend, PyMemcacheBackend):
+        try:
+            client = backend.client
+            client.add(key, b'0', noreply=False)
+            value = client.incr(key, delta, noreply=False)
+        except Exception:
+            return None
+        return None if value is None else int(value)
+    with _COUNTER_LOCK:
+        value = region.get(key)
+        value = (0 if value is NO_VALUE else value) + delta
+        region.set(key, value)
+    return value
+
+
+class LocalCacheProxy(ProxyBackend):
     """
+    Bounded in-process LRU cache in front of a dogpile backend.
+
+    The values are kept pickled, so that the callers get their own copy as with memcached.
+    Concurrent lookups of a key missing from the local cache wait for the first one instead
+    of all going to the backend. The hits and misses are counted per region, and the
+    latency of the backend lookups is measured.
+    """
+
+    def __init__(self, name: str, expiration_time: int, size: int):
+        """
+        :param name: The name of the region, used in the metrics.
+        :param expiration_time: The time in seconds a value is served without asking the backend.
+        :param size: The maximum number of values kept.
+        """
+        super().__init__()
+        self.name = name
+        self.expiration_time = expiration_time
+        self.size = size
+        self._values = OrderedDict()
+        self._pending = {}
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._metrics_time = time.monotonic()
+
+        from rucio.core.monitor import MetricManager
+        metrics = MetricManager(module=__name__)
+        self._counter = metrics.counter('local.{region}.{result}', documentation='Lookups in the local caches of the memcache regions')
+        self._timer = metrics.timer('local.{region}.backend_get', documentation='Lookups in memcache after a local cache miss')
+
+    def _get_local(self, key: str, now: float) -> Any:
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None or entry[0] <= now:
+                return NO_VALUE
+            self._values.move_to_end(key)
+            self._hits += 1
+        return pickle.loads(entry[1])  # noqa: S301 -- values written by this process only
+
+    def _set_local(self, key: str, value: Any) -> None:
+        if value is NO_VALUE:
+            return
+        entry = (time.monotonic() + self.expiration_time, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        with self._lock:
+            self._values[key] = entry
+            self._values.move_to_end(key)
+            while len(self._values) > self.size:
+                self._values.popitem(last=False)
+
+    def _record_metrics(self, now: float) -> None:
+        if now - self._metrics_time < METRICS_INTERVAL:
+            return
+        with self._lock:
+            hits, misses, self._hits, self._misses = self._hits, self._misses, 0, 0
+            self._metrics_time = now
+        self._counter.labels(region=self.name, result='hit').inc(hits)
+        self._counter.labels(region=self.name, result='miss').inc(misses)
 
-    @staticmethod
-    def _generate_key(*args: str) -> str:
-        return '_'.join(args)
+    def get(self, key: str) -> Any:
+        now = time.monotonic()
+        value = self._get_local(key, now)
+        if value is NO_VALUE:
+            with self._lock:
+                self._misses += 1
+                pending = self._pending.get(key)
+                leader = pending is None
+                if leader:
+                    pending = self._pending[key] = Event()
+            if leader:
+                try:
+                    with self._timer.labels(region=self.name):
+                        value = self.proxied.get(key)
+                    self._set_local(key, value)
+                finally:
+                    with self._lock:
+                        del self._pending[key]
+                    pending.set()
+            else:
+                pending.wait(timeout=1)
+                value = self._get_local(key, time.monotonic())
+                if value is NO_VALUE:
+                    value = self.proxied.get(key)
+        self._record_metrics(now)
+        return value
 
-    @staticmethod
-    def has_section(section: str) -> str:
-        return CacheKey._generate_key('has_section', section)
+    def get_multi(self, keys: "Sequence[str]") -> list[Any]:
+        return [self.get(key) for key in keys]
 
-    @staticmethod
-    def options(section: str) -> str:
-        return CacheKey._generate_key('options', section)
+    def set(self, key: str, value: Any) -> None:
+        self.proxied.set(key, value)
+        self._set_local(key, value)
 
-    @staticmethod
-    def has_option(section: str, option: str) -> str:
-        return CacheKey._generate_key('has_option', section, option)
+    def set_multi(self, mapping: "Mapping[str, Any]") -> None:
+        self.proxied.set_multi(mapping)
+        for key, value in mapping.items():
+            self._set_local(key, value)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._values.pop(key, None)
+        self.proxied.delete(key)
+
+    def delete_multi(self, keys: "Sequence[str]") -> None:
+        with self._lock:
+            for key in keys:
+                self._values.pop(key, None)
+        self.proxied.delete_multi(keys)
+
+
+class LayeredMemcacheRegion(MemcacheRegion):
+    """
+    Subclass of MemcacheRegion with a short-lived in-process cache in front of memcached,
+    for the values read many times per second. A value deleted or replaced by another
+    process can be served by the local cache for up to local_expiration_time seconds.
+    Without memcached, it is configured to null like MemcacheRegion.
+    """
+    def __init__(
+            self,
+            expiration_time: int,
+            function_key_generator: Optional['Callable'] = None,
+            memcached_expire_time: Optional[int] = None,
+            name: str = 'default',
+            local_expiration_time: Optional[int] = None,
+            local_size: Optional[int] = None
+    ):
+        self.local_expiration_time = LOCAL_EXPIRATION_TIME if local_expiration_time is None else local_expiration_time
+        self.local_size = LOCAL_SIZE if local_size is None else local_size
+        self.region_name = name
+        super().__init__(expiration_time, function_key_generator, memcached_expire_time)
+
+    def _configure_region(
+            self,
+            expiration_time: int,
+            memcached_expire_time: Optional[int]
+    ) -> None:
+        super()._configure_region(expiration_time, memcached_expire_time)
+        if ENABLE_CACHING and self.local_expiration_time > 0 and self.local_size > 0:
+            self.wrap(LocalCacheProxy(self.region_name, self.local_expiration_time, self.local_size))
+
+
+class _Flight:
+    """
+    An execution of a SingleFlight function, awaited by the concurrent calls with the same key.
+    """
+
+    __slots__ = ('done', 'value', 'error', 'tag', 'stale')
+
+    def __init__(self, tag: "Hashable"):
+        self.done = Event()
+        self.value = None
+        self.error = None
+        self.tag = tag
+        self.stale = False
+
+
+class SingleFlight:
+    """
+    In-process coalescing of identical reads. The concurrent calls with the same key
+    wait for the first one instead of all executing the function, and its result is
+    served for expiration_time seconds to the following calls. The values are kept
+    pickled, so that the callers get their own copy. An error of the function is raised
+    in all the calls waiting for it, and is not kept.
+
+    The results are tagged with the object they read, e.g. a DID or an RSE, and invalidate()
+    is called with the tags of the objects changed by the writes of this process, so that
+    they are seen by the reads which follow them. The executions running during a write are
+    still awaited by the concurrent calls, but their results are not kept. The writes of
+    other processes can be missed for up to expiration_time seconds.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            expiration_time: float = COALESCE_EXPIRATION_TIME,
+            size: int = COALESCE_SIZE,
+            enabled: bool = COALESCE_READS
+    ):
+        """
+        :param name: The name of the group of reads, used in the metrics.
+        :param expiration_time: The time in seconds a result is served, 0 to only coalesce the concurrent calls.
+        :param size: The maximum number of results kept.
+        :param enabled: If not set, the functions are always executed.
+        """
+        self.name = name
+        self.expiration_time = expiration_time
+        self.size = size
+        self.enabled = enabled
+        self._values = OrderedDict()
+        self._tags = {}
+        self._flights = {}
+        self._lock = Lock()
+        self._generation = 0
+
+        from rucio.core.monitor import MetricManager
+        self._counter = MetricManager(module=__name__).counter('coalesce.{group}.{result}', documentation='Reads coalesced in the gateway')
+
+    def call(self, key: "Hashable", function: "Callable[[], T]", tag: "Hashable" = None) -> T:
+        """
+        Return the result of the function for the key, executing it only if no call with
+        the same key is running and no result of one is kept.
+
+        :param key: The key identifying the read, including all its parameters.
+        :param function: The function doing the read.
+        :param tag: The object read, whose writes invalidate the result.
+        :returns: The result of the function.
+        """
+        if not self.enabled:
+            return function()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is not None and entry[0] > now:
+                self._values.move_to_end(key)
+                value, result = entry[1], 'hit'
+            else:
+                value = None
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight(tag)
+                    generation = self._generation
+                result = 'miss' if leader else 'coalesced'
+        self._counter.labels(group=self.name, result=result).inc()
+        if value is not None:
+            return pickle.loads(value)  # noqa: S301 -- values written by this process only
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return pickle.loads(flight.value)  # noqa: S301 -- values written by this process only
+
+        try:
+            value = function()
+            flight.value = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                if flight.error is None and self.expiration_time > 0 and not flight.stale and generation == self._generation:
+                    self._store(key, tag, flight.value)
+            flight.done.set()
+        return value
+
+    def _store(self, key: "Hashable", tag: "Hashable", value: bytes) -> None:
+        """
+        Keep a result, evicting the least recently used ones. Must be called with the lock held.
+        """
+        self._values[key] = (time.monotonic() + self.expiration_time, value, tag)
+        self._values.move_to_end(key)
+        self._tags.setdefault(tag, set()).add(key)
+        while len(self._values) > self.size:
+            evicted_key, (_, _, evicted_tag) = self._values.popitem(last=False)
+            self._discard_tag(evicted_tag, evicted_key)
+
+    def _discard_tag(self, tag: "Hashable", key: "Hashable") -> None:
+        keys = self._tags.get(tag)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
+
+    def invalidate(self, tags: "Optional[Iterable[Hashable]]" = None) -> None:
+        """
+        Forget the kept results of the given objects, and do not keep the results of the
+        executions reading them which are running. The running executions are still awaited
+        by the concurrent calls.
+
+        :param tags: The objects written, all of them if not given.
+        """
+        with self._lock:
+            if tags is None:
+                self._generation += 1
+                self._values.clear()
+                self._tags.clear()
+                return
+            tags = set(tags)
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    self._values.pop(key, None)
+            for flight in self._flights.values():
+                if flight.tag in tags:
+                    flight.stale = True
+
+    def invalidates(
+            self,
+            tags: "Optional[Callable[[Mapping[str, Any]], Optional[Iterable[Hashable]]]]" = None
+    ) -> "Callable[[Callable[P, T]], Callable[P, T]]":
+        """
+        Decorator of the writes, invalidating the results after them.
 
-    @staticmethod
-    def items(section: str) -> str:
-        return CacheKey._generate_key('items', section)
+        :param tags: Function returning the objects written from the arguments of the write, by name,
+                     or None if they cannot be known. All the results are invalidated if not given.
+        """
+        def decorator(function: "Callable[P, T]") -> "Callable[P, T]":
+            signature = inspect.signature(function)
 
-    @staticmethod
-    def value(section: str, option: str) -> str:
-        return CacheKey._generate_key('get', section, option)
+            @wraps(function)
+            def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+                # The objects are read before the write, which may modify its arguments
+                written = None
+                if tags is not None:
+                    try:
+                        arguments = signature.bind(*args, **kwargs)
+                    except TypeError:
+                        pass
+                    else:
+                        arguments.apply_defaults()
+                        written = tags(arguments.arguments)
+                        written = None if written is None else list(written)
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.invalidate(written)
+            return wrapper
+        return decorator
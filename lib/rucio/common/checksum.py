@@ -12,17 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import hashlib
-import io
-import mmap
+import os
 import zlib
-from functools import partial
-from typing import TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, BinaryIO, Optional
 
 from rucio.common.bittorrent import merkle_sha256
 from rucio.common.exception import ChecksumCalculationError
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator, Sequence
+
     from _typeshed import FileDescriptorOrPath
+    from typing_extensions import Buffer
 
 # GLOBALLY_SUPPORTED_CHECKSUMS = ['adler32', 'md5', 'sha256', 'crc32']
 GLOBALLY_SUPPORTED_CHECKSUMS = ['adler32', 'md5']
@@ -54,13 +56,122 @@ def set_preferred_checksum(checksum_name: str) -> None:
         PREFERRED_CHECKSUM = checksum_name
 
 
-def _iter_blocks(fobj):
-    """Iterate over blocks in a binary file-like object.
+# Block size used to read the files; large enough to amortise the per-call overhead of
+# the hash functions and to let them release the GIL for most of the time
+BLOCK_SIZE = 4 * 1024 * 1024
+
 
-    Uses blocks of size ``io.DEFAULT_BUFFER_SIZE * 8``.
+class _ZlibChecksum:
+    """
+    Running zlib checksum exposing the update/hexdigest interface of the hashlib objects.
     """
-    block_size = io.DEFAULT_BUFFER_SIZE * 8
-    return iter(partial(fobj.read, block_size), b'')
+
+    def __init__(self, function: "Callable[[Buffer, int], int]", value: int, hex_format: str):
+        self._function = function
+        self._value = value
+        self._hex_format = hex_format
+
+    def update(self, data: "Buffer") -> None:
+        self._value = self._function(data, self._value)
+
+    def hexdigest(self) -> str:
+        return self._hex_format % (self._value & 0xFFFFFFFF)
+
+
+# Algorithms which can be computed while streaming the file; adler32 starting value is _not_ 0
+_STREAMING_CHECKSUMS = {
+    'adler32': lambda: _ZlibChecksum(zlib.adler32, 1, '%08x'),
+    'md5': hashlib.md5,
+    'sha256': hashlib.sha256,
+    'crc32': lambda: _ZlibChecksum(zlib.crc32, 0, '%X'),
+}
+
+
+def _iter_blocks(fobj: "BinaryIO", block_size: int = BLOCK_SIZE, nb_buffers: int = 1) -> "Iterator[memoryview]":
+    """
+    Iterate over the blocks of a binary file-like object.
+
+    The blocks are read into preallocated buffers which are reused in a round robin fashion:
+    a block is only valid until ``nb_buffers`` more blocks have been read.
+
+    :param fobj: The file object, opened in binary mode.
+    :param block_size: The size of the blocks.
+    :param nb_buffers: The number of buffers to use.
+    """
+    # The buffers of the small files are not larger than them, allocating a whole block costs more than hashing them
+    try:
+        block_size = max(1, min(block_size, os.fstat(fobj.fileno()).st_size))
+    except (AttributeError, OSError):
+        pass
+    views = [memoryview(bytearray(block_size)) for _ in range(nb_buffers)]
+    index = 0
+    while True:
+        view = views[index % nb_buffers]
+        length = fobj.readinto(view)
+        if not length:
+            return
+        yield view[:length]
+        index += 1
+
+
+def _update_parallel(fobj: "BinaryIO", hashers: "Sequence[Any]", num_threads: int, block_size: int) -> None:
+    """
+    Feed the blocks of a file to several hashers, each hasher running in a worker thread.
+
+    The next block is read while the hashers process the current one. Every hasher has to
+    be done with a block before getting the next one, which keeps the updates ordered.
+    """
+    with ThreadPoolExecutor(max_workers=min(num_threads, len(hashers))) as executor:
+        pending = []
+        for block in _iter_blocks(fobj, block_size, nb_buffers=2):
+            for future in pending:
+                future.result()
+            pending = [executor.submit(hasher.update, block) for hasher in hashers]
+        for future in pending:
+            future.result()
+
+
+def checksums(
+        file: "FileDescriptorOrPath",
+        algorithms: "Optional[Iterable[str]]" = None,
+        num_threads: int = 1,
+        block_size: int = BLOCK_SIZE
+) -> dict[str, str]:
+    """
+    Compute several checksums of a file, reading it only once.
+
+    The file is read in large blocks which are fed to all the requested algorithms. With
+    num_threads > 1, each algorithm runs in its own worker thread: hashlib and zlib release
+    the GIL while hashing, so the algorithms and the reading of the next block overlap.
+    Algorithms which cannot be streamed (merkle_sha256) read the file on their own.
+
+    :param file: file name
+    :param algorithms: The names of the algorithms, GLOBALLY_SUPPORTED_CHECKSUMS if not given.
+    :param num_threads: The maximum number of threads hashing concurrently.
+    :param block_size: The size of the blocks read from the file.
+    :returns: A dictionary {algorithm: checksum}, the checksums having the format of the
+              corresponding function of this module.
+    :raises ValueError: If an algorithm is unknown.
+    """
+    algorithms = list(GLOBALLY_SUPPORTED_CHECKSUMS if algorithms is None else algorithms)
+    unknown = [name for name in algorithms if name not in CHECKSUM_ALGO_DICT]
+    if unknown:
+        raise ValueError('Unknown checksum algorithm(s): %s' % ', '.join(unknown))
+
+    hashers = {name: _STREAMING_CHECKSUMS[name]() for name in algorithms if name in _STREAMING_CHECKSUMS}
+    if hashers:
+        try:
+            with open(file, 'rb') as f:
+                if num_threads > 1 and len(hashers) > 1:
+                    _update_parallel(f, list(hashers.values()), num_threads, block_size)
+                else:
+                    for block in _iter_blocks(f, block_size):
+                        for hasher in hashers.values():
+                            hasher.update(block)
+        except Exception as e:
+            raise ChecksumCalculationError(','.join(hashers), str(file), e)
+
+    return {name: hashers[name].hexdigest() if name in hashers else CHECKSUM_ALGO_DICT[name](file) for name in algorithms}
 
 
 def adler32(file: "FileDescriptorOrPath") -> str:
@@ -72,39 +183,26 @@ def adler32(file: "FileDescriptorOrPath") -> str:
     :param file: file name
     :returns: Hexified string, padded to 8 values.
     """
+    return checksums(file, ['adler32'])['adler32']
 
-    # adler starting value is _not_ 0
-    adler = 1
-
-    can_mmap = False
-    # try:
-    #    with open(file, 'r+b') as f:
-    #        can_mmap = True
-    # except:
-    #    pass
-
-    try:
-        # use mmap if possible
-        if can_mmap:
-            with open(file, 'r+b') as f:
-                m = mmap.mmap(f.fileno(), 0)
-                # partial block reads at slightly increased buffer sizes
-                for block in _iter_blocks(m):
-                    adler = zlib.adler32(block, adler)
-        else:
-            with open(file, 'rb') as f:
-                # partial block reads at slightly increased buffer sizes
-                for block in _iter_blocks(f):
-                    adler = zlib.adler32(block, adler)
-
-    except Exception as e:
-        raise ChecksumCalculationError('adler32', str(file), e)
 
-    # backflip on 32bit -- can be removed once everything is fully migrated to 64bit
-    if adler < 0:
-        adler = adler + 2 ** 32
+def adler32_combine(adler1: int, adler2: int, length2: int) -> int:
+    """
+    Combine the Adler-32 checksums of two consecutive parts of a stream, like zlib's adler32_combine.
+    Allows to compute the checksum of a file from the checksums of segments computed independently.
 
-    return str('%08x' % adler)
+    :param adler1: The Adler-32 checksum of the first part.
+    :param adler2: The Adler-32 checksum of the second part.
+    :param length2: The length in bytes of the second part.
+    :returns: The Adler-32 checksum of the concatenation, as an integer.
+    """
+    base = 65521  # largest prime smaller than 65536
+    remainder = length2 % base
+    sum1 = adler1 & 0xFFFF
+    sum2 = (remainder * sum1) % base
+    sum1 = (sum1 + (adler2 & 0xFFFF) + base - 1) % base
+    sum2 = (sum2 + ((adler1 >> 16) & 0xFFFF) + ((adler2 >> 16) & 0xFFFF) + base - remainder) % base
+    return (sum2 << 16) | sum1
 
 
 def md5(file: "FileDescriptorOrPath") -> str:
@@ -114,15 +212,7 @@ def md5(file: "FileDescriptorOrPath") -> str:
     :param file: file name
     :returns: string of 32 hexadecimal digits
     """
-    hash_md5 = hashlib.md5()
-    try:
-        with open(file, "rb") as f:
-            for block in _iter_blocks(f):
-                hash_md5.update(block)
-    except Exception as e:
-        raise ChecksumCalculationError('md5', str(file), e)
-
-    return hash_md5.hexdigest()
+    return checksums(file, ['md5'])['md5']
 
 
 def sha256(file: "FileDescriptorOrPath") -> str:
@@ -132,14 +222,7 @@ def sha256(file: "FileDescriptorOrPath") -> str:
     :param file: file name
     :returns: string of 32 hexadecimal digits
     """
-    checksum = hashlib.sha256()
-    try:
-        with open(file, "rb") as f:
-            for block in _iter_blocks(f):
-                checksum.update(block)
-    except Exception as e:
-        raise ChecksumCalculationError('sha256', str(file), e)
-    return checksum.hexdigest()
+    return checksums(file, ['sha256'])['sha256']
 
 
 def crc32(file: "FileDescriptorOrPath") -> str:
@@ -149,14 +232,7 @@ def crc32(file: "FileDescriptorOrPath") -> str:
     :param file: file name
     :returns: string of 32 hexadecimal digits
     """
-    prev = 0
-    try:
-        with open(file, "rb") as f:
-            for block in _iter_blocks(f):
-                prev = zlib.crc32(block, prev)
-    except Exception as e:
-        raise ChecksumCalculationError('crc32', str(file), e)
-    return "%X" % (prev & 0xFFFFFFFF)
+    return checksums(file, ['crc32'])['crc32']
 
 
 CHECKSUM_ALGO_DICT = {
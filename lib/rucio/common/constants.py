@@ -78,6 +78,16 @@ FTS_JOB_TYPE = namedtuple('FTS_JOB_TYPE', ['MULTIPLE_REPLICA', 'MULTI_HOP', 'SES
 MAX_MESSAGE_LENGTH = 4000
 
 
+@enum.unique
+class MessagePayloadCompression(str, enum.Enum):
+    """
+    The encodings which can be used to store message payloads.
+    """
+    NONE = "none"
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+
 @enum.unique
 class TransferLimitDirection(enum.Enum):
     SOURCE = 'S'
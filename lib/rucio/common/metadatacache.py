@@ -0,0 +1,174 @@
+# Copyright European Organization for Nuclear Research (CERN) since 2012
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Persistent client-side cache of the metadata returned by the server (RSE settings and
+protocols, DIDs), shared by all the client processes of a user on a host.
+
+The raw response bodies are stored in SQLite together with their ETag. An entry younger
+than the time-to-live of its kind is used without contacting the server. An older entry
+is revalidated with If-None-Match, so that the server only answers 304 Not Modified when
+the metadata did not change.
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from threading import Lock
+from typing import TYPE_CHECKING, NamedTuple, Optional
+
+from rucio.common.config import config_get, config_get_bool, config_get_int
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_PATH = '~/.rucio/metadata_cache.db'
+DEFAULT_TTLS = {'rse': 900, 'did': 3600}
+# Entries not used for this long are dropped, even if they could still be revalidated
+MAX_AGE = 7 * 86400
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata_cache (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    body BLOB NOT NULL,
+    etag TEXT,
+    stored_at REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+)
+"""
+
+_CACHES = {}
+_CACHES_LOCK = Lock()
+
+
+class CacheEntry(NamedTuple):
+    body: bytes
+    etag: Optional[str]
+    fresh: bool
+
+
+class MetadataCache:
+    """
+    SQLite cache of response bodies, keyed by kind (e.g. 'rse', 'did') and request.
+    Errors of the underlying database (locked, corrupted or read-only file) are logged and
+    handled as cache misses: the cache never makes a request fail.
+    """
+
+    def __init__(self, path: str, ttls: "Optional[Mapping[str, int]]" = None):
+        """
+        :param path: The path of the SQLite database, created if needed.
+        :param ttls: The time-to-live in seconds per kind. Kinds not listed are always revalidated.
+        """
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self._lock = Lock()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Autocommit: every statement is its own short transaction, to not block the other processes
+        self._connection = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._execute(_SCHEMA)
+        self._execute('DELETE FROM metadata_cache WHERE stored_at < ?', (time.time() - MAX_AGE,))
+
+    def _execute(self, statement: str, parameters: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._connection.execute(statement, parameters).fetchall()
+
+    def get(self, kind: str, key: str) -> Optional[CacheEntry]:
+        """
+        Get a cached body.
+
+        :param kind: The kind of metadata, selecting the time-to-live.
+        :param key: The key of the request.
+        :returns: The cached entry, telling if it can be used without revalidation, or None.
+        """
+        try:
+            rows = self._execute('SELECT body, etag, stored_at FROM metadata_cache WHERE kind = ? AND key = ?', (kind, key))
+        except sqlite3.Error as error:
+            LOG.debug('Cannot read the metadata cache %s: %s', self.path, error)
+            return None
+        if not rows:
+            return None
+        body, etag, stored_at = rows[0]
+        return CacheEntry(body=body, etag=etag, fresh=time.time() - stored_at < self.ttls.get(kind, 0))
+
+    def set(self, kind: str, key: str, body: bytes, etag: Optional[str] = None) -> None:
+        """
+        Store a body.
+
+        :param kind: The kind of metadata, selecting the time-to-live.
+        :param key: The key of the request.
+        :param body: The response body.
+        :param etag: The ETag of the response, used to revalidate the entry once expired.
+        """
+        try:
+            self._execute('INSERT OR REPLACE INTO metadata_cache (kind, key, body, etag, stored_at) VALUES (?, ?, ?, ?, ?)',
+                          (kind, key, body, etag, time.time()))
+        except sqlite3.Error as error:
+            LOG.debug('Cannot write the metadata cache %s: %s', self.path, error)
+
+    def refresh(self, kind: str, key: str) -> None:
+        """
+        Restart the time-to-live of an entry which the server revalidated.
+
+        :param kind: The kind of metadata.
+        :param key: The key of the request.
+        """
+        try:
+            self._execute('UPDATE metadata_cache SET stored_at = ? WHERE kind = ? AND key = ?', (time.time(), kind, key))
+        except sqlite3.Error as error:
+            LOG.debug('Cannot write the metadata cache %s: %s', self.path, error)
+
+    def delete(self, kind: str, key: str) -> None:
+        """
+        Remove an entry.
+
+        :param kind: The kind of metadata.
+        :param key: The key of the request.
+        """
+        try:
+            self._execute('DELETE FROM metadata_cache WHERE kind = ? AND key = ?', (kind, key))
+        except sqlite3.Error as error:
+            LOG.debug('Cannot write the metadata cache %s: %s', self.path, error)
+
+    def clear(self) -> None:
+        """
+        Remove all the entries.
+        """
+        try:
+            self._execute('DELETE FROM metadata_cache')
+        except sqlite3.Error as error:
+            LOG.debug('Cannot clear the metadata cache %s: %s', self.path, error)
+
+
+def get_metadata_cache() -> Optional[MetadataCache]:
+    """
+    Get the metadata cache of this process, as configured in the client section.
+
+    :returns: The cache, or None if it is disabled or cannot be opened.
+    """
+    if not config_get_bool('client', 'metadata_cache', False, False):
+        return None
+    path = config_get('client', 'metadata_cache_path', False, DEFAULT_PATH)
+    with _CACHES_LOCK:
+        if path not in _CACHES:
+            ttls = {kind: config_get_int('client', 'metadata_cache_%s_ttl' % kind, False, ttl) for kind, ttl in DEFAULT_TTLS.items()}
+            try:
+                _CACHES[path] = MetadataCache(path, ttls)
+            except (OSError, sqlite3.Error) as error:
+                LOG.warning('Cannot open the metadata cache %s, it is disabled: %s', path, error)
+                _CACHES[path] = None
+        return _CACHES[path]
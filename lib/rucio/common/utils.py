@@ -52,13 +52,10 @@ from rucio.common.extra import import_extras
 from rucio.common.plugins import PolicyPackageAlgorithms
 from rucio.common.types import InternalAccount, InternalScope, LFNDict, TraceDict
 
-EXTRA_MODULES = import_extras(['paramiko'])
+EXTRA_MODULES = import_extras(['orjson'])
 
-if EXTRA_MODULES['paramiko']:
-    try:
-        from paramiko import RSAKey
-    except Exception:
-        EXTRA_MODULES['paramiko'] = None
+if EXTRA_MODULES['orjson']:
+    import orjson  # pylint: disable=import-error
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
@@ -249,12 +246,21 @@ def val_to_space_sep_str(vallist: list[str]) -> str:
         return ''
 
 
+# Names used by DATE_FORMAT in the C locale
+_WEEKDAY_NAMES = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+_MONTH_NAMES = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+
 def date_to_str(date: datetime.datetime) -> Optional[str]:
     """ Converts a datetime value to the corresponding RFC-1123 string.
+    Same as strftime with DATE_FORMAT in the C locale, several times faster.
 
     :param date: the datetime value to convert.
     """
-    return datetime.datetime.strftime(date, DATE_FORMAT) if date else None
+    if not date:
+        return None
+    return '%s, %02d %s %04d %02d:%02d:%02d UTC' % (_WEEKDAY_NAMES[date.weekday()], date.day, _MONTH_NAMES[date.month - 1],
+                                                    date.year, date.hour, date.minute, date.second)
 
 
 class APIEncoder(json.JSONEncoder):
@@ -279,6 +285,46 @@ class APIEncoder(json.JSONEncoder):
         return json.JSONEncoder.default(self, obj)
 
 
+_API_ENCODER = APIEncoder(separators=(',', ':'))
+# Types serialized by orjson like APIEncoder does, the others are converted by _enum_names or APIEncoder.default
+_ORJSON_NATIVE_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def _enum_names(obj: Any) -> Any:
+    """
+    Replace the enums by their names, as orjson serializes them by value.
+    """
+    if type(obj) in _ORJSON_NATIVE_TYPES:
+        return obj
+    if isinstance(obj, dict):
+        return {key: value if type(value) in _ORJSON_NATIVE_TYPES else _enum_names(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_enum_names(value) for value in obj]
+    if isinstance(obj, Enum):
+        # the json module serializes the enums deriving from str or int as such
+        return obj.value if isinstance(obj, (str, int, float)) else obj.name
+    return obj
+
+
+def json_dumps(data: Any) -> str:
+    """
+    Serialize a document to JSON with the special values encoded by APIEncoder.
+
+    Uses orjson when it is installed, falling back to the json module for the documents
+    orjson does not support (e.g. integers larger than 64 bits). The output is compact.
+
+    :param data: the document to serialize.
+    :returns: the JSON-formatted string.
+    """
+    if EXTRA_MODULES['orjson']:
+        try:
+            return orjson.dumps(_enum_names(data), default=_API_ENCODER.default,
+                                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS).decode()
+        except orjson.JSONEncodeError:
+            pass
+    return _API_ENCODER.encode(data)
+
+
 def render_json(*args, **kwargs) -> str:
     """ Render a list or a dict as a JSON-formatted string. """
     if args and isinstance(args[0], list):
@@ -287,29 +333,100 @@ def render_json(*args, **kwargs) -> str:
         data = kwargs
     else:
         raise ValueError("Error while serializing object to JSON-formatted string: supported input types are list or dict.")
-    return json.dumps(data, cls=APIEncoder)
+    return json_dumps(data)
+
+
+# DATE_FORMAT in the C locale, e.g. 'Tue, 01 Jan 2019 00:00:00 UTC'
+_DATE_REGEX = re.compile(r'(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun), (\d\d) (Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec) (\d{4}) (\d\d):(\d\d):(\d\d) UTC')
+_MONTHS = {month: number for number, month in enumerate(_MONTH_NAMES, 1)}
+
+
+def _parse_date(value: str) -> datetime.datetime:
+    """
+    datetime.datetime.strptime(value, DATE_FORMAT), several times faster for the usual format.
+    """
+    match = _DATE_REGEX.fullmatch(value)
+    if match:
+        day, month, year, hour, minute, second = match.groups()
+        try:
+            return datetime.datetime(int(year), _MONTHS[month], int(day), int(hour), int(minute), int(second))
+        except ValueError:
+            pass
+    return datetime.datetime.strptime(value, DATE_FORMAT)
 
 
 def datetime_parser(dct: dict[Any, Any]) -> dict[Any, Any]:
     """ datetime parser
     """
     for k, v in list(dct.items()):
-        if isinstance(v, str) and re.search(" UTC", v):
+        if isinstance(v, str) and " UTC" in v:
             try:
-                dct[k] = datetime.datetime.strptime(v, DATE_FORMAT)
+                dct[k] = _parse_date(v)
             except Exception:
                 pass
     return dct
 
 
+def _parse_datetimes(obj: Any) -> Any:
+    """
+    Apply datetime_parser to all the dictionaries of a decoded JSON document, innermost first,
+    like the object_hook of json.loads.
+    """
+    if isinstance(obj, dict):
+        for value in obj.values():
+            if isinstance(value, (dict, list)):
+                _parse_datetimes(value)
+        return datetime_parser(obj)
+    if isinstance(obj, list):
+        for item in obj:
+            if isinstance(item, (dict, list)):
+                _parse_datetimes(item)
+    return obj
+
+
 def parse_response(data: Union[str, bytes, bytearray]) -> Any:
     """
     JSON render function
+
+    Uses orjson when it is installed. The dates are only looked for in the documents
+    containing " UTC", which all the dates formatted with DATE_FORMAT do.
     """
+    has_dates = (b" UTC" if isinstance(data, (bytes, bytearray)) else " UTC") in data
+    if EXTRA_MODULES['orjson']:
+        try:
+            result = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # e.g. NaN, which the json module accepts
+            pass
+        else:
+            return _parse_datetimes(result) if has_dates else result
+
     if isinstance(data, (bytes, bytearray)):
         data = data.decode('utf-8')
 
-    return json.loads(data, object_hook=datetime_parser)
+    if has_dates:
+        return json.loads(data, object_hook=datetime_parser)
+    return json.loads(data)
+
+
+def parse_response_lines(chunks: "Iterable[bytes]") -> "Iterator[Any]":
+    """
+    Parse a stream of newline-delimited JSON documents (application/x-json-stream).
+
+    :param chunks: The stream, as chunks of bytes of any size, e.g. from Response.iter_content.
+    :returns: An iterator over the parsed documents.
+    """
+    pending = b''
+    for chunk in chunks:
+        lines = chunk.split(b'\n')
+        if pending:
+            lines[0] = pending + lines[0]
+        pending = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield parse_response(line)
+    if pending.strip():
+        yield parse_response(pending)
 
 
 def execute(cmd: str) -> tuple[int, str, str]:
@@ -803,7 +920,10 @@ def ssh_sign(private_key: str, message: str) -> str:
     :return: Base64 encoded signature as a string.
     """
     encoded_message = message.encode()
-    if not EXTRA_MODULES['paramiko']:
+    # Imported on use: paramiko takes longer to import than the rest of the client
+    try:
+        from paramiko import RSAKey  # pylint: disable=import-error
+    except Exception:
         raise MissingModuleException('The paramiko module is not installed or faulty.')
     sio_private_key = StringIO(private_key)
     priv_k = RSAKey.from_private_key(sio_private_key)
@@ -1170,6 +1290,70 @@ def parse_replicas_metalink(root: ElementTree.Element) -> list[dict[str, Any]]:
     return files
 
 
+def build_replicas_plan(rfiles: "Iterable[dict[str, Any]]") -> dict[str, Any]:
+    """
+    Packs replicas, as listed by list_replicas with their PFNs already sorted, into the
+    columnar layout of a replica plan. The RSE names, scopes and parent DIDs are stored
+    once and referenced by their index; the sources of all the files are concatenated
+    in priority order, each file giving its number of sources.
+
+    :param rfiles: the replica dictionaries
+
+    :returns: the replica plan
+    """
+    rses, scopes, parents = {}, {}, {}
+    files = {'scope': [], 'name': [], 'bytes': [], 'adler32': [], 'md5': [], 'parents': [], 'nsources': []}
+    sources = {'pfn': [], 'rse': [], 'domain': [], 'client_extract': []}
+
+    for rfile in rfiles:
+        files['scope'].append(scopes.setdefault(rfile['scope'], len(scopes)))
+        files['name'].append(rfile['name'])
+        files['bytes'].append(rfile['bytes'])
+        files['adler32'].append(rfile['adler32'])
+        files['md5'].append(rfile['md5'])
+        files['parents'].append([parents.setdefault(parent, len(parents)) for parent in rfile.get('parents') or []])
+        files['nsources'].append(len(rfile['pfns']))
+        for pfn, replica in rfile['pfns'].items():
+            sources['pfn'].append(pfn)
+            sources['rse'].append(rses.setdefault(replica['rse'], len(rses)))
+            sources['domain'].append(replica['domain'])
+            sources['client_extract'].append(replica['client_extract'])
+
+    return {'rses': list(rses), 'scopes': list(scopes), 'parents': list(parents), 'files': files, 'sources': sources}
+
+
+def parse_replicas_plan(plan: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Unpacks a replica plan into the same list of dictionaries as parse_replicas_metalink,
+    with the sources of each file in priority order.
+
+    :param plan: the replica plan, as built by build_replicas_plan
+
+    :returns: a list with a dictionary for each file
+    """
+    files = []
+    rses, scopes, parents = plan['rses'], plan['scopes'], plan['parents']
+    file_columns, source_columns = plan['files'], plan['sources']
+
+    first = 0
+    for idx, name in enumerate(file_columns['name']):
+        last = first + file_columns['nsources'][idx]
+        files.append({'did': '%s:%s' % (scopes[file_columns['scope'][idx]], name),
+                      'adler32': file_columns['adler32'][idx],
+                      'md5': file_columns['md5'][idx],
+                      'bytes': file_columns['bytes'][idx],
+                      'parent_dids': {parents[parent] for parent in file_columns['parents'][idx]},
+                      'sources': [{'rse': rses[source_columns['rse'][src]],
+                                   'domain': source_columns['domain'][src],
+                                   'priority': src - first + 1,
+                                   'client_extract': source_columns['client_extract'][src],
+                                   'pfn': source_columns['pfn'][src]}
+                                  for src in range(first, last)]})
+        first = last
+
+    return files
+
+
 def get_thread_with_periodic_running_function(
         interval: Union[int, float],
         action: 'Callable[..., Any]',
@@ -38,6 +38,9 @@ if TYPE_CHECKING:
 
     from rucio.common.types import AccountAttributesDict, AccountDict, AccountUsageModelDict, IdentityDict, InternalAccount, UsageDict
 
+# Key of the attribute keys of the accounts in the info of a session
+SESSION_ATTRIBUTE_KEYS = 'account_attribute_keys'
+
 
 @transactional_session
 def add_account(
@@ -326,6 +329,8 @@ def has_account_attribute(
 ) -> bool:
     """
     Indicates whether the named key is present for the account.
+    The keys of the account are loaded once per session, as the permission checks
+    of a request usually look up several of them.
 
     :param account: the account name to list the scopes of.
     :param key: the key for the attribute.
@@ -333,13 +338,31 @@ def has_account_attribute(
 
     :returns: True or False
     """
-    query = select(
-        models.AccountAttrAssociation.value
-    ).where(
-        models.AccountAttrAssociation.account == account,
-        models.AccountAttrAssociation.key == key
-    )
-    return session.execute(query).scalar() is not None
+    attribute_keys = session.info.setdefault(SESSION_ATTRIBUTE_KEYS, {})
+    keys = attribute_keys.get(account)
+    if keys is None:
+        query = select(
+            models.AccountAttrAssociation.key
+        ).where(
+            models.AccountAttrAssociation.account == account,
+            models.AccountAttrAssociation.value.isnot(None)
+        )
+        keys = attribute_keys[account] = frozenset(session.execute(query).scalars())
+    return key in keys
+
+
+def _invalidate_account_attributes(account: "InternalAccount", *, session: "Session") -> None:
+    """
+    Forget the attribute keys of an account loaded by the session, and the
+    permission decisions which may depend on them.
+
+    :param account: the account whose attributes changed.
+    :param session: The database session in use.
+    """
+    from rucio.core.permission import invalidate_permission_cache
+
+    session.info.get(SESSION_ATTRIBUTE_KEYS, {}).pop(account, None)
+    invalidate_permission_cache(session)
 
 
 @transactional_session
@@ -382,6 +405,7 @@ def add_account_attribute(
             raise exception.Duplicate('Key {0} already exist for account {1}!'.format(key, account))
     except Exception:
         raise exception.RucioException(str(format_exc()))
+    _invalidate_account_attributes(account, session=session)
 
 
 @transactional_session
@@ -408,6 +432,7 @@ def del_account_attribute(
     if aid is None:
         raise exception.AccountNotFound('Attribute ({0}) does not exist for the account {1}!'.format(key, account))
     aid.delete(session=session)
+    _invalidate_account_attributes(account, session=session)
 
 
 @read_session
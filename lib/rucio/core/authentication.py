@@ -26,8 +26,8 @@ from dogpile.cache import make_region
 from dogpile.cache.api import NO_VALUE, NoValue
 from sqlalchemy import delete, null, or_, select
 
-from rucio.common.cache import MemcacheRegion
-from rucio.common.config import config_get_bool
+from rucio.common.cache import LayeredMemcacheRegion, LocalCacheProxy
+from rucio.common.config import config_get_bool, config_get_int
 from rucio.common.exception import CannotAuthenticate
 from rucio.common.utils import chunks, date_to_str, generate_uuid
 from rucio.core.account import account_exists
@@ -94,10 +94,23 @@ def _hash_token_for_cache(token: str) -> str:
     return hashlib.sha256(token.encode('utf-8')).hexdigest()
 
 
+# Maximum number of valid and of invalid tokens kept by each process
+TOKEN_CACHE_SIZE = config_get_int('cache', 'auth_token_cache_size', False, 10000, check_config_table=False)
+# Time in seconds during which a token which failed the validation is rejected without checking it again
+INVALID_TOKEN_EXPIRATION_TIME = config_get_int('cache', 'invalid_auth_token_expiration_time', False, 30, check_config_table=False)
+
 if config_get_bool('cache', 'use_external_cache_for_auth_tokens', default=False):
-    TOKENREGION = MemcacheRegion(expiration_time=900, function_key_generator=token_key_generator)
+    TOKENREGION = LayeredMemcacheRegion(expiration_time=900, function_key_generator=token_key_generator, name='token')
 else:
-    TOKENREGION = make_region(function_key_generator=token_key_generator).configure('dogpile.cache.memory', expiration_time=900)
+    TOKENREGION = make_region(function_key_generator=token_key_generator).configure(
+        'dogpile.cache.null',
+        expiration_time=900,
+        wrap=[LocalCacheProxy('token', 900, TOKEN_CACHE_SIZE)]
+    )
+INVALID_TOKENREGION = make_region().configure(
+    'dogpile.cache.null',
+    wrap=[LocalCacheProxy('invalid_token', INVALID_TOKEN_EXPIRATION_TIME, TOKEN_CACHE_SIZE)]
+)
 
 
 @transactional_session
@@ -518,16 +531,26 @@ def validate_auth_token(token: str, *, session: "Session") -> "TokenValidationDi
     # Check if token can be found in cache region
     value: Union[NoValue, "TokenValidationDict"] = TOKENREGION.get(cache_key)
     if value is NO_VALUE:  # no cached entry found
+        if INVALID_TOKENREGION.get(cache_key) is not NO_VALUE:
+            raise CannotAuthenticate('Token recently failed the validation.')
+        is_jwt = len(token.split(".")) == 3
+        if is_jwt:
+            # imported here to avoid circular import
+            from rucio.core.oidc import check_jwt_locally, validate_jwt
+            # expired or forged JWTs are rejected without querying the database
+            if not check_jwt_locally(token):
+                INVALID_TOKENREGION.set(cache_key, True)
+                raise CannotAuthenticate('JWT expired or with an invalid signature.')
         # Query database using the original token (not the hash)
         value = query_token(token, session=session)
         if not value:
             # identify JWT access token and validate
             # & save it in Rucio if scope and audience are correct
-            if len(token.split(".")) == 3:
-                # imported here to avoid circular import
-                from rucio.core.oidc import validate_jwt
+            if is_jwt:
+                # not cached as invalid, the validation also fails on transient errors of the database or the IdP
                 value = validate_jwt(token, session=session)
             else:
+                INVALID_TOKENREGION.set(cache_key, True)
                 raise CannotAuthenticate(traceback.format_exc())
         # save token validation result in cache using hashed key
         TOKENREGION.set(cache_key, value)
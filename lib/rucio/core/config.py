@@ -12,13 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import TYPE_CHECKING, Any, Optional, TypeVar
+import time
+from threading import Lock
+from typing import TYPE_CHECKING, Any, NamedTuple, Optional, TypeVar
 
 from dogpile.cache.api import NoValue
-from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy import and_, delete, event, select, update
 
-from rucio.common.cache import CacheKey, MemcacheRegion
+from rucio.common.cache import LayeredMemcacheRegion
+from rucio.common.config import config_get_int
 from rucio.common.exception import ConfigNotFound
+from rucio.common.utils import generate_uuid
 from rucio.db.sqla import models
 from rucio.db.sqla.session import read_session, transactional_session
 
@@ -30,9 +34,91 @@ if TYPE_CHECKING:
     from sqlalchemy.orm import Session
 
 
-REGION = MemcacheRegion(expiration_time=900)
+REGION = LayeredMemcacheRegion(expiration_time=900, name='config')
 
-SECTIONS_CACHE_KEY = 'sections'
+# The version of the configuration table, replaced by every change
+SNAPSHOT_VERSION_KEY = 'snapshot_version'
+# Interval in seconds between two checks of the version by a process
+SNAPSHOT_CHECK_INTERVAL = config_get_int('cache', 'config_snapshot_check_interval', False, 10, check_config_table=False)
+
+
+class _Snapshot(NamedTuple):
+    version: str
+    values: dict[str, dict[str, str]]
+    loaded_at: float
+
+
+_SNAPSHOT: Optional[_Snapshot] = None
+_SNAPSHOT_CHECKED_AT = 0.0
+_SNAPSHOT_LOCK = Lock()
+
+
+@read_session
+def snapshot(
+        *,
+        expiration_time: int = 900,
+        session: "Session"
+) -> dict[str, dict[str, str]]:
+    """
+    Return the whole configuration table, as loaded once by this process.
+
+    The snapshot is reloaded when the version published in the cache by the changes of the
+    configuration differs from the loaded one, which is checked at most every
+    SNAPSHOT_CHECK_INTERVAL seconds, or when it is older than expiration_time.
+    The returned dictionary is shared and must not be modified.
+
+    :param expiration_time: Time after that the snapshot gets reloaded.
+    :param session: The database session in use.
+    :returns: {'section_name': {'option': 'value', ...}, ...}
+    """
+    global _SNAPSHOT, _SNAPSHOT_CHECKED_AT
+
+    now = time.monotonic()
+    current = _SNAPSHOT
+    if current is not None and now - current.loaded_at < expiration_time:
+        if now - _SNAPSHOT_CHECKED_AT < SNAPSHOT_CHECK_INTERVAL:
+            return current.values
+        version = read_from_cache(SNAPSHOT_VERSION_KEY)
+        if version == current.version:
+            _SNAPSHOT_CHECKED_AT = now
+            return current.values
+    else:
+        version = read_from_cache(SNAPSHOT_VERSION_KEY)
+
+    if isinstance(version, NoValue):
+        version = generate_uuid()
+        write_to_cache(SNAPSHOT_VERSION_KEY, version)
+
+    stmt = select(
+        models.Config.section,
+        models.Config.opt,
+        models.Config.value
+    )
+    values = {}
+    for section, option, value in session.execute(stmt):
+        values.setdefault(section, {})[option] = value
+
+    with _SNAPSHOT_LOCK:
+        _SNAPSHOT = _Snapshot(version=version, values=values, loaded_at=now)
+        _SNAPSHOT_CHECKED_AT = now
+    return values
+
+
+def _invalidate_snapshot(session: "Session") -> None:
+    """
+    Make all the processes reload their snapshot, now and once the transaction is committed,
+    in case they reloaded it in the meantime from the data before the change.
+
+    :param session: The database session of the change.
+    """
+    def _publish(*_args) -> None:
+        global _SNAPSHOT
+        write_to_cache(SNAPSHOT_VERSION_KEY, generate_uuid())
+        with _SNAPSHOT_LOCK:
+            _SNAPSHOT = None
+
+    _publish()
+    event.listen(session, 'after_commit', _publish, once=True)
 
 
 @read_session
@@ -51,18 +137,13 @@ def sections(
     :returns: ['section_name', ...]
     """
 
-    all_sections = NoValue()
     if use_cache:
-        all_sections = read_from_cache(SECTIONS_CACHE_KEY, expiration_time)
-    if isinstance(all_sections, NoValue):
-        stmt = select(
-            models.Config.section
-        ).distinct(
-        )
-        all_sections = list(session.execute(stmt).scalars().all())
-        write_to_cache(SECTIONS_CACHE_KEY, all_sections)
-
-    return all_sections
+        return list(snapshot(expiration_time=expiration_time, session=session))
+    stmt = select(
+        models.Config.section
+    ).distinct(
+    )
+    return list(session.execute(stmt).scalars().all())
 
 
 @transactional_session
@@ -93,19 +174,14 @@ def has_section(
     :param session: The database session in use.
     :returns: True/False
     """
-    has_section_key = 'has_section_%s' % section
-    has_section = NoValue()
     if use_cache:
-        has_section = read_from_cache(has_section_key, expiration_time)
-    if isinstance(has_section, NoValue):
-        stmt = select(
-            models.Config
-        ).where(
-            models.Config.section == section
-        )
-        has_section = session.execute(stmt).first() is not None
-        write_to_cache(has_section_key, has_section)
-    return has_section
+        return section in snapshot(expiration_time=expiration_time, session=session)
+    stmt = select(
+        models.Config
+    ).where(
+        models.Config.section == section
+    )
+    return session.execute(stmt).first() is not None
 
 
 @read_session
@@ -125,19 +201,14 @@ def options(
     :param session: The database session in use.
     :returns: ['option', ...]
     """
-    options_key = CacheKey.options(section)
-    options = NoValue()
     if use_cache:
-        options = read_from_cache(options_key, expiration_time)
-    if isinstance(options, NoValue):
-        stmt = select(
-            models.Config.opt
-        ).where(
-            models.Config.section == section
-        ).distinct()
-        options = list(session.execute(stmt).scalars().all())
-        write_to_cache(options_key, options)
-    return options
+        return list(snapshot(expiration_time=expiration_time, session=session).get(section, {}))
+    stmt = select(
+        models.Config.opt
+    ).where(
+        models.Config.section == section
+    ).distinct()
+    return list(session.execute(stmt).scalars().all())
 
 
 @read_session
@@ -159,20 +230,15 @@ def has_option(
     :param session: The database session in use.
     :returns: True/False
     """
-    has_option_key = CacheKey.has_option(section, option)
-    has_option = NoValue()
     if use_cache:
-        has_option = read_from_cache(has_option_key, expiration_time)
-    if isinstance(has_option, NoValue):
-        stmt = select(
-            models.Config
-        ).where(
-            and_(models.Config.section == section,
-                 models.Config.opt == option)
-        )
-        has_option = session.execute(stmt).first() is not None
-        write_to_cache(has_option_key, has_option)
-    return has_option
+        return option in snapshot(expiration_time=expiration_time, session=session).get(section, {})
+    stmt = select(
+        models.Config
+    ).where(
+        and_(models.Config.section == section,
+             models.Config.opt == option)
+    )
+    return session.execute(stmt).first() is not None
 
 
 @read_session
@@ -201,11 +267,11 @@ def get(
     :param session: The database session in use.
     :returns: The auto-coerced value.
     """
-    value_key = CacheKey.value(section, option)
-    value = NoValue()
     if use_cache:
-        value = read_from_cache(value_key, expiration_time)
-    if isinstance(value, NoValue):
+        section_values = snapshot(expiration_time=expiration_time, session=session).get(section, {})
+        if option in section_values:
+            return convert_type_fnc(section_values[option])
+    else:
         stmt = select(
             models.Config.value
         ).where(
@@ -214,16 +280,10 @@ def get(
         )
         tmp = session.execute(stmt).first()
         if tmp is not None:
-            value = convert_type_fnc(tmp[0])
-            write_to_cache(value_key, tmp[0])
-        elif default is None:
-            raise ConfigNotFound
-        else:
-            value = default
-            write_to_cache(value_key, value)  # Also write default to cache
-    else:
-        value = convert_type_fnc(value)
-    return value
+            return convert_type_fnc(tmp[0])
+    if default is None:
+        raise ConfigNotFound
+    return default
 
 
 @read_session
@@ -245,11 +305,9 @@ def items(
     :param session: The database session in use.
     :returns: [('option', auto-coerced value), ...]
     """
-    items_key = CacheKey.items(section)
-    items = NoValue()
     if use_cache:
-        items = read_from_cache(items_key, expiration_time)
-    if isinstance(items, NoValue):
+        items = snapshot(expiration_time=expiration_time, session=session).get(section, {}).items()
+    else:
         stmt = select(
             models.Config.opt,
             models.Config.value
@@ -257,7 +315,6 @@ def items(
             models.Config.section == section
         )
         items = session.execute(stmt).all()
-        write_to_cache(items_key, items)
     return [(opt, convert_type_fnc(val)) for opt, val in items]
 
 
@@ -279,17 +336,10 @@ def set(
     """
 
     if not has_option(section=section, option=option, use_cache=False, session=session):
-        section_existed = has_section(section=section)
-
         new_option = models.Config(section=section, opt=option, value=value)
         new_option.save(session=session)
 
-        delete_from_cache(key=CacheKey.value(section, option))
-        delete_from_cache(key=CacheKey.has_option(section, option))
-        delete_from_cache(key=CacheKey.items(section))
-        if not section_existed:
-            delete_from_cache(key=SECTIONS_CACHE_KEY)
-            delete_from_cache(key=CacheKey.has_section(section))
+        _invalidate_snapshot(session)
     else:
         stmt = select(
             models.Config.value
@@ -312,8 +362,7 @@ def set(
                 models.Config.value: str(value)
             })
             session.execute(stmt)
-            delete_from_cache(key=CacheKey.value(section, option))
-            delete_from_cache(key=CacheKey.items(section))
+            _invalidate_snapshot(session)
 
 
 @transactional_session
@@ -341,8 +390,6 @@ def remove_section(section: str, *, session: "Session") -> bool:
                 opt=option,
                 value=value)
             old_option.save(session=session)
-            delete_from_cache(key=CacheKey.has_option(section, option))
-            delete_from_cache(key=CacheKey.value(section, option))
 
         stmt = delete(
             models.Config
@@ -350,8 +397,7 @@ def remove_section(section: str, *, session: "Session") -> bool:
             models.Config.section == section
         )
         session.execute(stmt)
-        delete_from_cache(key=SECTIONS_CACHE_KEY)
-        delete_from_cache(key=CacheKey.items(section))
+        _invalidate_snapshot(session)
         return True
 
 
@@ -388,21 +434,7 @@ def remove_option(section: str, option: str, *, session: "Session") -> bool:
                  models.Config.opt == option)
         )
         session.execute(stmt)
-
-        stmt = select(
-            func.count()
-        ).select_from(
-            models.Config
-        ).where(
-            models.Config.section == section
-        )
-        if not session.execute(stmt).scalar_one_or_none():
-            # we deleted the last config entry in the section. Invalidate the section cache
-            delete_from_cache(key=SECTIONS_CACHE_KEY)
-            delete_from_cache(key=CacheKey.has_section(section))
-        delete_from_cache(key=CacheKey.items(section))
-        delete_from_cache(key=CacheKey.has_option(section, option))
-        delete_from_cache(key=CacheKey.value(section, option))
+        _invalidate_snapshot(session)
         return True
 
 
@@ -31,7 +31,7 @@ from rucio.common.config import config_get_bool, config_get_int
 from rucio.common.constants import DEFAULT_VO
 from rucio.common.utils import chunks, is_archive
 from rucio.core import did_meta_plugins
-from rucio.core.message import add_message
+from rucio.core.message import add_message, add_messages
 from rucio.core.monitor import MetricManager
 from rucio.core.naming_convention import validate_name
 from rucio.db.sqla import filter_thread_work, models
@@ -829,6 +829,7 @@ def delete_dids(
     file_dids = {}
     collection_dids = {}
     all_dids = {}
+    messages = []
     for did in dids:
         scope, name = did['scope'], did['name']
         logger(logging.INFO, 'Removing did %(scope)s:%(name)s (%(did_type)s)' % did)
@@ -860,8 +861,9 @@ def delete_dids(
                    'name': did['name']}
         if did['scope'].vo != DEFAULT_VO:
             message['vo'] = did['scope'].vo
+        messages.append({'event_type': 'ERASE', 'payload': message})
 
-        add_message('ERASE', message, session=session)
+    add_messages(messages, session=session)
 
     if not file_dids:
         data_in_temp_table = all_dids = collection_dids
@@ -881,7 +883,7 @@ def delete_dids(
     session.execute(stmt, values)
 
     # Delete rules on DID
-    skip_deletion = False  # Skip deletion in case of expiration of a rule
+    expired_rule_dids = set()  # Skip deletion of the DIDs for which a rule was expired instead of deleted
     with METRICS.timer('delete_dids.rules'):
         stmt = select(
             models.ReplicationRule.id,
@@ -910,27 +912,48 @@ def delete_dids(
                 rucio.core.rule.delete_rule(rule_id=rule_id, purge_replicas=purge_replicas, soft=True, delete_parent=True, nowait=True, session=session)
                 # Update expiration of DID
                 set_metadata(scope=scope, name=name, key='lifetime', value=3600 * 24, session=session)
-                skip_deletion = True
+                expired_rule_dids.add((scope, name))
             else:
                 rucio.core.rule.delete_rule(rule_id=rule_id, purge_replicas=purge_replicas, delete_parent=True, nowait=True, session=session)
 
-    if skip_deletion:
-        return
+    if expired_rule_dids:
+        # The other DIDs of the chunk can still be deleted: only remove the ones with expired rules from the work
+        for key in expired_rule_dids:
+            file_dids.pop(key, None)
+            collection_dids.pop(key, None)
+            all_dids.pop(key, None)
+        if not file_dids and not collection_dids:
+            return
+        for chunk in chunks(list(expired_rule_dids), 100):
+            stmt = delete(
+                temp_table
+            ).where(
+                or_(*[and_(temp_table.scope == scope, temp_table.name == name) for scope, name in chunk])
+            ).execution_options(
+                synchronize_session=False
+            )
+            session.execute(stmt)
 
     # Detach from parent DIDs:
     existing_parent_dids = False
     with METRICS.timer('delete_dids.parent_content'):
         stmt = select(
-            models.DataIdentifierAssociation
+            models.DataIdentifierAssociation.scope,
+            models.DataIdentifierAssociation.name,
+            models.DataIdentifierAssociation.child_scope,
+            models.DataIdentifierAssociation.child_name
         ).join_from(
             temp_table,
             models.DataIdentifierAssociation,
             and_(models.DataIdentifierAssociation.child_scope == temp_table.scope,
                  models.DataIdentifierAssociation.child_name == temp_table.name)
         )
-        for parent_did in session.execute(stmt).scalars():
+        children_per_parent = {}
+        for parent_scope, parent_name, child_scope, child_name in session.execute(stmt):
+            children_per_parent.setdefault((parent_scope, parent_name), []).append({'scope': child_scope, 'name': child_name})
+        for (parent_scope, parent_name), children in children_per_parent.items():
             existing_parent_dids = True
-            detach_dids(scope=parent_did.scope, name=parent_did.name, dids=[{'scope': parent_did.child_scope, 'name': parent_did.child_name}], session=session)
+            detach_dids(scope=parent_scope, name=parent_name, dids=children, session=session)
 
     # Remove generic DID metadata
     must_delete_did_meta = True
@@ -1412,13 +1435,20 @@ def list_content(
     scope: "InternalScope",
     name: str,
     *,
+    limit: Optional[int] = None,
+    after: Optional[tuple["InternalScope", str]] = None,
     session: "Session"
 ) -> "Iterator[dict[str, Any]]":
     """
     List data identifier contents.
 
+    With a limit, the contents are listed by pages in the order of the primary key:
+    the next page starts after the scope and name of the last content of the previous one.
+
     :param scope: The scope name.
     :param name: The data identifier name.
+    :param limit: The maximum number of contents to list.
+    :param after: The scope and name of the content after which to start the listing.
     :param session: The database session in use.
     """
     stmt = select(
@@ -1431,12 +1461,24 @@ def list_content(
         and_(models.DataIdentifierAssociation.scope == scope,
              models.DataIdentifierAssociation.name == name)
     )
+    if after is not None:
+        after_scope, after_name = after
+        stmt = stmt.where(
+            or_(models.DataIdentifierAssociation.child_scope > after_scope,
+                and_(models.DataIdentifierAssociation.child_scope == after_scope,
+                     models.DataIdentifierAssociation.child_name > after_name))
+        )
+    if limit is not None:
+        stmt = stmt.order_by(
+            models.DataIdentifierAssociation.child_scope,
+            models.DataIdentifierAssociation.child_name
+        ).limit(limit)
     children_found = False
     for tmp_did in session.execute(stmt).yield_per(5).scalars():
         children_found = True
         yield {'scope': tmp_did.child_scope, 'name': tmp_did.child_name, 'type': tmp_did.child_type,
                'bytes': tmp_did.bytes, 'adler32': tmp_did.adler32, 'md5': tmp_did.md5}
-    if not children_found:
+    if not children_found and after is None:
         # Raise exception if the DID doesn't exist
         __get_did(scope=scope, name=name, session=session)
 
@@ -2306,11 +2348,17 @@ def list_dids(
     recursive: bool = False,
     ignore_dids: Optional["Sequence[str]"] = None,
     *,
+    ordered: bool = False,
+    after: Optional[tuple["InternalScope", str]] = None,
     session: "Session"
 ) -> "Iterator[dict[str, Any]]":
     """
     Search data identifiers.
 
+    With ordered, the DIDs are listed in the order of the primary key, so that they can be
+    listed by pages of limit DIDs: the next page starts after the scope and name of the last
+    DID of the previous one. Recursive listings are not ordered.
+
     :param scope: the scope name.
     :param filters: dictionary of attributes by which the results should be filtered.
     :param did_type: the type of the DID: all(container, dataset, file), collection(dataset or container), dataset, container, file.
@@ -2320,9 +2368,12 @@ def list_dids(
     :param long: Long format option to display more information for each DID.
     :param recursive: Recursively list DIDs content.
     :param ignore_dids: List of DIDs to refrain from yielding.
+    :param ordered: List the DIDs in the order of their scope and name.
+    :param after: The scope and name of the DID after which to start an ordered listing.
     :param session: The database session in use.
     """
-    return did_meta_plugins.list_dids(scope, filters, did_type, ignore_case, limit, offset, long, recursive, ignore_dids, session=session)
+    return did_meta_plugins.list_dids(scope, filters, did_type, ignore_case, limit, offset, long, recursive, ignore_dids,
+                                      ordered=ordered, after=after, session=session)
 
 
 @read_session
@@ -200,7 +200,7 @@ def delete_metadata(scope, name, key, *, session: "Session"):
 
 @read_session
 def list_dids(scope=None, filters=None, did_type='collection', ignore_case=False, limit=None,
-              offset=None, long=False, recursive=False, ignore_dids=None, *, session: "Session"):
+              offset=None, long=False, recursive=False, ignore_dids=None, *, ordered=False, after=None, session: "Session"):
     """
     Search data identifiers.
 
@@ -215,9 +215,11 @@ def list_dids(scope=None, filters=None, did_type='collection', ignore_case=False
     :param long: Long format option to display more information for each DID.
     :param recursive: Recursively list DIDs content.
     :param ignore_dids: List of DIDs to refrain from yielding.
+    :param ordered: List the DIDs in the order of their scope and name, if the plugin supports it.
+    :param after: The scope and name of the DID after which to start an ordered listing.
     :param session: The database session in use.
     :returns: List of DIDs satisfying metadata criteria.
-    :raises: InvalidMetadata
+    :raises: InvalidMetadata, UnsupportedOperation
     """
     # backwards compatibility for filters as single {}.
     if isinstance(filters, dict):
@@ -247,7 +249,12 @@ def list_dids(scope=None, filters=None, did_type='collection', ignore_case=False
         raise exception.InvalidMetadata('Filter keys used do not all belong to the same metadata plugin.')
     selected_plugin_to_use = list(required_unique_plugins)[0]
 
+    kwargs = {}
+    if selected_plugin_to_use.supports_pagination:
+        kwargs = {'ordered': ordered, 'after': after}
+    elif after is not None:
+        raise exception.UnsupportedOperation('The metadata plugin %s cannot list the DIDs by pages.' % selected_plugin_to_use.name)
     return selected_plugin_to_use.list_dids(scope=scope, filters=filters, did_type=did_type,
                                             ignore_case=ignore_case, limit=limit,
                                             offset=offset, long=long, recursive=recursive,
-                                            ignore_dids=ignore_dids, session=session)
+                                            ignore_dids=ignore_dids, session=session, **kwargs)
@@ -16,7 +16,7 @@ import operator
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import inspect, update
+from sqlalchemy import and_, inspect, or_, update
 from sqlalchemy.exc import CompileError, InvalidRequestError, NoResultFound
 from sqlalchemy.sql import func
 from sqlalchemy.sql.expression import true
@@ -43,6 +43,8 @@ class DidColumnMeta(DidMetaPlugin):
     A metadata plugin to interact with the base DID table metadata.
     """
 
+    supports_pagination = True
+
     def __init__(self) -> None:
         """Initialize the DID column metadata plugin."""
         super(DidColumnMeta, self).__init__()
@@ -290,6 +292,8 @@ class DidColumnMeta(DidMetaPlugin):
             recursive: bool = False,
             ignore_dids: "Optional[set[str]]" = None,
             *,
+            ordered: bool = False,
+            after: "Optional[tuple[InternalScope, str]]" = None,
             session: "Session",
     ) -> "Iterator[Union[str, dict[str, Any]]]":
         """
@@ -306,6 +310,8 @@ class DidColumnMeta(DidMetaPlugin):
         :param long: Option to display more information for each DID.
         :param recursive: Option to recursively list child-DIDs content.
         :param ignore_dids: A set of 'scope:name' strings to de-duplicate results across OR groups and recursion.
+        :param ordered: Option to list the DIDs in the order of their scope and name, if not recursive.
+        :param after: The scope and name of the DID after which to start an ordered listing.
         :param session: The database session in use.
         :yields:
             - If long is False: DID names (str).
@@ -366,6 +372,18 @@ class DidColumnMeta(DidMetaPlugin):
             'oracle'
         )
 
+        if ordered and not recursive:
+            if after is not None:
+                after_scope, after_name = after
+                stmt = stmt.where(
+                    or_(models.DataIdentifier.scope > after_scope,
+                        and_(models.DataIdentifier.scope == after_scope,
+                             models.DataIdentifier.name > after_name))
+                )
+            stmt = stmt.order_by(
+                models.DataIdentifier.scope,
+                models.DataIdentifier.name
+            )
         if limit:
             stmt = stmt.limit(
                 limit
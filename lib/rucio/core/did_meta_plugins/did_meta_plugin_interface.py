@@ -29,6 +29,9 @@ class DidMetaPlugin(metaclass=ABCMeta):
     Interface for plugins managing metadata of DIDs
     """
 
+    # Whether list_dids accepts the ordered and after arguments, to list the DIDs by pages
+    supports_pagination = False
+
     def __init__(self):
         """
         Initializes the plugin
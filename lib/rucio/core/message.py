@@ -12,15 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import base64
+import gzip
 import json
 from typing import TYPE_CHECKING
 
 from sqlalchemy import delete, insert, or_, select, update
 from sqlalchemy.exc import IntegrityError
 
-from rucio.common.config import config_get_list
-from rucio.common.constants import MAX_MESSAGE_LENGTH, HermesService
-from rucio.common.exception import InvalidObject, RucioException
+from rucio.common.config import config_get, config_get_int, config_get_list
+from rucio.common.constants import MAX_MESSAGE_LENGTH, HermesService, MessagePayloadCompression
+from rucio.common.exception import InvalidObject, MissingModuleException, RucioException
+from rucio.common.extra import import_extras
 from rucio.common.utils import APIEncoder, chunks
 from rucio.db.sqla import filter_thread_work
 from rucio.db.sqla.models import Message, MessageHistory
@@ -34,13 +37,73 @@ if TYPE_CHECKING:
     MessageType = dict[str, Any]
     MessagesListType = list[MessageType]
 
+EXTRA_MODULES = import_extras(['zstandard'])
+
+COMPRESSED_PAYLOAD_PREFIXES = tuple(f'{compression.value}:' for compression in MessagePayloadCompression
+                                    if compression != MessagePayloadCompression.NONE)
+
+
+def _compress_payload(payload: str, compression: MessagePayloadCompression) -> str:
+    """
+    Compress a JSON payload and encode it as text, prefixed with the name of the compression.
+
+    :param payload: The JSON encoded payload.
+    :param compression: The compression to use.
+    :returns: The compressed payload, e.g. 'gzip:H4sIAAAAAAAC/6tWSs...'.
+    """
+    if compression == MessagePayloadCompression.ZSTD:
+        if not EXTRA_MODULES['zstandard']:
+            raise MissingModuleException('The zstandard module is not installed.')
+        data = EXTRA_MODULES['zstandard'].ZstdCompressor().compress(payload.encode())
+    else:
+        data = gzip.compress(payload.encode(), mtime=0)
+    return f'{compression.value}:{base64.b64encode(data).decode()}'
+
+
+def _decompress_payload(payload: str) -> str:
+    """
+    Decode a payload stored by add_messages. Uncompressed payloads are returned unchanged.
+
+    :param payload: The stored payload.
+    :returns: The JSON encoded payload.
+    """
+    if not payload.startswith(COMPRESSED_PAYLOAD_PREFIXES):
+        return payload
+    compression, _, encoded = payload.partition(':')
+    data = base64.b64decode(encoded)
+    if compression == MessagePayloadCompression.ZSTD.value:
+        if not EXTRA_MODULES['zstandard']:
+            raise MissingModuleException('The zstandard module is not installed.')
+        return EXTRA_MODULES['zstandard'].ZstdDecompressor().decompress(data).decode()
+    return gzip.decompress(data).decode()
+
+
+def _get_payload_compression(*, session: "Session") -> "tuple[MessagePayloadCompression, int]":
+    """
+    Read the payload compression settings from the configuration.
+
+    :param session: The database session to use.
+    :returns: Tuple of the compression and the payload length above which it is applied.
+    """
+    compression = config_get('hermes', 'payload_compression', raise_exception=False, default='none', session=session)
+    try:
+        compression = MessagePayloadCompression(compression.lower())
+    except ValueError as err:
+        raise RucioException(str(err))
+    if compression == MessagePayloadCompression.ZSTD and not EXTRA_MODULES['zstandard']:
+        compression = MessagePayloadCompression.GZIP
+    threshold = config_get_int('hermes', 'payload_compression_threshold', raise_exception=False, default=1024, session=session)
+    return compression, threshold
+
 
 @transactional_session
 def add_messages(messages: "MessagesListType", *, session: "Session") -> None:
     """
     Add a list of messages to be submitted asynchronously to a message broker.
 
-    For messages with payload bigger than MAX_MESSAGE_LENGTH, payload_nolimit is used instead of payload.
+    If the hermes payload_compression option is set to gzip or zstd, payloads longer than
+    payload_compression_threshold are stored compressed; they are decoded by retrieve_messages.
+    For messages with (compressed) payload bigger than MAX_MESSAGE_LENGTH, payload_nolimit is used instead of payload.
     In the case of nolimit, a placeholder string is written to the NOT NULL payload column.
 
     :param messages: A list of dictionaries {'event_type': str, 'payload': dict}
@@ -53,26 +116,29 @@ def add_messages(messages: "MessagesListType", *, session: "Session") -> None:
         except ValueError as err:
             raise RucioException(str(err))
         services.append(service)
+    compression, compression_threshold = _get_payload_compression(session=session)
 
     msgs = []
     for message in messages:
         event_type = message['event_type']
-        payload = message['payload']
+        try:
+            msg_payload = json.dumps(message['payload'], cls=APIEncoder)
+        except TypeError as err:
+            raise InvalidObject(f'Invalid JSON for payload: {err}')
+        if compression != MessagePayloadCompression.NONE and len(msg_payload) > compression_threshold:
+            compressed_payload = _compress_payload(msg_payload, compression)
+            if len(compressed_payload) < len(msg_payload):
+                msg_payload = compressed_payload
         for service in services:
-            msg = {'services': service, 'event_type': event_type}
-            try:
-                if event_type == 'email' and service != 'email':
-                    continue
-                if service == 'email' and event_type != 'email':
-                    continue
-                msg_payload = json.dumps(payload, cls=APIEncoder)
-                msg['payload'] = msg_payload
-                if len(msg_payload) > MAX_MESSAGE_LENGTH:
-                    msg['payload_nolimit'] = msg_payload
-                    msg['payload'] = 'nolimit'
-                msgs.append(msg)
-            except TypeError as err:
-                raise InvalidObject(f'Invalid JSON for payload: {err}')
+            if event_type == 'email' and service != 'email':
+                continue
+            if service == 'email' and event_type != 'email':
+                continue
+            msg = {'services': service, 'event_type': event_type, 'payload': msg_payload}
+            if len(msg_payload) > MAX_MESSAGE_LENGTH:
+                msg['payload_nolimit'] = msg_payload
+                msg['payload'] = 'nolimit'
+            msgs.append(msg)
     for messages_chunk in chunks(msgs, 1000):
         stmt = insert(
             Message
@@ -174,25 +240,32 @@ def retrieve_messages(bulk: int = 1000,
 
         # Step 3:
         # Assemble message object
+        nolimit_messages = {}
         for id_, created_at, event_type, payload, services in session.execute(stmt).all():
             message = {'id': id_,
                        'created_at': created_at,
                        'event_type': event_type,
                        'services': services}
 
-            # Only switch SQL context when necessary
             if payload == 'nolimit':
-                nolimit_stmt = select(
-                    Message.payload_nolimit
-                ).where(
-                    Message.id == id_
-                )
-                message['payload'] = json.loads(str(session.execute(nolimit_stmt).scalar_one()))
+                nolimit_messages[id_] = message
             else:
-                message['payload'] = json.loads(str(payload))
+                message['payload'] = json.loads(_decompress_payload(str(payload)))
 
             messages.append(message)
 
+        # Step 4:
+        # Only switch SQL context when necessary, fetching the large payloads in bulk
+        for ids_chunk in chunks(list(nolimit_messages), 100):
+            nolimit_stmt = select(
+                Message.id,
+                Message.payload_nolimit
+            ).where(
+                Message.id.in_(ids_chunk)
+            )
+            for id_, payload_nolimit in session.execute(nolimit_stmt).all():
+                nolimit_messages[id_]['payload'] = json.loads(_decompress_payload(str(payload_nolimit)))
+
         return messages
 
     except IntegrityError as e:
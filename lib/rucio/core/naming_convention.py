@@ -20,7 +20,7 @@ from dogpile.cache.api import NO_VALUE
 from sqlalchemy import and_, delete, select
 from sqlalchemy.exc import IntegrityError
 
-from rucio.common.cache import MemcacheRegion
+from rucio.common.cache import LayeredMemcacheRegion
 from rucio.common.exception import Duplicate, InvalidObject, RucioException
 from rucio.db.sqla import models
 from rucio.db.sqla.constants import KeyType
@@ -36,7 +36,7 @@ if TYPE_CHECKING:
         scope: InternalScope
         regexp: str
 
-REGION = MemcacheRegion(expiration_time=900)
+REGION = LayeredMemcacheRegion(expiration_time=900, name='naming_convention')
 
 
 def add_naming_convention(
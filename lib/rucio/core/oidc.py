@@ -16,6 +16,7 @@ import hashlib
 import json
 import logging
 import subprocess  # noqa: S404 -- subprocess used for external commands
+import time
 import traceback
 from datetime import datetime, timedelta
 from math import floor
@@ -929,6 +930,34 @@ def __save_validated_token(token, valid_dict, extra_dict=None, *, session: "Sess
         raise RucioException(error.args) from error
 
 
+def check_jwt_locally(json_web_token: str) -> bool:
+    """
+    Checks the expiration and the signature of a JSON Web Token without querying the
+    database, using the keys of the issuer cached by its OIDC client.
+    Tokens which cannot be decoded, or from an unknown issuer, are left to validate_jwt.
+
+    :param json_web_token: the JWT string to check
+
+    :returns: False if the token is expired or its signature is invalid, True otherwise.
+    """
+    try:
+        claims = JWT().unpack(json_web_token).payload()
+        expired = 'exp' in claims and float(claims['exp']) < time.time()
+    except Exception:
+        return True
+    if expired:
+        return False
+    oidc_client = OIDC_CLIENTS.get(claims.get('iss'))
+    if oidc_client is None:
+        return True
+    try:
+        JWS().verify_compact(json_web_token, oidc_client.keyjar.get_issuer_keys(claims['iss']))
+    except Exception:
+        METRICS.counter(name='JSONWebToken.invalid_signature').inc()
+        return False
+    return True
+
+
 @transactional_session
 def validate_jwt(json_web_token: str, *, session: "Session") -> dict[str, Any]:
     """
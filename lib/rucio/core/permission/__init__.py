@@ -12,17 +12,24 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
 import importlib
 import logging
 from configparser import NoOptionError, NoSectionError
 from os import environ
 from typing import TYPE_CHECKING, Any, Optional
 
+from dogpile.cache import make_region
+from dogpile.cache.api import NO_VALUE
+from sqlalchemy import event
+
 import rucio.core.permission.generic
 from rucio.common import config, exception
+from rucio.common.cache import LocalCacheProxy
 from rucio.common.constants import DEFAULT_VO
 from rucio.common.plugins import check_policy_module_version
 from rucio.common.policy import get_policy
+from rucio.common.types import InternalType
 from rucio.db.sqla.constants import DatabaseOperationType
 from rucio.db.sqla.session import db_session
 
@@ -36,6 +43,17 @@ LOGGER = logging.getLogger('policy')
 # dictionary of permission modules for each VO
 permission_modules = {}
 
+# Time in seconds during which a permission decision is reused by the other requests of this process
+DECISION_EXPIRATION_TIME = config.config_get_int('cache', 'permission_expiration_time', False, 5, check_config_table=False)
+DECISION_CACHE_SIZE = config.config_get_int('cache', 'permission_cache_size', False, 10000, check_config_table=False)
+# Key of the decisions of the current request in the info of its session
+SESSION_DECISIONS_KEY = 'permission_decisions'
+
+DECISION_REGION = make_region().configure(
+    'dogpile.cache.null',
+    wrap=[LocalCacheProxy('permission', DECISION_EXPIRATION_TIME, DECISION_CACHE_SIZE)]
+)
+
 try:
     multivo = config.config_get_bool('common', 'multi_vo')
 except (NoOptionError, NoSectionError):
@@ -137,11 +155,106 @@ class PermissionResult:
         return self.allowed
 
 
+def _freeze(value: Any) -> Any:
+    """
+    Convert the arguments of an action to a representation identifying them.
+
+    :param value: The value to convert.
+    :returns: A nesting of tuples and plain values.
+    :raises TypeError: If the value contains objects of an unsupported type.
+    """
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, InternalType):
+        return (type(value).__name__, value.internal)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return ('set', tuple(sorted((_freeze(item) for item in value), key=repr)))
+    if isinstance(value, dict):
+        return ('dict', tuple(sorted(((str(key), _freeze(item)) for key, item in value.items()), key=repr)))
+    raise TypeError('Cannot use a %s in a permission cache key' % type(value).__name__)
+
+
+def _decision_key(issuer: "InternalAccount", action: str, kwargs: dict[str, Any]) -> Optional[str]:
+    """
+    Build the cache key of a permission decision.
+
+    :param issuer: The account issuing the action.
+    :param action: The name of the action.
+    :param kwargs: The arguments of the action.
+    :returns: The key, or None if the decision cannot be cached.
+    """
+    try:
+        arguments = repr(_freeze(kwargs))
+    except TypeError:
+        return None
+    return '%s:%s:%s' % (issuer.internal, action, hashlib.sha256(arguments.encode()).hexdigest())
+
+
+def invalidate_permission_cache(session: Optional["Session"] = None) -> None:
+    """
+    Forget the permission decisions, after a change of what they depend on.
+    Only the decisions cached by this process are forgotten, the other processes
+    use theirs until they expire.
+
+    :param session: The session of the change. Its request-level decisions are also
+                    forgotten, and the process ones again once the transaction ends,
+                    in case they were recomputed in the meantime from the data before
+                    the change, or from the uncommitted one.
+    """
+    def _invalidate(*_args) -> None:
+        DECISION_REGION.invalidate()
+
+    _invalidate()
+    if session is not None:
+        session.info.pop(SESSION_DECISIONS_KEY, None)
+        event.listen(session, 'after_commit', _invalidate, once=True)
+        event.listen(session, 'after_rollback', _invalidate, once=True)
+
+
 def has_permission(
         issuer: "InternalAccount",
         action: str,
         kwargs: dict[str, Any],
         session: Optional["Session"] = None  # TODO - make it a required parameter in v40: https://github.com/rucio/rucio/issues/8175
+) -> PermissionResult:
+    """
+    Check if an account is allowed to perform an action.
+
+    The decisions are kept for the rest of the request in the info of the session, and
+    for DECISION_EXPIRATION_TIME seconds by the process, so that bulk operations
+    checking the same action many times query the database once.
+
+    :param issuer: The account issuing the action.
+    :param action: The name of the action.
+    :param kwargs: The arguments of the action.
+    :param session: The database session in use.
+    :returns: The result of the check.
+    """
+    key = _decision_key(issuer, action, kwargs)
+    if key is None:
+        return _has_permission(issuer, action, kwargs, session=session)
+
+    decisions = session.info.setdefault(SESSION_DECISIONS_KEY, {}) if session else {}
+    result = decisions.get(key)
+    if result is None and DECISION_EXPIRATION_TIME > 0:
+        cached = DECISION_REGION.get(key)
+        if cached is not NO_VALUE:
+            result = PermissionResult(*cached)
+    if result is None:
+        result = _has_permission(issuer, action, kwargs, session=session)
+        if DECISION_EXPIRATION_TIME > 0:
+            DECISION_REGION.set(key, (result.allowed, result.message))
+    decisions[key] = result
+    return result
+
+
+def _has_permission(
+        issuer: "InternalAccount",
+        action: str,
+        kwargs: dict[str, Any],
+        session: Optional["Session"] = None
 ) -> PermissionResult:
     if issuer.vo not in permission_modules:
         load_permission_for_vo(issuer.vo)
@@ -98,16 +98,13 @@ def delete_quarantined_replicas(rse_id: str, replicas: "Iterable[dict[str, Any]]
     :param session: The database session in use.
     """
 
-    conditions = []
-    for replica in replicas:
-        conditions.append(models.QuarantinedReplica.path == replica['path'])
-
-    if conditions:
+    replicas = list(replicas)
+    for paths in chunks([replica['path'] for replica in replicas], 1000):
         stmt = delete(
             models.QuarantinedReplica
         ).where(
             and_(models.QuarantinedReplica.rse_id == rse_id,
-                 or_(*conditions))
+                 models.QuarantinedReplica.path.in_(paths))
         ).execution_options(
             synchronize_session=False
         )
@@ -31,7 +31,7 @@ from rucio.common.checksum import CHECKSUM_KEY, GLOBALLY_SUPPORTED_CHECKSUMS
 from rucio.common.config import get_lfn2pfn_algorithm_default
 from rucio.common.constants import DEFAULT_VO, RSE_ALL_SUPPORTED_PROTOCOL_OPERATIONS, RSE_ATTRS_BOOL, RSE_ATTRS_STR, SUPPORTED_SIGN_URL_SERVICES_LITERAL, RseAttr
 from rucio.common.utils import Availability
-from rucio.core.rse_counter import add_counter, get_counter
+from rucio.core.rse_counter import add_counter, get_counter, mark_rse_usage_updated
 from rucio.db.sqla import models
 from rucio.db.sqla.constants import ReplicaState, RSEType
 from rucio.db.sqla.session import read_session, stream_session, transactional_session
@@ -1207,6 +1207,7 @@ def set_rse_usage(
     # versioned_session(session)
     rse_usage = session.merge(rse_usage)
     rse_usage.save(session=session)
+    mark_rse_usage_updated(rse_id, session=session)
 
     # rse_usage_history = models.RSEUsage.__history_mapper__.class_(rse_id=rse.id, source=source, used=used, free=free)
     # rse_usage_history.save(session=session)
@@ -1298,6 +1299,7 @@ def set_rse_limits(rse_id: str, name: str, value: int, *, session: 'Session') ->
     rse_limit = models.RSELimit(rse_id=rse_id, name=name, value=value)
     rse_limit = session.merge(rse_limit)
     rse_limit.save(session=session)
+    mark_rse_usage_updated(rse_id, session=session)
     return True
 
 
@@ -1343,6 +1345,7 @@ def delete_rse_limits(rse_id: str, name: "Optional[str]" = None, *, session: 'Se
                 models.RSELimit.name == name
             )
         session.execute(stmt)
+        mark_rse_usage_updated(rse_id, session=session)
     except IntegrityError as error:
         raise exception.RucioException(error.args)
 
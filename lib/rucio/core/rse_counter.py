@@ -13,10 +13,14 @@
 # limitations under the License.
 from typing import TYPE_CHECKING, Any, Optional
 
-from sqlalchemy import and_, delete, select
+from dogpile.cache.api import NoValue
+from sqlalchemy import and_, delete, event, select
 from sqlalchemy.exc import NoResultFound
 
+from rucio.common.cache import MemcacheRegion
+from rucio.common.config import config_get_int
 from rucio.common.exception import CounterNotFound
+from rucio.common.utils import generate_uuid
 from rucio.db.sqla import filter_thread_work, models
 
 if TYPE_CHECKING:
@@ -24,6 +28,53 @@ if TYPE_CHECKING:
 
     from sqlalchemy.orm import Session
 
+REGION = MemcacheRegion(expiration_time=86400)
+# Minimal interval in seconds between two usage versions published for the updates of the counters
+COUNTER_VERSION_INTERVAL = config_get_int('reaper', 'counter_usage_version_interval', False, 600, check_config_table=False)
+SESSION_USAGE_UPDATES_KEY = 'rse_usage_updates'
+
+
+def mark_rse_usage_updated(rse_id: str, min_interval: int = 0, *, session: "Session") -> None:
+    """
+    Publish a new usage version for an RSE once the transaction is committed, telling consumers
+    of the usage (e.g. the reaper) that their cached view of it is outdated. Publishing it before
+    the commit would let them cache a view of the old usage under the new version.
+
+    :param rse_id:        The id of the RSE.
+    :param min_interval:  If set, no version is published if the current one is more recent than this many seconds.
+    :param session:       The database session of the update.
+    """
+    updates = session.info.get(SESSION_USAGE_UPDATES_KEY)
+    if updates is None:
+        updates = session.info[SESSION_USAGE_UPDATES_KEY] = {}
+
+        def _publish(session: "Session") -> None:
+            for updated_rse_id, interval in session.info.pop(SESSION_USAGE_UPDATES_KEY, {}).items():
+                key = 'rse_usage_version_%s' % updated_rse_id
+                if interval and not isinstance(REGION.get(key, expiration_time=interval), NoValue):
+                    continue
+                REGION.set(key, generate_uuid())
+
+        def _discard(session: "Session") -> None:
+            session.info.pop(SESSION_USAGE_UPDATES_KEY, None)
+
+        event.listen(session, 'after_commit', _publish, once=True)
+        event.listen(session, 'after_rollback', _discard, once=True)
+    updates[rse_id] = min(updates.get(rse_id, min_interval), min_interval)
+
+
+def get_rse_usage_version(rse_id: str) -> Optional[str]:
+    """
+    Return the current usage version of an RSE.
+
+    :param rse_id:  The id of the RSE.
+    :returns:       An opaque version string, or None if no version is known.
+    """
+    version = REGION.get('rse_usage_version_%s' % rse_id)
+    if isinstance(version, NoValue):
+        return None
+    return version
+
 
 def add_counter(
         rse_id: str,
@@ -189,6 +240,10 @@ def update_rse_counter(
     for update in updated_rse_counters:
         update.delete(flush=False, session=session)
 
+    if updated_rse_counters:
+        # The counters are updated at every abacus cycle, do not make the reaper recompute its model as often
+        mark_rse_usage_updated(rse_id, COUNTER_VERSION_INTERVAL, session=session)
+
 
 def fill_rse_counter_history_table(session: "Session") -> None:
     """
@@ -19,7 +19,7 @@ from typing import TYPE_CHECKING, Any, Optional, Union
 
 from dogpile.cache.api import NoValue
 
-from rucio.common.cache import MemcacheRegion
+from rucio.common.cache import LayeredMemcacheRegion
 from rucio.common.exception import InvalidRSEExpression, RSEWriteBlocked
 from rucio.core.rse import get_rse_attribute, get_rses_with_attribute, list_rses
 
@@ -36,7 +36,7 @@ COMPLEMENT = r'(\\%s)' % (PRIMITIVE)
 
 PATTERN = r'^%s(%s|%s|%s)*' % (PRIMITIVE, UNION, INTERSECTION, COMPLEMENT)
 
-REGION = MemcacheRegion(expiration_time=600)
+REGION = LayeredMemcacheRegion(expiration_time=600, name='rse_expression')
 
 
 def parse_expression(
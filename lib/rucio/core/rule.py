@@ -965,12 +965,19 @@ def inject_rule(
 def list_rules(
     filters: Optional[dict[str, Any]] = None,
     *,
+    limit: Optional[int] = None,
+    after: Optional[str] = None,
     session: "Session"
 ) -> 'Iterator[dict[str, Any]]':
     """
     List replication rules.
 
+    With a limit, the rules are listed by pages in the order of their ids:
+    the next page starts after the id of the last rule of the previous one.
+
     :param filters: dictionary of attributes by which the results should be filtered.
+    :param limit:   The maximum number of rules to list.
+    :param after:   The id of the rule after which to start the listing.
     :param session: The database session in use.
     :raises:        RucioException
     """
@@ -1018,6 +1025,10 @@ def list_rules(
             elif key == 'grouping' and isinstance(value, str):
                 value = RuleGrouping(value)
             stmt = stmt.where(getattr(models.ReplicationRule, key) == value)
+    if after is not None:
+        stmt = stmt.where(models.ReplicationRule.id > after)
+    if limit is not None:
+        stmt = stmt.order_by(models.ReplicationRule.id).limit(limit)
 
     try:
         for rule, data_identifier_bytes in session.execute(stmt).yield_per(5):
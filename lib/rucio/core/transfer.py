@@ -431,6 +431,7 @@ def set_transfers_state(
 
     logger(logging.INFO, 'Setting state(%s), transfertool(%s), external_host(%s) and eid(%s) for transfers: %s',
            state.name, transfertool, external_host, external_id, ', '.join(t.rws.request_id for t in transfers))
+    messages = []
     try:
         for transfer in transfers:
             rws = transfer.rws
@@ -501,7 +502,9 @@ def set_transfers_state(
                 transfer_status = 'transfer-%s' % msg['state']
             transfer_status = transfer_status.lower()
 
-            message_core.add_message(transfer_status, msg, session=session)
+            messages.append({'event_type': transfer_status, 'payload': msg})
+
+        message_core.add_messages(messages, session=session)
 
     except IntegrityError as error:
         raise RucioException(error.args)
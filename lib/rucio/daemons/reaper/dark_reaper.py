@@ -23,7 +23,8 @@ import sys
 import threading
 import time
 import traceback
-from typing import TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any
 
 import rucio.core.rse as rse_core
 import rucio.db.sqla.util
@@ -32,7 +33,7 @@ from rucio.common.config import config_get_bool
 from rucio.common.constants import DEFAULT_VO
 from rucio.common.exception import ResourceTemporaryUnavailable, RSEAccessDenied, RSENotFound, ServiceUnavailable, SourceNotFound, VONotFound
 from rucio.common.logging import setup_logging
-from rucio.core.message import add_message
+from rucio.core.message import add_messages
 from rucio.core.monitor import MetricManager
 from rucio.core.quarantined_replica import delete_quarantined_replicas, list_quarantined_replicas, list_rses_with_quarantined_replicas
 from rucio.core.rse_expression_parser import parse_expression
@@ -47,7 +48,7 @@ if TYPE_CHECKING:
     from types import FrameType
     from typing import Optional
 
-    from rucio.common.types import LFNDict
+    from rucio.common.types import LFNDict, LoggerFunction, RSESettingsDict
     from rucio.daemons.common import HeartbeatHandler
 
 logging.getLogger("requests").setLevel(logging.CRITICAL)
@@ -63,6 +64,8 @@ def reaper(
         once: bool = False,
         scheme: "Optional[str]" = None,
         sleep_time: int = 300,
+        concurrent_rses: int = 1,
+        threads_per_rse: int = 1,
 ):
     executable = DAEMON_NAME
     if rses:
@@ -78,15 +81,143 @@ def reaper(
             rses=rses,
             chunk_size=chunk_size,
             scheme=scheme,
+            concurrent_rses=concurrent_rses,
+            threads_per_rse=threads_per_rse,
         ),
     )
 
 
+def delete_dark_replicas(
+        rse_info: "RSESettingsDict",
+        replicas: "Sequence[dict[str, Any]]",
+        scheme: "Optional[str]" = None,
+        logger: "LoggerFunction" = logging.log,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """
+    Delete dark replicas from the storage of one RSE, reusing a single connected protocol object.
+
+    :param rse_info: The RSE settings, as returned by rsemanager.get_rse_info.
+    :param replicas: The dark replicas to delete.
+    :param scheme: Force the reaper to use a particular protocol, e.g., mock.
+    :param logger: Optional decorated logger that can be passed from the calling daemons or servers.
+    :returns: Tuple of the replicas removed from the storage and of the messages to send.
+    """
+    rse = rse_info['rse']
+    rse_id = rse_info['id']
+    deleted_replicas = []
+    messages = []
+    prot = rsemgr.create_protocol(rse_info, 'delete', scheme=scheme, logger=logger)
+    try:
+        prot.connect()
+        for replica in replicas:
+            if GRACEFUL_STOP.is_set():
+                break
+            scope = ''
+            if replica['scope']:
+                scope = replica['scope'].external
+            pfn = None
+            try:
+                lfn: "LFNDict" = {
+                    'scope': scope,
+                    'name': replica['name'],
+                    'path': replica['path']
+                }
+                pfn = str(list(prot.lfns2pfns(lfns=[lfn]).values())[0])
+                logger(logging.INFO, 'Deletion ATTEMPT of %s:%s as %s on %s', scope, replica['name'], pfn, rse)
+                start = time.time()
+                prot.delete(pfn)
+                METRICS.counter('deleted_replicas').inc()
+                duration = time.time() - start
+                logger(logging.INFO, 'Deletion SUCCESS of %s:%s as %s on %s in %s seconds', scope, replica['name'], pfn, rse, duration)
+                payload = {'scope': scope,
+                           'name': replica['name'],
+                           'rse': rse,
+                           'rse_id': rse_id,
+                           'file-size': replica.get('bytes') or 0,
+                           'bytes': replica.get('bytes') or 0,
+                           'url': pfn,
+                           'duration': duration,
+                           'protocol': prot.attributes['scheme']}
+                if replica['scope'] and replica['scope'].vo != DEFAULT_VO:
+                    payload['vo'] = replica['scope'].vo
+                messages.append({'event_type': 'deletion-done', 'payload': payload})
+                deleted_replicas.append(replica)
+            except SourceNotFound:
+                err_msg = ('Deletion NOTFOUND of %s:%s as %s on %s'
+                           % (scope, replica['name'], pfn, rse))
+                logger(logging.WARNING, err_msg)
+                deleted_replicas.append(replica)
+            except (ServiceUnavailable, RSEAccessDenied, ResourceTemporaryUnavailable) as error:
+                err_msg = ('Deletion NOACCESS of %s:%s as %s on %s: %s'
+                           % (scope, replica['name'], pfn, rse, str(error)))
+                logger(logging.WARNING, err_msg)
+                payload = {'scope': scope,
+                           'name': replica['name'],
+                           'rse': rse,
+                           'rse_id': rse_id,
+                           'file-size': replica['bytes'] or 0,
+                           'bytes': replica['bytes'] or 0,
+                           'url': pfn,
+                           'reason': str(error),
+                           'protocol': prot.attributes['scheme']}
+                if replica['scope'] and replica['scope'].vo != DEFAULT_VO:
+                    payload['vo'] = replica['scope'].vo
+                messages.append({'event_type': 'deletion-failed', 'payload': payload})
+
+            except Exception:
+                logger(logging.CRITICAL, traceback.format_exc())
+    finally:
+        prot.close()
+    return deleted_replicas, messages
+
+
+def process_rse(
+        rse_id: str,
+        deleted_replicas: list[dict[str, Any]],
+        dark_replicas: list[dict[str, Any]],
+        scheme: "Optional[str]" = None,
+        threads_per_rse: int = 1,
+        logger: "LoggerFunction" = logging.log,
+) -> None:
+    """
+    Delete the dark replicas of one RSE and remove the processed replicas from the quarantine.
+
+    The dark replicas are split between threads_per_rse threads, each of them using its own protocol object.
+
+    :param rse_id: The RSE id.
+    :param deleted_replicas: The quarantined replicas which can be removed from the quarantine without deletion.
+    :param dark_replicas: The quarantined replicas to delete from the storage.
+    :param scheme: Force the reaper to use a particular protocol, e.g., mock.
+    :param threads_per_rse: The number of threads deleting files concurrently on the RSE.
+    :param logger: Optional decorated logger that can be passed from the calling daemons or servers.
+    """
+    messages = []
+    if dark_replicas:
+        rse_info = rsemgr.get_rse_info(rse_id=rse_id)
+        nb_threads = max(1, min(threads_per_rse, len(dark_replicas)))
+        if nb_threads == 1:
+            results = [delete_dark_replicas(rse_info, dark_replicas, scheme=scheme, logger=logger)]
+        else:
+            with ThreadPoolExecutor(max_workers=nb_threads, thread_name_prefix='dark-reaper-%s' % rse_info['rse']) as executor:
+                results = list(executor.map(lambda replicas: delete_dark_replicas(rse_info, replicas, scheme=scheme, logger=logger),
+                                            [dark_replicas[i::nb_threads] for i in range(nb_threads)]))
+        for deleted, msgs in results:
+            deleted_replicas.extend(deleted)
+            messages.extend(msgs)
+
+    with db_session(DatabaseOperationType.WRITE) as session:
+        if messages:
+            add_messages(messages, session=session)
+        delete_quarantined_replicas(rse_id=rse_id, replicas=deleted_replicas, session=session)
+
+
 def run_once(
         rses: "Sequence[str]",
         heartbeat_handler: "HeartbeatHandler",
         chunk_size: int = 100,
         scheme: "Optional[str]" = None,
+        concurrent_rses: int = 1,
+        threads_per_rse: int = 1,
         **_kwargs,
 ):
     """
@@ -95,6 +226,8 @@ def run_once(
     :param rses: List of RSEs the reaper should work against.
     :param chunk_size: the size of chunk for deletion.
     :param scheme: Force the reaper to use a particular protocol, e.g., mock.
+    :param concurrent_rses: The number of RSEs processed concurrently.
+    :param threads_per_rse: The number of threads deleting files concurrently on each RSE.
     """
     worker_number, total_workers, logger = heartbeat_handler.live()
     logger(logging.INFO, 'Starting Dark Reaper on RSEs: %s', ', '.join(rses))
@@ -102,84 +235,28 @@ def run_once(
     nothing_to_do = True
     rses_to_process = list(set(rses) & set(list_rses_with_quarantined_replicas()))
     random.shuffle(rses_to_process)
-    for rse_id in rses_to_process:
-        worker_number, total_workers, logger = heartbeat_handler.live()
-        # The following query returns the list of real replicas (deleted_replicas) and list of dark replicas (dark_replicas)
-        # Real replicas can be directly removed from the quarantine table
-        deleted_replicas, dark_replicas = list_quarantined_replicas(rse_id=rse_id,
-                                                                    limit=chunk_size,
-                                                                    worker_number=worker_number,
-                                                                    total_workers=total_workers)
-
-        rse_info = rsemgr.get_rse_info(rse_id=rse_id)
-        rse = rse_info['rse']
-        prot = rsemgr.create_protocol(rse_info, 'delete', scheme=scheme)
-
-        try:
-            prot.connect()
-            for replica in dark_replicas:
-                worker_number, total_workers, logger = heartbeat_handler.live()
+    with ThreadPoolExecutor(max_workers=max(1, concurrent_rses), thread_name_prefix='dark-reaper') as executor:
+        futures = {}
+        for rse_id in rses_to_process:
+            worker_number, total_workers, logger = heartbeat_handler.live()
+            # The following query returns the list of real replicas (deleted_replicas) and list of dark replicas (dark_replicas)
+            # Real replicas can be directly removed from the quarantine table
+            deleted_replicas, dark_replicas = list_quarantined_replicas(rse_id=rse_id,
+                                                                        limit=chunk_size,
+                                                                        worker_number=worker_number,
+                                                                        total_workers=total_workers)
+            if dark_replicas:
                 nothing_to_do = False
-                scope = ''
-                if replica['scope']:
-                    scope = replica['scope'].external
-                try:
-                    lfn: "LFNDict" = {
-                        'scope': scope,
-                        'name': replica['name'],
-                        'path': replica['path']
-                    }
-                    pfn = str(list(rsemgr.lfns2pfns(rse_settings=rse_info,
-                                                    lfns=[lfn],
-                                                    operation='delete',
-                                                    scheme=scheme).values())[0])
-                    logger(logging.INFO, 'Deletion ATTEMPT of %s:%s as %s on %s', scope, replica['name'], pfn, rse)
-                    start = time.time()
-                    prot.delete(pfn)
-                    METRICS.counter('deleted_replicas').inc()
-                    duration = time.time() - start
-                    logger(logging.INFO, 'Deletion SUCCESS of %s:%s as %s on %s in %s seconds', scope, replica['name'], pfn, rse, duration)
-                    payload = {'scope': scope,
-                               'name': replica['name'],
-                               'rse': rse,
-                               'rse_id': rse_id,
-                               'file-size': replica.get('bytes') or 0,
-                               'bytes': replica.get('bytes') or 0,
-                               'url': pfn,
-                               'duration': duration,
-                               'protocol': prot.attributes['scheme']}
-                    if replica['scope'].vo != DEFAULT_VO:
-                        payload['vo'] = replica['scope'].vo
-                    add_message('deletion-done', payload)
-                    deleted_replicas.append(replica)
-                except SourceNotFound:
-                    err_msg = ('Deletion NOTFOUND of %s:%s as %s on %s'
-                               % (scope, replica['name'], pfn, rse))
-                    logger(logging.WARNING, err_msg)
-                    deleted_replicas.append(replica)
-                except (ServiceUnavailable, RSEAccessDenied, ResourceTemporaryUnavailable) as error:
-                    err_msg = ('Deletion NOACCESS of %s:%s as %s on %s: %s'
-                               % (scope, replica['name'], pfn, rse, str(error)))
-                    logger(logging.WARNING, err_msg)
-                    payload = {'scope': scope,
-                               'name': replica['name'],
-                               'rse': rse,
-                               'rse_id': rse_id,
-                               'file-size': replica['bytes'] or 0,
-                               'bytes': replica['bytes'] or 0,
-                               'url': pfn,
-                               'reason': str(error),
-                               'protocol': prot.attributes['scheme']}
-                    if replica['scope'].vo != DEFAULT_VO:
-                        payload['vo'] = replica['scope'].vo
-                    add_message('deletion-failed', payload)
-
-                except Exception:
-                    logging.critical(traceback.format_exc())
-        finally:
-            prot.close()
-
-        delete_quarantined_replicas(rse_id=rse_id, replicas=deleted_replicas)
+            future = executor.submit(process_rse, rse_id=rse_id, deleted_replicas=deleted_replicas, dark_replicas=dark_replicas,
+                                     scheme=scheme, threads_per_rse=threads_per_rse, logger=logger)
+            futures[future] = rse_id
+
+        for future in as_completed(futures):
+            worker_number, total_workers, logger = heartbeat_handler.live()
+            try:
+                future.result()
+            except Exception:
+                logger(logging.CRITICAL, 'Dark Reaper failed to process RSE %s: %s', futures[future], traceback.format_exc())
 
     must_sleep = False
     if nothing_to_do:
@@ -205,7 +282,9 @@ def run(
     include_rses: "Optional[str]" = None,
     vos: "Optional[list[str]]" = None,
     delay_seconds: int = 0,
-    sleep_time: int = 300
+    sleep_time: int = 300,
+    concurrent_rses: int = 1,
+    threads_per_rse: int = 1,
 ) -> None:
     """
     Starts up the reaper threads.
@@ -219,6 +298,8 @@ def run(
     :param include_rses: RSE expression to include RSEs.
     :param vos: VOs on which to look for RSEs. Only used in multi-VO mode.
                 If None, we either use all VOs if run from DEFAULT_VO, or the current VO otherwise.
+    :param concurrent_rses: The number of RSEs processed concurrently by each worker.
+    :param threads_per_rse: The number of threads deleting files concurrently on each RSE.
     """
     rses = rses or []
     setup_logging(process_name=DAEMON_NAME)
@@ -280,7 +361,9 @@ def run(
                   'once': once,
                   'chunk_size': chunk_size,
                   'scheme': scheme,
-                  'sleep_time': sleep_time}
+                  'sleep_time': sleep_time,
+                  'concurrent_rses': concurrent_rses,
+                  'threads_per_rse': threads_per_rse}
         threads.append(threading.Thread(target=reaper, kwargs=kwargs,
                                         name='Worker: %s, Total_Workers: %s' % (worker, total_workers)))
     [t.start() for t in threads]
@@ -35,7 +35,7 @@ from sqlalchemy.exc import DatabaseError, IntegrityError
 import rucio.db.sqla.util
 from rucio.db.sqla.constants import DatabaseOperationType
 from rucio.db.sqla.session import db_session
-from rucio.common.cache import MemcacheRegion
+from rucio.common.cache import MemcacheRegion, incr_counter
 from rucio.common.config import config_get_bool, config_get_int
 from rucio.common.constants import RseAttr, DEFAULT_VO
 from rucio.common.exception import DatabaseException, ReplicaNotFound, ReplicaUnAvailable, ResourceTemporaryUnavailable, RSEAccessDenied, RSENotFound, RSEProtocolNotSupported, ServiceUnavailable, SourceNotFound, VONotFound
@@ -44,11 +44,12 @@ from rucio.common.stopwatch import Stopwatch
 from rucio.common.utils import chunks
 from rucio.core.credential import get_signed_url
 from rucio.core.heartbeat import list_payload_counts
-from rucio.core.message import add_message
+from rucio.core.message import add_messages
 from rucio.core.monitor import MetricManager
 from rucio.core.oidc import request_token
 from rucio.core.replica import delete_replicas, list_and_mark_unlocked_replicas
 from rucio.core.rse import RseData, determine_audience_for_rse, determine_scope_for_rse, list_rses
+from rucio.core.rse_counter import get_rse_usage_version
 from rucio.core.rse_expression_parser import parse_expression
 from rucio.core.rule import get_evaluation_backlog
 from rucio.core.vo import list_vos
@@ -64,7 +65,7 @@ if TYPE_CHECKING:
 
 GRACEFUL_STOP = threading.Event()
 METRICS = MetricManager(module=__name__)
-REGION = MemcacheRegion(expiration_time=600)
+REGION = MemcacheRegion(expiration_time=600, memcached_expire_time=7200)
 DAEMON_NAME = 'reaper'
 
 EXCLUDED_RSE_GAUGE = METRICS.gauge('excluded_rses.{rse}', documentation='Temporarly excluded RSEs')
@@ -146,6 +147,7 @@ def delete_from_storage(heartbeat_handler, hb_payload, replicas, prot, rse_info,
     rse_id = rse_info['id']
     noaccess_attempts = 0
     pfns_to_bulk_delete = []
+    messages = []
     try:
         prot.connect()
         for replica in replicas:
@@ -188,7 +190,7 @@ def delete_from_storage(heartbeat_handler, hb_payload, replicas, prot, rse_info,
                 deleted_files.append({'scope': replica['scope'], 'name': replica['name']})
 
                 deletion_dict['duration'] = duration
-                add_message('deletion-done', deletion_dict)
+                messages.append({'event_type': 'deletion-done', 'payload': deletion_dict})
                 logger(logging.INFO, 'Deletion SUCCESS of %s:%s as %s on %s in %.2f seconds', replica['scope'], replica['name'], replica['pfn'], rse_name, duration)
 
             except SourceNotFound:
@@ -197,7 +199,7 @@ def delete_from_storage(heartbeat_handler, hb_payload, replicas, prot, rse_info,
                 logger(logging.WARNING, '%s', err_msg)
                 deletion_dict['reason'] = 'File Not Found'
                 deletion_dict['duration'] = duration
-                add_message('deletion-not-found', deletion_dict)
+                messages.append({'event_type': 'deletion-not-found', 'payload': deletion_dict})
                 deleted_files.append({'scope': replica['scope'], 'name': replica['name']})
 
             except (ServiceUnavailable, RSEAccessDenied, ResourceTemporaryUnavailable) as error:
@@ -205,7 +207,7 @@ def delete_from_storage(heartbeat_handler, hb_payload, replicas, prot, rse_info,
                 logger(logging.WARNING, 'Deletion NOACCESS of %s:%s as %s on %s: %s in %.2f', replica['scope'], replica['name'], replica['pfn'], rse_name, str(error), duration)
                 deletion_dict['reason'] = str(error)
                 deletion_dict['duration'] = duration
-                add_message('deletion-failed', deletion_dict)
+                messages.append({'event_type': 'deletion-failed', 'payload': deletion_dict})
                 noaccess_attempts += 1
                 if noaccess_attempts >= auto_exclude_threshold:
                     logger(logging.INFO, 'Too many (%d) NOACCESS attempts for %s. RSE will be temporarily excluded.', noaccess_attempts, rse_name)
@@ -220,7 +222,7 @@ def delete_from_storage(heartbeat_handler, hb_payload, replicas, prot, rse_info,
                 logger(logging.CRITICAL, 'Deletion CRITICAL of %s:%s as %s on %s in %.2f seconds : %s', replica['scope'], replica['name'], replica['pfn'], rse_name, duration, str(traceback.format_exc()))
                 deletion_dict['reason'] = str(error)
                 deletion_dict['duration'] = duration
-                add_message('deletion-failed', deletion_dict)
+                messages.append({'event_type': 'deletion-failed', 'payload': deletion_dict})
 
         if pfns_to_bulk_delete and prot.attributes['scheme'] == 'globus':
             logger(logging.DEBUG, 'Attempting bulk delete on RSE %s for scheme %s', rse_name, prot.attributes['scheme'])
@@ -239,12 +241,20 @@ def delete_from_storage(heartbeat_handler, hb_payload, replicas, prot, rse_info,
                        'protocol': prot.attributes['scheme']}
             if replica['scope'].vo != DEFAULT_VO:
                 payload['vo'] = replica['scope'].vo
-            add_message('deletion-failed', payload)
+            messages.append({'event_type': 'deletion-failed', 'payload': payload})
         logger(logging.INFO, 'Cannot connect to %s. RSE will be temporarily excluded.', rse_name)
         REGION.set('temporary_exclude_%s' % rse_id, True)
         EXCLUDED_RSE_GAUGE.labels(rse=rse_name).set(1)
     finally:
-        prot.close()
+        try:
+            prot.close()
+        finally:
+            # Sent even if the connection cannot be closed, without masking the errors of the deletions
+            if messages:
+                try:
+                    add_messages(messages)
+                except Exception:
+                    logger(logging.ERROR, 'Failed to send %d deletion messages of %s', len(messages), rse_name, exc_info=True)
     return deleted_files
 
 
@@ -314,16 +324,63 @@ def __try_reserve_worker_slot(heartbeat_handler: "HeartbeatHandler", rse: RseDat
     return rse_hostname_key
 
 
-def __check_rse_usage_cached(rse: RseData, greedy: bool = False, logger: "LoggerFunction" = logging.log) -> tuple[int, bool]:
+def __check_rse_usage_cached(rse: RseData, greedy: bool = False, max_age: int = 3600, logger: "LoggerFunction" = logging.log) -> tuple[int, bool]:
     """
-    Wrapper around __check_rse_usage which manages the cache entry.
+    Wrapper around __check_rse_usage which manages the cached usage model of the RSE.
+
+    The model is recomputed when the usage version of the RSE changed (i.e. its usage or limits
+    were updated, e.g. by abacus), when the greedy mode changed or when it is older than max_age.
+    In between, the bytes deleted by all the reaper workers since the model was computed, counted
+    by __update_rse_usage_cached, are subtracted from its needed free space.
+
+    :param rse:     The RSE.
+    :param greedy:  If True, needed_free_space will be set to 1TB regardless of actual rse usage.
+    :param max_age: Maximum age of the model in seconds.
+    :param logger:  Optional decorated logger that can be passed from the calling daemons or servers.
+
+    :returns: needed_free_space, only_delete_obsolete.
     """
     cache_key = 'rse_usage_%s' % rse.id
-    result = REGION.get(cache_key)
-    if isinstance(result, NoValue):
-        result = __check_rse_usage(rse=rse, greedy=greedy, logger=logger)
-        REGION.set(cache_key, result)
-    return result
+    version = get_rse_usage_version(rse.id)
+    deleted_bytes = incr_counter(REGION, 'rse_deleted_bytes_%s' % rse.id, 0)
+    model = REGION.get(cache_key, expiration_time=max_age)
+    if isinstance(model, NoValue) or not isinstance(model, dict) \
+            or model['version'] != version or model['greedy'] != greedy or time.time() - model['computed_at'] > max_age \
+            or deleted_bytes is None or model.get('deleted_bytes') is None or deleted_bytes < model['deleted_bytes']:
+        needed_free_space, only_delete_obsolete = __check_rse_usage(rse=rse, greedy=greedy, logger=logger)
+        model = {'needed_free_space': needed_free_space,
+                 'only_delete_obsolete': only_delete_obsolete,
+                 'greedy': greedy,
+                 'version': version,
+                 'deleted_bytes': deleted_bytes,
+                 'computed_at': time.time()}
+        REGION.set(cache_key, model)
+        METRICS.counter('rse_usage.refresh').inc()
+        return needed_free_space, only_delete_obsolete
+
+    needed_free_space, only_delete_obsolete = model['needed_free_space'], model['only_delete_obsolete']
+    if needed_free_space and not greedy:
+        needed_free_space = max(needed_free_space - (deleted_bytes - model['deleted_bytes']), 0)
+        if not needed_free_space:
+            only_delete_obsolete = True
+        logger(logging.DEBUG, 'RSE %s: %s bytes deleted since the usage was computed, %s bytes still needed',
+               rse.name, deleted_bytes - model['deleted_bytes'], needed_free_space)
+    return needed_free_space, only_delete_obsolete
+
+
+def __update_rse_usage_cached(rse: RseData, deleted_bytes: int, logger: "LoggerFunction" = logging.log) -> None:
+    """
+    Count the bytes deleted by the reaper on the RSE, so that they are subtracted from the needed free
+    space of the cached usage model and the following cycles do not delete the same amount again until
+    the usage is refreshed. The counter is shared by all the workers and updated atomically.
+
+    :param rse:           The RSE.
+    :param deleted_bytes: The number of bytes deleted.
+    :param logger:        Optional decorated logger that can be passed from the calling daemons or servers.
+    """
+    if deleted_bytes:
+        total = incr_counter(REGION, 'rse_deleted_bytes_%s' % rse.id, deleted_bytes)
+        logger(logging.DEBUG, 'RSE %s: %s bytes deleted, %s bytes counted in total', rse.name, deleted_bytes, total)
 
 
 def __check_rse_usage(rse: RseData, greedy: bool = False, logger: "LoggerFunction" = logging.log) -> tuple[int, bool]:
@@ -525,6 +582,7 @@ def _run_once(
     dict_rses = {}
     _, total_workers, logger = heartbeat_handler.live()
     tot_needed_free_space = 0
+    rse_usage_max_age = config_get_int('reaper', 'rse_usage_max_age', default=3600, raise_exception=False)
     for rse in rses_to_process:
         # Check if RSE is blocklisted
         if not rse.columns['availability_delete']:
@@ -532,7 +590,7 @@ def _run_once(
             continue
         rse.ensure_loaded(load_attributes=True)
         enable_greedy = rse.attributes.get(RseAttr.GREEDYDELETION, False) or greedy
-        needed_free_space, only_delete_obsolete = __check_rse_usage_cached(rse, greedy=enable_greedy, logger=logger)
+        needed_free_space, only_delete_obsolete = __check_rse_usage_cached(rse, greedy=enable_greedy, max_age=rse_usage_max_age, logger=logger)
         if needed_free_space:
             dict_rses[rse] = [needed_free_space, only_delete_obsolete, enable_greedy]
             tot_needed_free_space += needed_free_space
@@ -658,6 +716,9 @@ def _run_once(
                 delete_replicas(rse_id=rse.id, files=deleted_files)  # type: ignore (argument missing: session)
                 logger(logging.DEBUG, 'delete_replicas succeeded on %s : %s replicas in %s seconds', rse.name, len(deleted_files), time.time() - del_start)
                 METRICS.counter('deletion.done').inc(len(deleted_files))
+                deleted_dids = {(file['scope'], file['name']) for file in deleted_files}
+                deleted_bytes = sum(replica['bytes'] or 0 for replica in file_replicas if (replica['scope'], replica['name']) in deleted_dids)
+                __update_rse_usage_cached(rse, deleted_bytes, logger=logger)
         except RSEProtocolNotSupported:
             logger(logging.WARNING, 'Protocol %s not supported on %s', scheme, rse.name)
         except Exception:
@@ -15,6 +15,7 @@
 from typing import Any
 
 from rucio.common import exception
+from rucio.common.cache import SingleFlight
 from rucio.common.config import convert_to_any_type
 from rucio.common.constants import DEFAULT_VO
 from rucio.core import config
@@ -29,6 +30,9 @@ ConfigParser compatible interface.
 - Convenience methods getint/getfloat/getboolean are superseded by auto-coercing get.
 """
 
+# The options of the configuration table, read by the clients and the daemons
+CONFIG_READS = SingleFlight('config')
+
 
 def sections(issuer: str, vo: str = DEFAULT_VO) -> list[str]:
     """
@@ -44,7 +48,7 @@ def sections(issuer: str, vo: str = DEFAULT_VO) -> list[str]:
         auth_result = permission.has_permission(issuer=issuer, vo=vo, action='config_sections', kwargs=kwargs, session=session)
         if not auth_result.allowed:
             raise exception.AccessDenied('%s cannot retrieve sections. %s' % (issuer, auth_result.message))
-        return config.sections(session=session)
+        return CONFIG_READS.call(('sections',), lambda: config.sections(session=session))
 
 
 def has_section(section: str, issuer: str, vo: str = DEFAULT_VO) -> bool:
@@ -103,7 +107,7 @@ def get(section: str, option: str, issuer: str, vo: str = DEFAULT_VO) -> Any:
         auth_result = permission.has_permission(issuer=issuer, vo=vo, action='config_get', kwargs=kwargs, session=session)
         if not auth_result.allowed:
             raise exception.AccessDenied('%s cannot retrieve option %s from section %s. %s' % (issuer, option, section, auth_result.message))
-        return config.get(section, option, session=session, convert_type_fnc=convert_to_any_type)
+        return CONFIG_READS.call(('get', section, option), lambda: config.get(section, option, session=session, convert_type_fnc=convert_to_any_type))
 
 
 def items(section: str, issuer: str, vo: str = DEFAULT_VO) -> list[tuple[str, Any]]:
@@ -122,9 +126,10 @@ def items(section: str, issuer: str, vo: str = DEFAULT_VO) -> list[tuple[str, An
         auth_result = permission.has_permission(issuer=issuer, vo=vo, action='config_items', kwargs=kwargs, session=session)
         if not auth_result.allowed:
             raise exception.AccessDenied('%s cannot retrieve options and values from section %s. %s' % (issuer, section, auth_result.message))
-        return config.items(section, session=session, convert_type_fnc=convert_to_any_type)
+        return CONFIG_READS.call(('items', section), lambda: config.items(section, session=session, convert_type_fnc=convert_to_any_type))
 
 
+@CONFIG_READS.invalidates()
 def set(section: str, option: str, value: Any, issuer: str, vo: str = DEFAULT_VO) -> None:
     """
     Set the given option to the specified value.
@@ -144,6 +149,7 @@ def set(section: str, option: str, value: Any, issuer: str, vo: str = DEFAULT_VO
         return config.set(section, option, value, session=session)
 
 
+@CONFIG_READS.invalidates()
 def remove_section(section: str, issuer: str, vo: str = DEFAULT_VO) -> bool:
     """
     Remove the specified option from the specified section.
@@ -162,6 +168,7 @@ def remove_section(section: str, issuer: str, vo: str = DEFAULT_VO) -> bool:
         return config.remove_section(section, session=session)
 
 
+@CONFIG_READS.invalidates()
 def remove_option(section: str, option: str, issuer: str, vo: str = DEFAULT_VO) -> bool:
     """
     Remove the specified section from the configuration.
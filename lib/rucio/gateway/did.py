@@ -16,6 +16,7 @@ from copy import deepcopy
 from typing import TYPE_CHECKING, Any, Optional
 
 import rucio.gateway.permission
+from rucio.common.cache import SingleFlight
 from rucio.common.constants import DEFAULT_VO, RESERVED_KEYS
 from rucio.common.exception import AccessDenied, InvalidObject, RucioException
 from rucio.common.schema import validate_schema
@@ -28,7 +29,31 @@ from rucio.db.sqla.constants import DatabaseOperationType, DIDType
 from rucio.db.sqla.session import db_session
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Iterator, Mapping, Sequence
+    from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+
+# The DIDs and metadata read by many jobs at once, tagged with (scope, name, vo)
+DID_READS = SingleFlight('did')
+
+
+def _written_did(arguments: "Mapping[str, Any]") -> "Optional[list[tuple[Any, ...]]]":
+    """
+    The DID changed by a write, or None if the write also changes its content.
+    """
+    if arguments.get('recursive'):
+        return None
+    return [(arguments['scope'], arguments['name'], arguments['vo'])]
+
+
+def _written_dids(parameter: str) -> "Callable[[Mapping[str, Any]], Optional[list[tuple[Any, ...]]]]":
+    """
+    The DIDs changed by a bulk write, listed in the given parameter.
+    """
+    def tags(arguments: "Mapping[str, Any]") -> "Optional[list[tuple[Any, ...]]]":
+        dids = arguments[parameter]
+        if arguments.get('recursive') or not isinstance(dids, (list, tuple)):
+            return None
+        return [(d.get('scope'), d.get('name'), arguments['vo']) for d in dids]
+    return tags
 
 
 def list_dids(
@@ -41,6 +66,8 @@ def list_dids(
     long: bool = False,
     recursive: bool = False,
     vo: str = DEFAULT_VO,
+    ordered: bool = False,
+    after: Optional[tuple[str, str]] = None,
 ) -> 'Iterator[dict[str, Any]]':
     """
     List DIDs in a scope.
@@ -54,8 +81,12 @@ def list_dids(
     :param long: Long format option to display more information for each DID.
     :param recursive: Recursively list DIDs content.
     :param vo: The VO to act on.
+    :param ordered: List the DIDs ordered by scope and name, to list them by pages of limit DIDs.
+    :param after: The scope and name of the DID after which to start an ordered listing.
     """
     internal_scope = InternalScope(scope, vo=vo)
+    if after is not None:
+        after = (InternalScope(after[0], vo=vo), after[1])
 
     # replace account and scope in filters with internal representation
     for or_group in filters:
@@ -66,7 +97,8 @@ def list_dids(
 
     with db_session(DatabaseOperationType.READ) as session:
         result = did.list_dids(scope=internal_scope, filters=filters, did_type=did_type, ignore_case=ignore_case,
-                               limit=limit, offset=offset, long=long, recursive=recursive, session=session)
+                               limit=limit, offset=offset, long=long, recursive=recursive, ordered=ordered, after=after,
+                               session=session)
 
         for d in result:
             yield gateway_update_return_dict(d, session=session)
@@ -185,6 +217,7 @@ def add_dids(
         return did.add_dids(dids, account=issuer_account, session=session)
 
 
+@DID_READS.invalidates(_written_did)
 def attach_dids(
     scope: str,
     name: str,
@@ -233,6 +266,7 @@ def attach_dids(
     return dids
 
 
+@DID_READS.invalidates(_written_dids('attachments'))
 def attach_dids_to_dids(
     attachments: 'Sequence[dict[str, Any]]',
     issuer: str,
@@ -274,6 +308,7 @@ def attach_dids_to_dids(
                                        ignore_duplicate=ignore_duplicate, session=session)
 
 
+@DID_READS.invalidates(_written_did)
 def detach_dids(
     scope: str,
     name: str,
@@ -330,6 +365,7 @@ def list_new_dids(
         yield from dids
 
 
+@DID_READS.invalidates(_written_dids('dids'))
 def set_new_dids(
     dids: 'Sequence[dict[str, Any]]',
     new_flag: bool = True,
@@ -354,6 +390,8 @@ def list_content(
     scope: str,
     name: str,
     vo: str = DEFAULT_VO,
+    limit: Optional[int] = None,
+    after: Optional[tuple[str, str]] = None,
 ) -> 'Iterator[dict[str, Any]]':
     """
     List data identifier contents.
@@ -361,12 +399,16 @@ def list_content(
     :param scope: The scope name.
     :param name: The data identifier name.
     :param vo: The VO to act on.
+    :param limit: The maximum number of contents to list, ordered by scope and name.
+    :param after: The scope and name of the content after which to start the listing.
     """
 
     internal_scope = InternalScope(scope, vo=vo)
+    if after is not None:
+        after = (InternalScope(after[0], vo=vo), after[1])
 
     with db_session(DatabaseOperationType.READ) as session:
-        dids = did.list_content(scope=internal_scope, name=name, session=session)
+        dids = did.list_content(scope=internal_scope, name=name, limit=limit, after=after, session=session)
         for d in dids:
             yield gateway_update_return_dict(d, session=session)
 
@@ -481,11 +523,15 @@ def get_did(scope: str, name: str, dynamic_depth: Optional[DIDType] = None, vo:
 
     internal_scope = InternalScope(scope, vo=vo)
 
-    with db_session(DatabaseOperationType.READ) as session:
-        d = did.get_did(scope=internal_scope, name=name, dynamic_depth=dynamic_depth, session=session)
-        return gateway_update_return_dict(d, session=session)
+    def _get_did():
+        with db_session(DatabaseOperationType.READ) as session:
+            d = did.get_did(scope=internal_scope, name=name, dynamic_depth=dynamic_depth, session=session)
+            return gateway_update_return_dict(d, session=session)
 
+    return DID_READS.call(('did', scope, name, dynamic_depth, vo), _get_did, tag=(scope, name, vo))
 
+
+@DID_READS.invalidates(_written_did)
 def set_metadata(
     scope: str,
     name: str,
@@ -520,6 +566,7 @@ def set_metadata(
         return did.set_metadata(scope=internal_scope, name=name, key=key, value=value, recursive=recursive, session=session)
 
 
+@DID_READS.invalidates(_written_did)
 def set_metadata_bulk(
     scope: str,
     name: str,
@@ -553,6 +600,7 @@ def set_metadata_bulk(
         return did.set_metadata_bulk(scope=internal_scope, name=name, meta=meta, recursive=recursive, session=session)
 
 
+@DID_READS.invalidates(_written_dids('dids'))
 def set_dids_metadata_bulk(
     dids: 'Iterable[dict[str, Any]]',
     issuer: str,
@@ -600,9 +648,12 @@ def get_metadata(
 
     internal_scope = InternalScope(scope, vo=vo)
 
-    with db_session(DatabaseOperationType.READ) as session:
-        d = did.get_metadata(scope=internal_scope, name=name, plugin=plugin, session=session)
-        return gateway_update_return_dict(d, session=session)
+    def _get_metadata():
+        with db_session(DatabaseOperationType.READ) as session:
+            d = did.get_metadata(scope=internal_scope, name=name, plugin=plugin, session=session)
+            return gateway_update_return_dict(d, session=session)
+
+    return DID_READS.call(('metadata', scope, name, plugin, vo), _get_metadata, tag=(scope, name, vo))
 
 
 def get_metadata_bulk(
@@ -629,6 +680,7 @@ def get_metadata_bulk(
             yield gateway_update_return_dict(met, session=session)
 
 
+@DID_READS.invalidates(_written_did)
 def delete_metadata(
     scope: str,
     name: str,
@@ -649,6 +701,7 @@ def delete_metadata(
         return did.delete_metadata(scope=internal_scope, name=name, key=key, session=session)
 
 
+@DID_READS.invalidates(_written_did)
 def set_status(
     scope: str,
     name: str,
@@ -755,6 +808,7 @@ def create_did_sample(
                                      account=issuer_account, nbfiles=nbfiles, session=session)
 
 
+@DID_READS.invalidates(_written_dids('dids'))
 def resurrect(
     dids: 'Iterable[dict[str, Any]]',
     issuer: str,
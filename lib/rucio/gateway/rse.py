@@ -15,6 +15,7 @@
 from typing import TYPE_CHECKING, Any
 
 from rucio.common import exception
+from rucio.common.cache import SingleFlight
 from rucio.common.constants import DEFAULT_VO
 from rucio.common.schema import validate_schema
 from rucio.common.utils import gateway_update_return_dict
@@ -26,8 +27,19 @@ from rucio.db.sqla.session import db_session
 from rucio.gateway import permission
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
     from typing import Optional
 
+# The protocols and attributes of the RSEs, read by the clients before each transfer, tagged with (rse, vo)
+RSE_READS = SingleFlight('rse')
+
+
+def _written_rse(arguments: "Mapping[str, Any]") -> list[tuple[Any, ...]]:
+    """
+    The RSE changed by a write.
+    """
+    return [(arguments['rse'], arguments['vo'])]
+
 
 def add_rse(
     rse,
@@ -99,11 +111,16 @@ def get_rse(rse, vo=DEFAULT_VO):
     :raises RSENotFound: if the referred RSE was not found in the database
     """
 
+    return RSE_READS.call(('protocols', rse, vo), lambda: _get_rse_protocols(rse, vo), tag=(rse, vo))
+
+
+def _get_rse_protocols(rse, vo):
     with db_session(DatabaseOperationType.READ) as session:
         rse_id = rse_module.get_rse_id(rse=rse, vo=vo, session=session)
         return rse_module.get_rse_protocols(rse_id=rse_id, session=session)
 
 
+@RSE_READS.invalidates(_written_rse)
 def del_rse(rse, issuer, vo=DEFAULT_VO):
     """
     Disables an RSE with the provided RSE name.
@@ -141,6 +158,7 @@ def list_rses(filters: "Optional[dict[str, Any]]" = None, vo: str = DEFAULT_VO)
         return rse_module.list_rses(filters=filters, session=session)
 
 
+@RSE_READS.invalidates(_written_rse)
 def del_rse_attribute(rse, key, issuer, vo=DEFAULT_VO):
     """
     Delete a RSE attribute.
@@ -163,6 +181,7 @@ def del_rse_attribute(rse, key, issuer, vo=DEFAULT_VO):
         return rse_module.del_rse_attribute(rse_id=rse_id, key=key, session=session)
 
 
+@RSE_READS.invalidates(_written_rse)
 def add_rse_attribute(rse, key, value, issuer, vo=DEFAULT_VO):
     """ Adds a RSE attribute.
 
@@ -195,9 +214,12 @@ def list_rse_attributes(rse, vo=DEFAULT_VO):
     :returns: List of all RSE attributes for a RSE_MODULE.
     """
 
-    with db_session(DatabaseOperationType.READ) as session:
-        rse_id = rse_module.get_rse_id(rse=rse, vo=vo, session=session)
-        return rse_module.list_rse_attributes(rse_id=rse_id, session=session)
+    def _list_rse_attributes():
+        with db_session(DatabaseOperationType.READ) as session:
+            rse_id = rse_module.get_rse_id(rse=rse, vo=vo, session=session)
+            return rse_module.list_rse_attributes(rse_id=rse_id, session=session)
+
+    return RSE_READS.call(('attributes', rse, vo), _list_rse_attributes, tag=(rse, vo))
 
 
 def has_rse_attribute(rse_id, key):
@@ -225,6 +247,7 @@ def get_rses_with_attribute(key):
         return rse_module.get_rses_with_attribute(key=key, session=session)
 
 
+@RSE_READS.invalidates(_written_rse)
 def add_protocol(rse, issuer, vo=DEFAULT_VO, **data):
     """
     Creates a new protocol entry for an existing RSE.
@@ -254,11 +277,10 @@ def get_rse_protocols(rse, issuer, vo=DEFAULT_VO):
 
     :returns: A dict with all supported protocols and their attributes.
     """
-    with db_session(DatabaseOperationType.READ) as session:
-        rse_id = rse_module.get_rse_id(rse=rse, vo=vo, session=session)
-        return rse_module.get_rse_protocols(rse_id, session=session)
+    return RSE_READS.call(('protocols', rse, vo), lambda: _get_rse_protocols(rse, vo), tag=(rse, vo))
 
 
+@RSE_READS.invalidates(_written_rse)
 def del_protocols(rse, scheme, issuer, vo=DEFAULT_VO, hostname=None, port=None):
     """
     Deletes all matching protocol entries for the given RSE..
@@ -281,6 +303,7 @@ def del_protocols(rse, scheme, issuer, vo=DEFAULT_VO, hostname=None, port=None):
         rse_module.del_protocols(rse_id=rse_id, scheme=scheme, hostname=hostname, port=port, session=session)
 
 
+@RSE_READS.invalidates(_written_rse)
 def update_protocols(rse, scheme, data, issuer, vo=DEFAULT_VO, hostname=None, port=None):
     """
     Updates all provided attributes for all matching protocol entries of the given RSE..
@@ -440,6 +463,7 @@ def parse_rse_expression(rse_expression, vo=DEFAULT_VO):
     return [rse['rse'] for rse in rses]
 
 
+@RSE_READS.invalidates(_written_rse)
 def update_rse(rse, parameters, issuer, vo=DEFAULT_VO):
     """
     Update RSE properties like availability or name.
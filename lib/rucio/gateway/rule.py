@@ -161,12 +161,16 @@ def get_replication_rule(rule_id: str, issuer: str, vo: str = DEFAULT_VO) -> dic
 def list_replication_rules(
     filters: Optional[dict[str, Any]] = None,
     vo: str = DEFAULT_VO,
+    limit: Optional[int] = None,
+    after: Optional[str] = None,
 ) -> "Iterator[dict[str, Any]]":
     """
     Lists replication rules based on a filter.
 
     :param filters: dictionary of attributes by which the results should be filtered.
     :param vo: The VO to act on.
+    :param limit: The maximum number of rules to list, ordered by id.
+    :param after: The id of the rule after which to start the listing.
     """
     # If filters is empty, create a new dict to avoid overwriting the function's default
     filters = filters or {}
@@ -184,7 +188,7 @@ def list_replication_rules(
     filters['account'] = InternalAccount(account=account, vo=vo)
 
     with db_session(DatabaseOperationType.READ) as session:
-        rules = rule.list_rules(filters, session=session)
+        rules = rule.list_rules(filters, limit=limit, after=after, session=session)
         for r in rules:
             yield gateway_update_return_dict(r, session=session)
 
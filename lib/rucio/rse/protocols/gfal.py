@@ -251,6 +251,42 @@ class Default(protocol.RSEProtocol):
         except Exception as error:
             raise exception.ServiceUnavailable(error)
 
+    def get_range(self, path, dest, offset, length, transfer_timeout=None):
+        """
+        Downloads a byte range of a file into an existing local file, at the same offset.
+
+        :param path: Physical file name of requested file
+        :param dest: Name and path of the local file, which must exist
+        :param offset: Position of the first byte of the range
+        :param length: Number of bytes of the range
+        :param transfer_timeout: Transfer timeout (in seconds)
+
+        :raises SourceNotFound: if the source file was not found on the referred storage.
+        :raises ServiceUnavailable: if some generic error occurred in the library.
+        """
+        self.logger(logging.DEBUG, 'downloading bytes {}-{} of {} to {}'.format(offset, offset + length - 1, path, dest))
+        chunksize = 4 * 1024 * 1024
+
+        try:
+            remote = self.__ctx.open(path, 'r')
+            try:
+                with open(dest, 'r+b') as file_out:
+                    file_out.seek(offset)
+                    received = 0
+                    while received < length:
+                        data = remote.pread_bytes(offset + received, min(chunksize, length - received))
+                        if not data:
+                            raise exception.ServiceUnavailable('Unexpected end of file %s after %s bytes' % (path, offset + received))
+                        file_out.write(data)
+                        received += len(data)
+            finally:
+                # gfal2 closes the file when its handle is destroyed, there is no close method
+                del remote
+        except gfal2.GError as error:  # pylint: disable=no-member
+            if error.code == errno.ENOENT or 'No such file' in str(error):
+                raise exception.SourceNotFound(str(error))
+            raise exception.ServiceUnavailable(error)
+
     def put(self, source, target, source_dir, transfer_timeout=None):
         """
         Allows to store files inside the referred RSE.
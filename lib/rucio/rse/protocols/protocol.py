@@ -287,6 +287,30 @@ class RSEProtocol(ABC):
          """
         raise NotImplementedError
 
+    def get_range(
+            self,
+            path: str,
+            dest: str,
+            offset: int,
+            length: int,
+            transfer_timeout: Optional[int] = None
+    ) -> None:
+        """
+            Downloads a byte range of a file stored inside the connected RSE into an existing
+            local file, at the same offset. Only implemented by the protocols able to read
+            byte ranges, which allows to download a file in segments from several sources.
+
+            :param path: Physical file name of requested file
+            :param dest: Name and path of the local file, which must exist
+            :param offset: Position of the first byte of the range
+            :param length: Number of bytes of the range
+            :param transfer_timeout: Transfer timeout (in seconds)
+
+            :raises ServiceUnavailable: if some generic error occurred in the library.
+            :raises SourceNotFound: if the source file was not found on the referred storage.
+         """
+        raise NotImplementedError
+
     @abstractmethod
     def put(
             self,
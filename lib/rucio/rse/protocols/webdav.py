@@ -316,6 +316,56 @@ class Default(protocol.RSEProtocol):
         except requests.exceptions.ReadTimeout as error:
             raise exception.ServiceUnavailable(error)
 
+    def get_range(self, pfn, dest, offset, length, transfer_timeout=None):
+        """ Downloads a byte range of a file into an existing local file, at the same offset.
+
+            :param pfn: Physical file name of requested file
+            :param dest: Name and path of the local file, which must exist
+            :param offset: Position of the first byte of the range
+            :param length: Number of bytes of the range
+            :param transfer_timeout: Transfer timeout (in seconds)
+
+            :raises ServiceUnavailable, SourceNotFound, RSEAccessDenied
+        """
+        path = self.path2pfn(pfn)
+        chunksize = 1024 * 1024
+        transfer_timeout = self.timeout if transfer_timeout is None else transfer_timeout
+        headers = {'Range': 'bytes=%d-%d' % (offset, offset + length - 1)}
+
+        try:
+            result = self.session.get(path, verify=False, stream=True, headers=headers, timeout=transfer_timeout, cert=self.cert)
+            if result.status_code in [206, ]:
+                with result:
+                    # Never write outside of the requested range, which would corrupt the other segments
+                    content_range = result.headers.get('Content-Range', '')
+                    if not content_range.startswith('bytes %d-%d/' % (offset, offset + length - 1)):
+                        raise exception.ServiceUnavailable('Received the range %r instead of %r of %s' % (content_range, headers['Range'], path))
+                    received = 0
+                    with open(dest, 'r+b') as file_out:
+                        file_out.seek(offset)
+                        for chunk in result.iter_content(chunksize):
+                            received += len(chunk)
+                            if received > length:
+                                raise exception.ServiceUnavailable('Received more than %s bytes for the range %s of %s' % (length, headers['Range'], path))
+                            file_out.write(chunk)
+                if received != length:
+                    raise exception.ServiceUnavailable('Received %s bytes instead of %s for the range %s of %s' % (received, length, headers['Range'], path))
+            elif result.status_code in [200, ]:
+                # The server ignored the range and sends the whole file
+                result.close()
+                raise exception.ServiceUnavailable('Range requests not supported by the server: %s' % path)
+            elif result.status_code in [404, ]:
+                raise exception.SourceNotFound()
+            elif result.status_code in [401, 403]:
+                raise exception.RSEAccessDenied()
+            else:
+                # catchall exception
+                raise exception.RucioException(result.status_code, result.text)
+        except requests.exceptions.ConnectionError as error:
+            raise exception.ServiceUnavailable(error)
+        except requests.exceptions.ReadTimeout as error:
+            raise exception.ServiceUnavailable(error)
+
     def put(self, source, target, source_dir=None, transfer_timeout=None, progressbar=False):
         """ Allows to store files inside the referred RSE.
 
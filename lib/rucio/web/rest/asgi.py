@@ -0,0 +1,331 @@
+# Copyright European Organization for Nuclear Research (CERN) since 2012
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+ASGI entry point of the REST API, to be served by an ASGI server, e.g.
+
+    uvicorn rucio.web.rest.asgi:application
+
+The Flask application runs unchanged in a pool of threads. Each request is handled from
+start to end by a single thread, as the database sessions are bound to their thread. The
+response is sent asynchronously from a buffer, so that a slow client does not hold a thread
+for the whole transfer. When a response does not fit in the memory buffer, the rest of it is
+spilled to a temporary file, so that the thread finishes and releases its database session.
+Only a response larger than the spool size makes its thread wait for the client.
+
+For the X.509 authentication, the DN of the client certificate is taken from the TLS
+extension of ASGI, in the RFC 4514 format of the server, if it provides it.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+from typing import TYPE_CHECKING, Any, Optional
+
+from rucio.common.config import config_get_int
+from rucio.web.rest.flaskapi.v1.main import application as wsgi_application
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, MutableMapping
+
+    from _typeshed.wsgi import WSGIApplication, WSGIEnvironment
+
+    Message = MutableMapping[str, Any]
+    Receive = Callable[[], Awaitable[Message]]
+    Send = Callable[[Message], Awaitable[None]]
+
+LOG = logging.getLogger(__name__)
+
+# Number of requests handled at the same time
+ASGI_THREADS = config_get_int('api', 'asgi_threads', raise_exception=False, default=32, check_config_table=False)
+# Bytes of a response buffered in memory for the client before the rest is spilled to a temporary file
+ASGI_BUFFER_SIZE = config_get_int('api', 'asgi_buffer_size', raise_exception=False, default=4 * 1024 * 1024, check_config_table=False)
+# Bytes of a response spilled to a temporary file before its thread waits; 0 to never spill
+ASGI_SPOOL_SIZE = config_get_int('api', 'asgi_spool_size', raise_exception=False, default=1024 * 1024 * 1024, check_config_table=False)
+# Request bodies larger than this are spooled to a temporary file
+MAX_BODY_IN_MEMORY = 1024 * 1024
+# Bytes read at once from the spilled part of a response
+SPOOL_CHUNK_SIZE = 64 * 1024
+
+_END = object()
+_SPILLED = object()
+
+
+class _Cancelled(Exception):
+    """Raised in the thread of a request whose client disconnected."""
+
+
+def build_environ(scope: "MutableMapping[str, Any]", body: Any) -> "WSGIEnvironment":
+    """
+    Build the WSGI environment of an ASGI HTTP request.
+
+    :param scope: the ASGI connection scope.
+    :param body: the file containing the request body, at its beginning.
+    :returns: the WSGI environment.
+    """
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    body.seek(0, 2)
+    content_length = body.tell()
+    body.seek(0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1] or 80),
+        'SERVER_PROTOCOL': 'HTTP/%s' % scope.get('http_version', '1.1'),
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'CONTENT_LENGTH': str(content_length),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for raw_name, raw_value in scope.get('headers', []):
+        name = raw_name.decode('latin-1').upper().replace('-', '_')
+        value = raw_value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+            continue
+        if name == 'CONTENT_LENGTH':
+            continue
+        key = 'HTTP_' + name
+        environ[key] = environ[key] + ',' + value if key in environ else value
+    tls = scope.get('extensions', {}).get('tls') or {}
+    if tls.get('client_cert_name'):
+        environ['SSL_CLIENT_S_DN'] = tls['client_cert_name']
+    return environ
+
+
+class _Response:
+    """
+    A response produced by the WSGI application in a thread and sent by the event loop.
+    Up to buffer_size bytes waiting to be sent are kept in memory, the following ones are
+    spilled to a temporary file, and the thread waits while more than spool_size bytes
+    are waiting in the file.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, buffer_size: int, spool_size: int = 0):
+        self.loop = loop
+        self.buffer_size = buffer_size
+        self.spool_size = spool_size
+        self.status = '500 Internal Server Error'
+        self.headers = []
+        self._queue = asyncio.Queue()
+        self._condition = threading.Condition()
+        self._buffered = 0
+        self._cancelled = False
+        # Once spilled, the rest of the response goes through the file to keep its order
+        self._spool: 'Optional[SpooledTemporaryFile[bytes]]' = None
+        self._spool_written = 0
+        self._spool_read = 0
+
+    def _put(self, item: Any) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self._queue.put_nowait, item)
+        except RuntimeError:
+            # the event loop is closed, the server is stopping
+            self.cancel()
+
+    def _write(self, data: bytes) -> None:
+        with self._condition:
+            while True:
+                if self._cancelled:
+                    raise _Cancelled()
+                if self._spool is None:
+                    if self._buffered < self.buffer_size:
+                        self._buffered += len(data)
+                        item = data
+                        break
+                    if self.spool_size > 0:
+                        self._spool = SpooledTemporaryFile(max_size=MAX_BODY_IN_MEMORY)
+                        continue
+                elif self._spool_written - self._spool_read < self.spool_size:
+                    self._spool.seek(self._spool_written)
+                    self._spool.write(data)
+                    self._spool_written += len(data)
+                    item = _SPILLED
+                    break
+                self._condition.wait()
+        self._put(item)
+
+    def start_response(self, status: str, headers: "list[tuple[str, str]]", exc_info: Optional[Any] = None) -> "Callable[[bytes], None]":
+        self.status = status
+        self.headers = headers
+        return self._write
+
+    def cancel(self) -> None:
+        with self._condition:
+            self._cancelled = True
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        """
+        Stop producing the response and remove its spilled part.
+        """
+        with self._condition:
+            self._cancelled = True
+            self._condition.notify_all()
+            if self._spool is not None:
+                self._spool.close()
+
+    def run(self, application: "WSGIApplication", environ: "WSGIEnvironment") -> None:
+        """
+        Call the WSGI application and iterate over the response, in the thread of the request.
+        """
+        try:
+            result = application(environ, self.start_response)
+            try:
+                for chunk in result:
+                    if chunk:
+                        self._write(chunk)
+            finally:
+                if hasattr(result, 'close'):
+                    result.close()
+        except _Cancelled:
+            pass
+        except BaseException as error:
+            self._put(error)
+            return
+        self._put(_END)
+
+    async def send(self, send: "Send") -> None:
+        """
+        Send the response to the client as it is produced.
+        """
+        started = False
+        while True:
+            item = await self._queue.get()
+            if isinstance(item, BaseException):
+                if started:
+                    # the client sees a truncated response, as with a WSGI server
+                    raise item
+                LOG.error('Error while handling a request', exc_info=item)
+                self.status, self.headers, item = '500 Internal Server Error', [], _END
+            if not started:
+                await send({
+                    'type': 'http.response.start',
+                    'status': int(self.status.split(' ', 1)[0]),
+                    'headers': [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in self.headers],
+                })
+                started = True
+            if item is _END:
+                await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+                return
+            if item is _SPILLED:
+                await self._send_spilled(send)
+                continue
+            await send({'type': 'http.response.body', 'body': item, 'more_body': True})
+            with self._condition:
+                self._buffered -= len(item)
+                self._condition.notify_all()
+
+    async def _send_spilled(self, send: "Send") -> None:
+        """
+        Send the bytes spilled to the temporary file which were not sent yet.
+        """
+        while True:
+            with self._condition:
+                if self._spool_read >= self._spool_written or self._spool is None or self._spool.closed:
+                    return
+                self._spool.seek(self._spool_read)
+                chunk = self._spool.read(min(SPOOL_CHUNK_SIZE, self._spool_written - self._spool_read))
+                self._spool_read += len(chunk)
+                self._condition.notify_all()
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+
+
+class WSGIToASGI:
+    """
+    ASGI application running a WSGI application in a pool of threads.
+    """
+
+    def __init__(self, application: "WSGIApplication", threads: int = ASGI_THREADS, buffer_size: int = ASGI_BUFFER_SIZE,
+                 spool_size: int = ASGI_SPOOL_SIZE):
+        """
+        :param application: the WSGI application.
+        :param threads: the number of requests handled at the same time.
+        :param buffer_size: the bytes of a response buffered in memory for the client.
+        :param spool_size: the bytes of a response spilled to a temporary file before its thread waits; 0 to never spill.
+        """
+        self.application = application
+        self.buffer_size = buffer_size
+        self.spool_size = spool_size
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='rucio-asgi')
+
+    async def __call__(self, scope: "MutableMapping[str, Any]", receive: "Receive", send: "Send") -> None:
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            raise ValueError('Unsupported ASGI scope type %s' % scope['type'])
+
+        body = await self._read_body(receive)
+        if body is None:
+            return
+        response = _Response(asyncio.get_running_loop(), self.buffer_size, self.spool_size)
+        watcher = asyncio.ensure_future(self._watch_disconnect(receive, response))
+        self.executor.submit(response.run, self.application, build_environ(scope, body))
+        try:
+            await response.send(send)
+        finally:
+            watcher.cancel()
+            response.close()
+            body.close()
+
+    async def _read_body(self, receive: "Receive") -> "Optional[SpooledTemporaryFile[bytes]]":
+        """
+        Read the request body, or return None if the client disconnected.
+        """
+        body = SpooledTemporaryFile(max_size=MAX_BODY_IN_MEMORY)
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                body.close()
+                return None
+            body.write(message.get('body', b''))
+            if not message.get('more_body', False):
+                return body
+
+    async def _watch_disconnect(self, receive: "Receive", response: _Response) -> None:
+        """
+        Stop producing the response when the client disconnects.
+        """
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                response.cancel()
+                return
+
+    async def _lifespan(self, receive: "Receive", send: "Send") -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+application = WSGIToASGI(wsgi_application)
@@ -13,14 +13,13 @@
 # limitations under the License.
 
 from datetime import datetime
-from json import dumps
 from typing import TYPE_CHECKING, Any, Literal, Optional, Union
 
 from flask import Flask, Response, jsonify, redirect, request
 
 from rucio.common.constants import HTTPMethod
 from rucio.common.exception import AccessDenied, AccountNotFound, CounterNotFound, Duplicate, IdentityError, InvalidAccountType, InvalidObject, RSENotFound, RuleNotFound, ScopeNotFound
-from rucio.common.utils import APIEncoder, render_json
+from rucio.common.utils import json_dumps, render_json
 from rucio.gateway.account import add_account, add_account_attribute, del_account, del_account_attribute, get_account_info, get_usage_history, list_account_attributes, list_accounts, list_identities, update_account
 from rucio.gateway.account_limit import delete_global_account_limit, delete_local_account_limit, get_global_account_limit, get_global_account_usage, get_local_account_limit, get_local_account_usage, set_global_account_limit, set_local_account_limit
 from rucio.gateway.identity import add_account_identity, del_account_identity
@@ -1031,7 +1030,7 @@ class Rules(ErrorHandlingMethodView):
         try:
             def generate(vo: str) -> "Iterator[str]":
                 for rule in list_replication_rules(filters=filters, vo=vo):
-                    yield dumps(rule, cls=APIEncoder) + '\n'
+                    yield json_dumps(rule) + '\n'
 
             return try_stream(generate(vo=request.environ['vo']))
         except RuleNotFound as error:
@@ -1157,7 +1156,7 @@ class LocalUsage(ErrorHandlingMethodView):
         try:
             def generate(issuer: str, vo: str) -> "Iterator[str]":
                 for usage in get_local_account_usage(account=account, rse=rse, issuer=issuer, vo=vo):
-                    yield dumps(usage, cls=APIEncoder) + '\n'
+                    yield json_dumps(usage) + '\n'
 
             return try_stream(generate(issuer=request.environ['issuer'], vo=request.environ['vo']))
         except (AccountNotFound, RSENotFound) as error:
@@ -1221,7 +1220,7 @@ class GlobalUsage(ErrorHandlingMethodView):
         try:
             def generate(vo: str, issuer: str) -> "Iterator[str]":
                 for usage in get_global_account_usage(account=account, rse_expression=rse_expression, issuer=issuer, vo=vo):
-                    yield dumps(usage, cls=APIEncoder) + '\n'
+                    yield json_dumps(usage) + '\n'
 
             return try_stream(generate(vo=request.environ['vo'], issuer=request.environ['issuer']))
         except (AccountNotFound, RSENotFound) as error:
@@ -12,12 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from json import dumps
 from typing import TYPE_CHECKING
 
 from flask import Flask, Response, request
 
 from rucio.common.constants import DEFAULT_VO, HTTPMethod
+from rucio.common.utils import json_dumps
 from rucio.gateway.did import list_archive_content
 from rucio.web.rest.flaskapi.authenticated_bp import AuthenticatedBlueprint
 from rucio.web.rest.flaskapi.v1.common import ErrorHandlingMethodView, check_accept_header_wrapper_flask, generate_http_error_flask, parse_scope_name, response_headers, try_stream
@@ -79,7 +79,7 @@ class Archive(ErrorHandlingMethodView):
 
             def generate(vo: str) -> 'Iterator[str]':
                 for file in list_archive_content(scope=scope, name=name, vo=vo):
-                    yield dumps(file) + '\n'
+                    yield json_dumps(file) + '\n'
 
             return try_stream(generate(vo=request.environ.get('vo', DEFAULT_VO)))
         except ValueError as error:
@@ -12,35 +12,44 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import base64
+import binascii
 import itertools
 import json
 import logging
 import os
 import re
+import threading
+import zlib
 from configparser import NoOptionError, NoSectionError
 from functools import wraps
-from time import time
-from typing import TYPE_CHECKING, Any, Literal, Optional, TypeVar, Union, cast
+from time import monotonic, time
+from typing import TYPE_CHECKING, Any, AnyStr, Literal, Optional, TypeVar, Union, cast
 from urllib.parse import unquote_plus
 
 import flask
 from flask.views import MethodView
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from typing_extensions import ParamSpec
 from werkzeug.datastructures import Headers
 from werkzeug.exceptions import HTTPException
+from werkzeug.http import parse_accept_header
 from werkzeug.wrappers import Request, Response
 
 from rucio.common import config
 from rucio.common.constants import DEFAULT_VO, HTTPMethod
 from rucio.common.exception import CannotAuthenticate, DatabaseException, IdentityError, RucioException, UnsupportedRequestedContentType
+from rucio.common.extra import import_extras
 from rucio.common.schema import get_schema_value
-from rucio.common.utils import generate_uuid, render_json
+from rucio.common.utils import generate_uuid, json_dumps, render_json
+from rucio.core.monitor import MetricManager
 from rucio.core.vo import map_vo
 from rucio.gateway.authentication import validate_auth_token
 from rucio.gateway.identity import get_default_account, list_accounts_for_identity, verify_identity
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterable
+    from collections.abc import Callable, Iterable, Iterator, Mapping
 
     from _typeshed import SupportsIter
     from _typeshed.wsgi import StartResponse, WSGIApplication, WSGIEnvironment
@@ -52,8 +61,33 @@ ResponseTypeVar = TypeVar('ResponseTypeVar', bound=flask.wrappers.Response)
 
 RUCIO_HTTPD_ENCODED_SLASHES_NO_DECODE = os.environ.get('RUCIO_HTTPD_ENCODED_SLASHES_NO_DECODE',
                                                        'false').lower() == 'true'
+# Streamed responses are written in chunks of about this many characters, instead of one per item
+STREAM_CHUNK_SIZE = config.config_get_int('api', 'stream_chunk_size', raise_exception=False, default=65536, check_config_table=False)
+# Streamed responses are compressed when the client accepts one of STREAM_ENCODINGS
+STREAM_COMPRESSION = config.config_get_bool('api', 'stream_compression', raise_exception=False, default=True, check_config_table=False)
+STREAM_COMPRESSION_LEVEL = config.config_get_int('api', 'stream_compression_level', raise_exception=False, default=3, check_config_table=False)
+
+EXTRA_MODULES = import_extras(['zstandard'])
+
+if EXTRA_MODULES['zstandard']:
+    import zstandard  # pylint: disable=import-error
+
+# In order of preference
+STREAM_ENCODINGS = ['zstd', 'gzip'] if EXTRA_MODULES['zstandard'] else ['gzip']
+
+# Largest page of the listings paginated with the limit and cursor parameters
+MAX_PAGE_SIZE = config.config_get_int('api', 'max_page_size', raise_exception=False, default=10000, check_config_table=False)
+NEXT_CURSOR_HEADER = 'X-Rucio-Next-Cursor'
 _DEFAULT = object()
 
+# Requests taking longer than this many seconds are logged with their most expensive SQL statements
+SLOW_REQUEST_THRESHOLD = config.config_get_float('api', 'slow_request_threshold', raise_exception=False, default=10.0, check_config_table=False)
+SLOW_REQUEST_STATEMENTS = config.config_get_int('api', 'slow_request_statements', raise_exception=False, default=5, check_config_table=False)
+ENDPOINT_ENVIRON_KEY = 'rucio.endpoint'
+STREAM_ITEMS_ENVIRON_KEY = 'rucio.stream_items'
+
+METRICS = MetricManager(module=__name__)
+
 
 class CORSMiddleware:
     """
@@ -87,6 +121,144 @@ class CORSMiddleware:
         return self.app(environ, start_response)
 
 
+class _RequestStatistics:
+    """
+    The SQL statements executed by the thread of a request.
+    """
+
+    __slots__ = ('queries', 'query_time', 'statements')
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.query_time = 0.0
+        # statement -> [executions, seconds]
+        self.statements: dict[str, list] = {}
+
+    def add(self, statement: str, duration: float) -> None:
+        self.queries += 1
+        self.query_time += duration
+        totals = self.statements.get(statement)
+        if totals is None:
+            self.statements[statement] = [1, duration]
+        else:
+            totals[0] += 1
+            totals[1] += duration
+
+    def top_statements(self, count: int) -> list[tuple[str, int, float]]:
+        top = sorted(self.statements.items(), key=lambda item: item[1][1], reverse=True)[:count]
+        return [(statement, executions, seconds) for statement, (executions, seconds) in top]
+
+
+_REQUEST_STATISTICS = threading.local()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    # Kept on the execution context, which is discarded with a failed statement
+    if context is not None and getattr(_REQUEST_STATISTICS, 'current', None) is not None:
+        context._rucio_query_start = monotonic()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    statistics = getattr(_REQUEST_STATISTICS, 'current', None)
+    start = getattr(context, '_rucio_query_start', None)
+    if start is not None and statistics is not None:
+        statistics.add(statement, monotonic() - start)
+
+
+def record_endpoint() -> None:
+    """
+    Remember the endpoint of the request for the InstrumentationMiddleware,
+    to be registered with before_request on the application.
+    """
+    flask.request.environ[ENDPOINT_ENVIRON_KEY] = flask.request.endpoint
+
+
+class _InstrumentedResponse:
+    """
+    Response iterable counting the bytes sent, and recording the
+    metrics of the request when the server closes it.
+    """
+
+    def __init__(self, result: 'Iterable[bytes]', record: 'Callable[[int], None]') -> None:
+        self.result = result
+        self.record = record
+        self.sent = 0
+
+    def __iter__(self) -> 'Iterator[bytes]':
+        for chunk in self.result:
+            self.sent += len(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        try:
+            if hasattr(self.result, 'close'):
+                self.result.close()  # type: ignore
+        finally:
+            self.record(self.sent)
+
+
+class InstrumentationMiddleware:
+    """
+    Records the latency, the response size, the number of streamed items and the
+    SQL statements of each request, per endpoint, method and status. The requests
+    slower than SLOW_REQUEST_THRESHOLD are logged with their most expensive statements.
+
+    The endpoints are known if record_endpoint is registered with before_request.
+    The statements are attributed to the request handled by the thread executing them.
+    """
+
+    _listening = False
+
+    def __init__(self, app: 'WSGIApplication') -> None:
+        self.app = app
+        if not InstrumentationMiddleware._listening:
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+            InstrumentationMiddleware._listening = True
+
+    def __call__(self, environ: 'WSGIEnvironment', start_response: 'StartResponse') -> 'Iterable[bytes]':
+        start = monotonic()
+        statistics = _RequestStatistics()
+        _REQUEST_STATISTICS.current = statistics
+        status = ['500']
+
+        def _start_response(response_status, headers, exc_info=None):
+            status[0] = response_status.split(' ', 1)[0]
+            return start_response(response_status, headers, exc_info)
+
+        def _record(sent: int) -> None:
+            if getattr(_REQUEST_STATISTICS, 'current', None) is statistics:
+                _REQUEST_STATISTICS.current = None
+            self._record(environ, status[0], monotonic() - start, sent, statistics)
+
+        try:
+            result = self.app(environ, _start_response)
+        except BaseException:
+            _record(0)
+            raise
+        return _InstrumentedResponse(result, _record)
+
+    def _record(self, environ: 'WSGIEnvironment', status: str, duration: float, sent: int, statistics: _RequestStatistics) -> None:
+        labels = {'endpoint': environ.get(ENDPOINT_ENVIRON_KEY) or 'unknown',
+                  'method': environ.get('REQUEST_METHOD', ''),
+                  'status': status}
+        items = environ.get(STREAM_ITEMS_ENVIRON_KEY, 0)
+        try:
+            METRICS.timer('requests.{endpoint}.{method}.{status}.duration', documentation='Duration of the REST requests').labels(**labels).observe(duration)
+            METRICS.counter('requests.{endpoint}.{method}.{status}.bytes', documentation='Bytes sent in the REST responses').labels(**labels).inc(sent)
+            METRICS.counter('requests.{endpoint}.{method}.{status}.items', documentation='Items streamed in the REST responses').labels(**labels).inc(items)
+            METRICS.counter('requests.{endpoint}.{method}.{status}.queries', documentation='SQL statements executed by the REST requests').labels(**labels).inc(statistics.queries)
+            METRICS.timer('requests.{endpoint}.{method}.{status}.query_duration', documentation='Time spent in SQL statements by the REST requests').labels(**labels).observe(statistics.query_time)
+        except Exception:
+            logging.exception('Could not record the metrics of the request')
+        if duration >= SLOW_REQUEST_THRESHOLD:
+            top = ''.join('\n  %d x %.3fs: %s' % (executions, seconds, ' '.join(statement.split())[:1000])
+                          for statement, executions, seconds in statistics.top_statements(SLOW_REQUEST_STATEMENTS))
+            logging.warning('Slow request %s %s%s (%s, status %s, request %s): %.3fs, %d bytes, %d items, %d SQL statements in %.3fs%s',
+                            labels['method'], environ.get('SCRIPT_NAME', ''), environ.get('PATH_INFO', ''), labels['endpoint'], status,
+                            environ.get('request_id'), duration, sent, items, statistics.queries, statistics.query_time, top)
+
+
 class ErrorHandlingMethodView(MethodView):
     """
     Special MethodView that handles generic RucioExceptions and more generic
@@ -185,6 +357,15 @@ def response_headers(response: ResponseTypeVar) -> ResponseTypeVar:
     return response
 
 
+def conditional_response(response: ResponseTypeVar) -> ResponseTypeVar:
+    """
+    Tag the response with an ETag of its body, and turn it into a 304 Not Modified without body
+    if the request carries a matching If-None-Match header (e.g. a client revalidating its cache).
+    """
+    response.add_etag()
+    return response.make_conditional(flask.request)
+
+
 P = ParamSpec('P')
 R = TypeVar('R')
 
@@ -268,6 +449,70 @@ def parse_scope_name(scope_name: str, vo: Optional[str]) -> tuple[str, ...]:
     return scope, name
 
 
+def _join_chunks(items: "Iterable[AnyStr]", size: int) -> "Iterator[AnyStr]":
+    """
+    Join the items of a stream into chunks of at least the given size,
+    so that the server writes them with fewer calls.
+
+    :param items: the strings or bytes to stream.
+    :param size: the minimal size of the chunks, except the last one.
+    :returns: the chunks.
+    """
+    buffer = []
+    buffered = 0
+    try:
+        for item in items:
+            buffer.append(item)
+            buffered += len(item)
+            if buffered >= size:
+                yield item[:0].join(buffer)
+                buffer = []
+                buffered = 0
+    except Exception:
+        # send what was produced before the error, as without the buffering
+        if buffer:
+            yield buffer[0][:0].join(buffer)
+        raise
+    if buffer:
+        yield buffer[0][:0].join(buffer)
+
+
+def _count_items(items: "Iterable[AnyStr]", environ: "WSGIEnvironment") -> "Iterator[AnyStr]":
+    """
+    Count the items of a stream in the environment of the request, for the InstrumentationMiddleware.
+    """
+    count = 0
+    try:
+        for item in items:
+            count += 1
+            yield item
+    finally:
+        environ[STREAM_ITEMS_ENVIRON_KEY] = count
+
+
+def _compress_chunks(chunks: "Iterable[Union[str, bytes]]", encoding: str) -> "Iterator[bytes]":
+    """
+    Compress a stream, flushing the compressor after each chunk so that
+    the client can decode the items as soon as they are received.
+
+    :param chunks: the strings or bytes to stream.
+    :param encoding: the content coding, one of STREAM_ENCODINGS.
+    :returns: the compressed chunks.
+    """
+    if encoding == 'zstd':
+        compressor = zstandard.ZstdCompressor(level=STREAM_COMPRESSION_LEVEL).compressobj()
+        flush_mode = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+    else:
+        # wbits 16 + 15: gzip container with the largest window
+        compressor = zlib.compressobj(STREAM_COMPRESSION_LEVEL, zlib.DEFLATED, 31)
+        flush_mode = zlib.Z_SYNC_FLUSH
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        yield compressor.compress(chunk) + compressor.flush(flush_mode)
+    yield compressor.flush()
+
+
 def try_stream(
         generator: 'SupportsIter',
         content_type: Optional[str] = None
@@ -275,7 +520,9 @@ def try_stream(
     """
     Peeks at the first element of the passed generator and raises
     an error, if yielding raises. Otherwise returns
-    a flask.Response object.
+    a flask.Response object. The elements are sent in chunks of
+    about STREAM_CHUNK_SIZE characters, compressed if the client
+    accepts it.
 
     :param generator: a generator function or an iterator.
     :param content_type: the response's Content-Type.
@@ -288,9 +535,88 @@ def try_stream(
     it = iter(generator)
     try:
         peek = next(it)
-        return flask.Response(flask.stream_with_context(itertools.chain((peek,), it)), content_type=content_type)
     except StopIteration:
         return flask.Response('', content_type=content_type)
+    it = _count_items(itertools.chain((peek,), it), flask.request.environ)
+    if STREAM_CHUNK_SIZE > 1:
+        it = _join_chunks(it, STREAM_CHUNK_SIZE)
+    headers = {}
+    if STREAM_COMPRESSION:
+        encoding = parse_accept_header(flask.request.headers.get('Accept-Encoding')).best_match(STREAM_ENCODINGS)
+        headers['Vary'] = 'Accept-Encoding'
+        if encoding:
+            it = _compress_chunks(it, encoding)
+            headers['Content-Encoding'] = encoding
+    return flask.Response(flask.stream_with_context(it), content_type=content_type, headers=headers)
+
+
+def page_parameters(
+        parameters: "Mapping[str, Any]",
+        key_length: int,
+        validate: "Optional[Callable[[tuple[str, ...]], Any]]" = None
+) -> tuple[Optional[int], Optional[tuple[str, ...]]]:
+    """
+    Get the keyset pagination parameters of a listing: the size of the page in
+    'limit', and the cursor returned with the previous page in 'cursor'.
+
+    :param parameters: the query parameters of the request.
+    :param key_length: the number of values identifying an item of the listing.
+    :param validate: optional function raising ValueError if the values of the cursor are invalid,
+                     e.g. not in the format of the columns they are compared to.
+    :returns: the size of the page, or None to list everything, and the key
+              after which the page starts, or None for the first page.
+    :raises ValueError: if the parameters are invalid.
+    """
+    limit = parameters.get('limit')
+    cursor = parameters.get('cursor')
+    if limit is None:
+        if cursor is not None:
+            raise ValueError('The cursor parameter requires the limit parameter')
+        return None, None
+    try:
+        limit = int(limit)
+    except ValueError:
+        raise ValueError('The limit parameter must be an integer')
+    if not 0 < limit <= MAX_PAGE_SIZE:
+        raise ValueError('The limit parameter must be between 1 and %d' % MAX_PAGE_SIZE)
+    if cursor is None:
+        return limit, None
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, binascii.Error):
+        raise ValueError('Invalid cursor')
+    if not isinstance(key, list) or len(key) != key_length or not all(isinstance(value, str) for value in key):
+        raise ValueError('Invalid cursor')
+    key = tuple(key)
+    if validate is not None:
+        try:
+            validate(key)
+        except ValueError:
+            raise ValueError('Invalid cursor')
+    return limit, key
+
+
+def stream_page(
+        items: "Iterable[dict[str, Any]]",
+        limit: Optional[int],
+        key: "Callable[[dict[str, Any]], list[str]]"
+) -> flask.Response:
+    """
+    Stream a listing as JSON lines. With a limit, the listing is a page, and the cursor to
+    request the next one is returned in the X-Rucio-Next-Cursor header, if the page is full.
+
+    :param items: the listed items, at most limit of them.
+    :param limit: the size of the page, or None if the listing is not paginated.
+    :param key: function returning the values identifying an item in the order of the listing.
+    :returns: a response object streaming the items.
+    """
+    if limit is None:
+        return try_stream(json_dumps(item) + '\n' for item in items)
+    page = list(items)
+    response = try_stream([json_dumps(item) + '\n' for item in page])
+    if len(page) >= limit:
+        response.headers[NEXT_CURSOR_HEADER] = base64.urlsafe_b64encode(json.dumps(key(page[-1])).encode()).decode()
+    return response
 
 
 def error_headers(exc_cls: str, exc_msg: str) -> dict[str, str]:
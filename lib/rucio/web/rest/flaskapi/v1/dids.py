@@ -13,7 +13,6 @@
 # limitations under the License.
 
 import ast
-from json import dumps
 from typing import TYPE_CHECKING, Any, Optional, cast
 
 from flask import Flask, Response, request
@@ -40,7 +39,7 @@ from rucio.common.exception import (
     UnsupportedOperation,
     UnsupportedStatus,
 )
-from rucio.common.utils import APIEncoder, clone_function, parse_response, render_json
+from rucio.common.utils import clone_function, json_dumps, parse_response, render_json
 from rucio.db.sqla.constants import DIDType
 from rucio.gateway.did import (
     add_did,
@@ -73,7 +72,23 @@ from rucio.gateway.did import (
 )
 from rucio.gateway.rule import list_associated_replication_rules_for_file, list_replication_rules
 from rucio.web.rest.flaskapi.authenticated_bp import AuthenticatedBlueprint
-from rucio.web.rest.flaskapi.v1.common import ErrorHandlingMethodView, check_accept_header_wrapper_flask, generate_http_error_flask, json_list, json_parameters, json_parse, param_get, param_get_bool, parse_scope_name, response_headers, try_stream
+from rucio.web.rest.flaskapi.v1.common import (
+    MAX_PAGE_SIZE,
+    ErrorHandlingMethodView,
+    check_accept_header_wrapper_flask,
+    conditional_response,
+    generate_http_error_flask,
+    json_list,
+    json_parameters,
+    json_parse,
+    page_parameters,
+    param_get,
+    param_get_bool,
+    parse_scope_name,
+    response_headers,
+    stream_page,
+    try_stream,
+)
 
 if TYPE_CHECKING:
 
@@ -187,9 +202,15 @@ class Search(ErrorHandlingMethodView):
             default: 'collection'
         - name: limit
           in: query
-          description: "The maximum number of DIDs returned."
+          description: "The maximum number of DIDs returned. Up to the maximum page size, and if not recursive, the DIDs are ordered by name."
           schema:
             type: integer
+        - name: cursor
+          in: query
+          description: "The X-Rucio-Next-Cursor header of the previous page, to list the next one."
+          schema:
+            type: string
+          required: false
         - name: long
           in: query
           description: "Provides a longer output, otherwise just prints names."
@@ -244,6 +265,11 @@ class Search(ErrorHandlingMethodView):
         responses:
           200:
             description: "OK"
+            headers:
+              X-Rucio-Next-Cursor:
+                description: "The cursor of the next page, if the page is full."
+                schema:
+                  type: string
             content:
               application/x-json-stream:
                 schema:
@@ -268,7 +294,7 @@ class Search(ErrorHandlingMethodView):
             # backwards compatibility for created*, length* and name filters passed through as request args
             filters = {}
             for arg, value in request.args.copy().items():
-                if arg not in ['type', 'limit', 'long', 'recursive']:
+                if arg not in ['type', 'limit', 'long', 'recursive', 'cursor']:
                     filters[arg] = value
             filters = [filters]
 
@@ -276,18 +302,26 @@ class Search(ErrorHandlingMethodView):
         limit = request.args.get('limit', type=int, default=None)
         long = param_get_bool(request.args, 'long', default=False)
         recursive = param_get_bool(request.args, 'recursive', default=False)
-        try:
-            def generate(vo):
-                for did in list_dids(scope=scope,
-                                     filters=filters,
-                                     did_type=did_type,
-                                     limit=limit,
-                                     long=long,
-                                     recursive=recursive,
-                                     vo=vo):
-                    yield dumps(did) + '\n'
 
-            return try_stream(generate(vo=request.environ['vo']))
+        def validate_cursor(key):
+            if key[0] != scope:
+                raise ValueError('The cursor is not in the scope of the listing')
+
+        # The larger limits and the recursive listings are not paginated, as before
+        ordered = limit is not None and 0 < limit <= MAX_PAGE_SIZE and not recursive
+        after = None
+        try:
+            if ordered:
+                limit, after = page_parameters(request.args, key_length=2, validate=validate_cursor)
+            elif 'cursor' in request.args:
+                raise ValueError('The cursor parameter requires a limit of at most %d and no recursion' % MAX_PAGE_SIZE)
+        except ValueError as error:
+            return generate_http_error_flask(400, error)
+        try:
+            dids = list_dids(scope=scope, filters=filters, did_type=did_type, limit=limit, long=long,
+                             recursive=recursive, vo=request.environ['vo'], ordered=ordered, after=after)
+            return stream_page(dids, limit if ordered else None,
+                               key=lambda did: [scope, did['name'] if isinstance(did, dict) else did])
         except DIDFilterSyntaxError as error:
             return generate_http_error_flask(400, error)
         except UnsupportedOperation as error:
@@ -605,7 +639,7 @@ class DIDs(ErrorHandlingMethodView):
             elif 'dynamic' in request.args:
                 dynamic_depth = DIDType.FILE
             did = get_did(scope=scope, name=name, dynamic_depth=dynamic_depth, vo=request.environ['vo'])
-            return Response(render_json(**did), content_type='application/json')
+            return conditional_response(Response(render_json(**did), content_type='application/json'))
         except ValueError as error:
             return generate_http_error_flask(400, error)
         except (ScopeNotFound, DataIdentifierNotFound) as error:
@@ -793,9 +827,26 @@ class Attachment(ErrorHandlingMethodView):
           schema:
             type: string
           style: simple
+        - name: limit
+          in: query
+          description: "List at most this many contents, ordered by scope and name."
+          schema:
+            type: integer
+          required: false
+        - name: cursor
+          in: query
+          description: "The X-Rucio-Next-Cursor header of the previous page, to list the next one."
+          schema:
+            type: string
+          required: false
         responses:
           200:
             description: "DID found"
+            headers:
+              X-Rucio-Next-Cursor:
+                description: "The cursor of the next page, if the page is full."
+                schema:
+                  type: string
             content:
               application/x-json-stream:
                 schema:
@@ -838,12 +889,9 @@ class Attachment(ErrorHandlingMethodView):
         """
         try:
             scope, name = parse_scope_name(scope_name, request.environ['vo'])
-
-            def generate(vo):
-                for did in list_content(scope=scope, name=name, vo=vo):
-                    yield render_json(**did) + '\n'
-
-            return try_stream(generate(vo=request.environ['vo']))
+            limit, after = page_parameters(request.args, key_length=2)
+            dids = list_content(scope=scope, name=name, vo=request.environ['vo'], limit=limit, after=after)
+            return stream_page(dids, limit, key=lambda did: [did['scope'], did['name']])
         except ValueError as error:
             return generate_http_error_flask(400, error)
         except DataIdentifierNotFound as error:
@@ -1165,7 +1213,7 @@ class Files(ErrorHandlingMethodView):
 
             def generate(vo):
                 for file in list_files(scope=scope, name=name, long=long, vo=vo):
-                    yield dumps(file) + '\n'
+                    yield json_dumps(file) + '\n'
 
             return try_stream(generate(vo=request.environ['vo']))
         except ValueError as error:
@@ -1966,7 +2014,7 @@ class Rules(ErrorHandlingMethodView):
             def generate(vo):
                 get_did(scope=scope, name=name, vo=vo)
                 for rule in list_replication_rules({'scope': scope, 'name': name}, vo=vo):
-                    yield dumps(rule, cls=APIEncoder) + '\n'
+                    yield json_dumps(rule) + '\n'
 
             return try_stream(generate(vo=request.environ['vo']))
         except ValueError as error:
@@ -2039,7 +2087,7 @@ class AssociatedRules(ErrorHandlingMethodView):
 
             def generate(vo):
                 for rule in list_associated_replication_rules_for_file(scope=scope, name=name, vo=vo):
-                    yield dumps(rule, cls=APIEncoder) + '\n'
+                    yield json_dumps(rule) + '\n'
 
             return try_stream(generate(vo=request.environ['vo']))
         except ValueError as error:
@@ -2095,7 +2143,7 @@ class GUIDLookup(ErrorHandlingMethodView):
         try:
             def generate(vo):
                 for dataset in get_dataset_by_guid(guid, vo=vo):
-                    yield dumps(dataset, cls=APIEncoder) + '\n'
+                    yield json_dumps(dataset) + '\n'
 
             return try_stream(generate(vo=request.environ['vo']))
         except DataIdentifierNotFound as error:
@@ -2299,7 +2347,7 @@ class NewDIDs(ErrorHandlingMethodView):
         """
         def generate(_type, vo):
             for did in list_new_dids(did_type=_type, vo=vo):
-                yield dumps(did, cls=APIEncoder) + '\n'
+                yield json_dumps(did) + '\n'
 
         type_param = request.args.get('type', default=None)
 
@@ -12,13 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
-
 from flask import Flask, Response, request
 
 from rucio.common.constants import HTTPMethod
 from rucio.common.exception import AccessDenied, KeyNotFound, UnsupportedKeyType, UnsupportedValueType
-from rucio.common.utils import APIEncoder
+from rucio.common.utils import json_dumps
 from rucio.gateway.heartbeat import create_heartbeat, list_heartbeats
 from rucio.web.rest.flaskapi.authenticated_bp import AuthenticatedBlueprint
 from rucio.web.rest.flaskapi.v1.common import ErrorHandlingMethodView, check_accept_header_wrapper_flask, generate_http_error_flask, json_parameters, param_get, response_headers
@@ -50,7 +48,7 @@ class Heartbeat(ErrorHandlingMethodView):
           406:
             description: "Not acceptable"
         """
-        return Response(json.dumps(list_heartbeats(issuer=request.environ['issuer'], vo=request.environ['vo']), cls=APIEncoder), content_type='application/json')
+        return Response(json_dumps(list_heartbeats(issuer=request.environ['issuer'], vo=request.environ['vo'])), content_type='application/json')
 
     def post(self):
         """
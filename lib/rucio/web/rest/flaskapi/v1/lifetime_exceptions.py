@@ -18,7 +18,7 @@ from flask import Flask, Response, request
 
 from rucio.common.constants import HTTPMethod
 from rucio.common.exception import AccessDenied, InvalidObject, LifetimeExceptionDuplicate, LifetimeExceptionNotFound, UnsupportedOperation
-from rucio.common.utils import APIEncoder
+from rucio.common.utils import json_dumps
 from rucio.gateway.lifetime_exception import add_exception, list_exceptions, update_exception
 from rucio.web.rest.flaskapi.authenticated_bp import AuthenticatedBlueprint
 from rucio.web.rest.flaskapi.v1.common import ErrorHandlingMethodView, check_accept_header_wrapper_flask, generate_http_error_flask, json_parameters, param_get, response_headers, try_stream
@@ -89,7 +89,7 @@ class LifetimeException(ErrorHandlingMethodView):
         try:
             def generate(vo):
                 for exception in list_exceptions(vo=vo):
-                    yield dumps(exception, cls=APIEncoder) + '\n'
+                    yield json_dumps(exception) + '\n'
 
             return try_stream(generate(vo=request.environ['vo']))
         except LifetimeExceptionNotFound as error:
@@ -234,7 +234,7 @@ class LifetimeExceptionId(ErrorHandlingMethodView):
         try:
             def generate(vo):
                 for exception in list_exceptions(exception_id, vo=vo):
-                    yield dumps(exception, cls=APIEncoder) + '\n'
+                    yield json_dumps(exception) + '\n'
 
             return try_stream(generate(vo=request.environ['vo']))
         except LifetimeExceptionNotFound as error:
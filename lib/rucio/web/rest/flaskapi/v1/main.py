@@ -19,10 +19,10 @@ from typing import TYPE_CHECKING
 
 from flask import Flask
 
-from rucio.common.config import config_get_list
+from rucio.common.config import config_get_bool, config_get_list
 from rucio.common.exception import ConfigurationError
 from rucio.common.logging import setup_logging
-from rucio.web.rest.flaskapi.v1.common import CORSMiddleware
+from rucio.web.rest.flaskapi.v1.common import CORSMiddleware, InstrumentationMiddleware, record_endpoint
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
@@ -96,6 +96,9 @@ if not endpoints:
 
 application = Flask(__name__)
 application.wsgi_app = CORSMiddleware(application.wsgi_app)
+if config_get_bool('api', 'instrumentation', raise_exception=False, default=True):
+    application.wsgi_app = InstrumentationMiddleware(application.wsgi_app)
+    application.before_request(record_endpoint)
 apply_endpoints(application, endpoints)
 setup_logging(application)
 
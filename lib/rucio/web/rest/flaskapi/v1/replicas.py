@@ -38,7 +38,7 @@ from rucio.common.exception import (
     ScopeNotFound,
     SortingAlgorithmNotSupported,
 )
-from rucio.common.utils import APIEncoder, parse_response, render_json
+from rucio.common.utils import build_replicas_plan, json_dumps, parse_response, render_json
 from rucio.core.replica_sorter import sort_replicas
 from rucio.db.sqla.constants import BadFilesStatus
 from rucio.gateway.quarantined_replica import quarantine_file_replicas
@@ -85,6 +85,102 @@ def _sorted_with_priorities(replicas, sorted_pfns, limit=None):
             yield pfn, replica
 
 
+def _list_sorted_replicas(metalink=False):
+    """
+    List the replicas requested in the body of the current request, with their PFNs
+    sorted by domain and by the requested selection.
+
+    :param metalink: If True, all the supported schemes are resolved when none are requested.
+    :returns: A generator of the replica dictionaries.
+    """
+    client_ip = request.headers.get('X-Forwarded-For', default=request.remote_addr)
+
+    parameters = json_parameters(parse_response)
+
+    client_location: 'IPDict' = {'ip': client_ip,
+                                 'fqdn': None,
+                                 'site': None}
+    client_location.update(param_get(parameters, 'client_location', default={}))
+
+    # making sure IP address is not overwritten
+    client_location['ip'] = client_ip
+
+    dids = param_get(parameters, 'dids', default=[])
+    schemes = param_get(parameters, 'schemes', default=None)
+    select = param_get(parameters, 'sort', default=None)
+    unavailable = param_get_bool(parameters, 'unavailable', default=False)
+    ignore_availability = param_get_bool(parameters, 'ignore_availability', default='unavailable' in parameters)
+    rse_expression = param_get(parameters, 'rse_expression', default=None)
+    all_states = param_get_bool(parameters, 'all_states', default=False)
+    domain = param_get(parameters, 'domain', default=None)
+    if 'signature_lifetime' in parameters:
+        signature_lifetime = param_get(parameters, 'signature_lifetime')
+    else:
+        # hardcoded default of 10 minutes if config is not parseable
+        signature_lifetime = config_get_int('credentials', 'signature_lifetime', raise_exception=False, default=600)
+    resolve_archives = param_get_bool(parameters, 'resolve_archives', default=True)
+    resolve_parents = param_get_bool(parameters, 'resolve_parents', default=False)
+    updated_after = param_get(parameters, 'updated_after', default=None)
+    if updated_after is not None:
+        if isinstance(updated_after, (int, float)):
+            # convert from epoch time stamp to datetime object
+            updated_after = datetime.utcfromtimestamp(updated_after)
+        else:
+            # attempt UTC format '%Y-%m-%dT%H:%M:%S' conversion
+            updated_after = datetime.strptime(updated_after, '%Y-%m-%dT%H:%M:%S')
+    nrandom = param_get(parameters, 'nrandom', default=None)
+    if nrandom:
+        nrandom = int(nrandom)
+
+    limit = request.args.get('limit', default=None)
+    select = request.args.get('select', default=select)
+    select = request.args.get('sort', default=select)
+
+    # Resolve all reasonable protocols when doing metalink for maximum access possibilities
+    if metalink and schemes is None:
+        schemes = SUPPORTED_PROTOCOLS
+
+    def _list_and_sort_replicas(request_id, issuer, vo):
+        # we need to call list_replicas before starting to reply
+        # otherwise the exceptions won't be propagated correctly
+        for rfile in list_replicas(dids=dids, schemes=schemes,
+                                   unavailable=unavailable,
+                                   request_id=request_id,
+                                   ignore_availability=ignore_availability,
+                                   all_states=all_states,
+                                   rse_expression=rse_expression,
+                                   client_location=client_location,
+                                   domain=domain,
+                                   signature_lifetime=signature_lifetime,
+                                   resolve_archives=resolve_archives,
+                                   resolve_parents=resolve_parents,
+                                   nrandom=nrandom,
+                                   updated_after=updated_after,
+                                   issuer=issuer,
+                                   vo=vo):
+
+            # Sort rfile['pfns'] and limit its size according to "limit" parameter
+            lanreplicas = {}
+            wanreplicas = {}
+            for pfn, replica in rfile['pfns'].items():
+                replica_tuple = (replica['domain'], replica['priority'], replica['rse'], replica['client_extract'])
+                if replica_tuple[0] == 'lan':
+                    lanreplicas[pfn] = replica_tuple
+                else:
+                    wanreplicas[pfn] = replica_tuple
+
+            rfile['pfns'] = dict(_sorted_with_priorities(replicas=rfile['pfns'],
+                                                         # Lan replicas sorted by priority; followed by wan replicas sorted by selection criteria
+                                                         sorted_pfns=chain(sorted(lanreplicas.keys(), key=lambda pfn: lanreplicas[pfn][1]),
+                                                                           sort_replicas(wanreplicas, client_location, selection=select)),
+                                                         limit=limit))
+            yield rfile
+
+    return _list_and_sort_replicas(request_id=request.environ.get('request_id'),
+                                   issuer=request.environ['issuer'],
+                                   vo=request.environ['vo'])
+
+
 def _generate_one_metalink_file(rfile, policy_schema, detailed_url=True):
     yield ' <file name="' + rfile['name'] + '">\n'
 
@@ -144,7 +240,7 @@ def _generate_metalink_response(rfiles, policy_schema, detailed_url=True):
 
 def _generate_json_response(rfiles):
     for rfile in rfiles:
-        yield dumps(rfile) + '\n'
+        yield json_dumps(rfile) + '\n'
 
 
 class Replicas(ErrorHandlingMethodView):
@@ -660,95 +756,10 @@ class ListReplicas(ErrorHandlingMethodView):
         content_type = request.accept_mimetypes.best_match(['application/x-json-stream', 'application/metalink4+xml'], 'application/x-json-stream')
         metalink = (content_type == 'application/metalink4+xml')
 
-        client_ip = request.headers.get('X-Forwarded-For', default=request.remote_addr)
-
-        parameters = json_parameters(parse_response)
-
-        client_location: 'IPDict' = {'ip': client_ip,
-                                     'fqdn': None,
-                                     'site': None}
-        client_location.update(param_get(parameters, 'client_location', default={}))
-
-        # making sure IP address is not overwritten
-        client_location['ip'] = client_ip
-
-        dids = param_get(parameters, 'dids', default=[])
-        schemes = param_get(parameters, 'schemes', default=None)
-        select = param_get(parameters, 'sort', default=None)
-        unavailable = param_get_bool(parameters, 'unavailable', default=False)
-        ignore_availability = param_get_bool(parameters, 'ignore_availability', default='unavailable' in parameters)
-        rse_expression = param_get(parameters, 'rse_expression', default=None)
-        all_states = param_get_bool(parameters, 'all_states', default=False)
-        domain = param_get(parameters, 'domain', default=None)
-        if 'signature_lifetime' in parameters:
-            signature_lifetime = param_get(parameters, 'signature_lifetime')
-        else:
-            # hardcoded default of 10 minutes if config is not parseable
-            signature_lifetime = config_get_int('credentials', 'signature_lifetime', raise_exception=False, default=600)
-        resolve_archives = param_get_bool(parameters, 'resolve_archives', default=True)
-        resolve_parents = param_get_bool(parameters, 'resolve_parents', default=False)
-        updated_after = param_get(parameters, 'updated_after', default=None)
-        if updated_after is not None:
-            if isinstance(updated_after, (int, float)):
-                # convert from epoch time stamp to datetime object
-                updated_after = datetime.utcfromtimestamp(updated_after)
-            else:
-                # attempt UTC format '%Y-%m-%dT%H:%M:%S' conversion
-                updated_after = datetime.strptime(updated_after, '%Y-%m-%dT%H:%M:%S')
-        nrandom = param_get(parameters, 'nrandom', default=None)
-        if nrandom:
-            nrandom = int(nrandom)
-
-        limit = request.args.get('limit', default=None)
-        select = request.args.get('select', default=select)
-        select = request.args.get('sort', default=select)
-
-        # Resolve all reasonable protocols when doing metalink for maximum access possibilities
-        if metalink and schemes is None:
-            schemes = SUPPORTED_PROTOCOLS
-
         content_type = 'application/metalink4+xml' if metalink else 'application/x-json-stream'
 
         try:
-            def _list_and_sort_replicas(request_id, issuer, vo):
-                # we need to call list_replicas before starting to reply
-                # otherwise the exceptions won't be propagated correctly
-                for rfile in list_replicas(dids=dids, schemes=schemes,
-                                           unavailable=unavailable,
-                                           request_id=request_id,
-                                           ignore_availability=ignore_availability,
-                                           all_states=all_states,
-                                           rse_expression=rse_expression,
-                                           client_location=client_location,
-                                           domain=domain,
-                                           signature_lifetime=signature_lifetime,
-                                           resolve_archives=resolve_archives,
-                                           resolve_parents=resolve_parents,
-                                           nrandom=nrandom,
-                                           updated_after=updated_after,
-                                           issuer=issuer,
-                                           vo=vo):
-
-                    # Sort rfile['pfns'] and limit its size according to "limit" parameter
-                    lanreplicas = {}
-                    wanreplicas = {}
-                    for pfn, replica in rfile['pfns'].items():
-                        replica_tuple = (replica['domain'], replica['priority'], replica['rse'], replica['client_extract'])
-                        if replica_tuple[0] == 'lan':
-                            lanreplicas[pfn] = replica_tuple
-                        else:
-                            wanreplicas[pfn] = replica_tuple
-
-                    rfile['pfns'] = dict(_sorted_with_priorities(replicas=rfile['pfns'],
-                                                                 # Lan replicas sorted by priority; followed by wan replicas sorted by selection criteria
-                                                                 sorted_pfns=chain(sorted(lanreplicas.keys(), key=lambda pfn: lanreplicas[pfn][1]),
-                                                                                   sort_replicas(wanreplicas, client_location, selection=select)),
-                                                                 limit=limit))
-                    yield rfile
-
-            rfiles = _list_and_sort_replicas(request_id=request.environ.get('request_id'),
-                                             issuer=request.environ['issuer'],
-                                             vo=request.environ['vo'])
+            rfiles = _list_sorted_replicas(metalink=metalink)
             if metalink:
                 policy_schema = config_get('policy', 'schema', raise_exception=False, default='generic')
                 response_generator = _generate_metalink_response(rfiles, policy_schema)
@@ -759,6 +770,87 @@ class ListReplicas(ErrorHandlingMethodView):
             return generate_http_error_flask(400, error)
 
 
+class ListReplicasPlan(ErrorHandlingMethodView):
+
+    @check_accept_header_wrapper_flask(['application/json'])
+    def post(self):
+        """
+        ---
+        summary: List Replicas Plan
+        description: "List the replicas of many DIDs in one columnar document, for download planning. Takes the same parameters as List Replicas; all the supported schemes are resolved when none are given."
+        tags:
+          - Replicas
+        parameters:
+        - name: X-Forwarded-For
+          in: header
+          description: "The client ip address."
+          schema:
+            type: string
+        - name: limit
+          in: query
+          description: "The maximum number pfns per replica to return."
+          schema:
+            type: integer
+        - name: sort
+          in: query
+          description: "Requested sorting of the result, e.g., 'geoip', 'random'."
+          schema:
+            type: string
+        requestBody:
+          content:
+            application/json:
+              schema:
+                type: object
+                properties:
+                  dids:
+                    description: "List of DIDs."
+                    type: array
+                    items:
+                      type: object
+                      properties:
+                        scope:
+                          description: "The scope of the DID."
+                          type: string
+                        name:
+                          description: "The name of the DID."
+                          type: string
+        responses:
+          200:
+            description: "OK"
+            content:
+              application/json:
+                schema:
+                  type: object
+                  properties:
+                    rses:
+                      description: "The RSE names, referenced by index."
+                      type: array
+                    scopes:
+                      description: "The scopes, referenced by index."
+                      type: array
+                    parents:
+                      description: "The parent DIDs, referenced by index."
+                      type: array
+                    files:
+                      description: "The columns of the files: scope, name, bytes, adler32, md5, parents and nsources."
+                      type: object
+                    sources:
+                      description: "The columns of the sources of all the files, in priority order: pfn, rse, domain and client_extract."
+                      type: object
+          400:
+            description: "Cannot decode json parameter list."
+          401:
+            description: "Invalid Auth Token"
+          406:
+            description: "Not acceptable"
+        """
+        try:
+            plan = build_replicas_plan(_list_sorted_replicas(metalink=True))
+        except (InvalidObject, DataIdentifierNotFound, SortingAlgorithmNotSupported) as error:
+            return generate_http_error_flask(400, error)
+        return Response(render_json(**plan), 200, content_type='application/json')
+
+
 class ReplicasDIDs(ErrorHandlingMethodView):
 
     @check_accept_header_wrapper_flask(['application/x-json-stream'])
@@ -821,7 +913,7 @@ class ReplicasDIDs(ErrorHandlingMethodView):
         try:
             def generate(vo):
                 for pfn in get_did_from_pfns(pfns, rse, vo=vo):
-                    yield dumps(pfn) + '\n'
+                    yield json_dumps(pfn) + '\n'
 
             return try_stream(generate(vo=request.environ['vo']))
         except AccessDenied as error:
@@ -1208,7 +1300,7 @@ class BadReplicasStates(ErrorHandlingMethodView):
             for row in list_bad_replicas_status(state=state, rse=rse, younger_than=younger_than,
                                                 older_than=older_than, limit=limit, list_pfns=list_pfns,
                                                 vo=vo):
-                yield dumps(row, cls=APIEncoder) + '\n'
+                yield json_dumps(row) + '\n'
 
         return try_stream(generate(vo=request.environ['vo']))
 
@@ -1287,7 +1379,7 @@ class BadReplicasSummary(ErrorHandlingMethodView):
         def generate(vo):
             for row in get_bad_replicas_summary(rse_expression=rse_expression, from_date=from_date,
                                                 to_date=to_date, vo=vo):
-                yield dumps(row, cls=APIEncoder) + '\n'
+                yield json_dumps(row) + '\n'
 
         return try_stream(generate(vo=request.environ['vo']))
 
@@ -1376,7 +1468,7 @@ class DatasetReplicas(ErrorHandlingMethodView):
 
             def generate(_deep, vo):
                 for row in list_dataset_replicas(scope=scope, name=name, deep=_deep, vo=vo):
-                    yield dumps(row, cls=APIEncoder) + '\n'
+                    yield json_dumps(row) + '\n'
 
             deep = param_get_bool(request.args, 'deep', default=False)
 
@@ -1483,7 +1575,7 @@ class DatasetReplicasBulk(ErrorHandlingMethodView):
         try:
             def generate(vo):
                 for row in list_dataset_replicas_bulk(dids=dids, vo=vo):
-                    yield dumps(row, cls=APIEncoder) + '\n'
+                    yield json_dumps(row) + '\n'
 
             return try_stream(generate(vo=request.environ['vo']))
         except InvalidObject as error:
@@ -1526,7 +1618,7 @@ class DatasetReplicasVP(ErrorHandlingMethodView):
 
             def generate(_deep, vo):
                 for row in list_dataset_replicas_vp(scope=scope, name=name, deep=_deep, vo=vo):
-                    yield dumps(row, cls=APIEncoder) + '\n'
+                    yield json_dumps(row) + '\n'
 
             deep = param_get_bool(request.args, 'deep', default=False)
 
@@ -1610,7 +1702,7 @@ class ReplicasRSE(ErrorHandlingMethodView):
 
         def generate(vo):
             for row in list_datasets_per_rse(rse=rse, vo=vo):
-                yield dumps(row, cls=APIEncoder) + '\n'
+                yield json_dumps(row) + '\n'
 
         return try_stream(generate(vo=request.environ['vo']))
 
@@ -1834,6 +1926,8 @@ def blueprint(with_doc=False):
 
     list_replicas_view = ListReplicas.as_view('list_replicas')
     bp.add_url_rule('/list', view_func=list_replicas_view, methods=[HTTPMethod.POST.value])
+    list_replicas_plan_view = ListReplicasPlan.as_view('list_replicas_plan')
+    bp.add_url_rule('/plan', view_func=list_replicas_plan_view, methods=[HTTPMethod.POST.value])
     replicas_view = Replicas.as_view('replicas')
     if not with_doc:
         # rule without trailing slash needs to be added before rule with trailing slash
@@ -1871,6 +1965,7 @@ def blueprint(with_doc=False):
 
     if not with_doc:
         bp.add_url_rule('/list/', view_func=list_replicas_view, methods=[HTTPMethod.POST.value])
+        bp.add_url_rule('/plan/', view_func=list_replicas_plan_view, methods=[HTTPMethod.POST.value])
         bp.add_url_rule('/suspicious/', view_func=suspicious_replicas_view, methods=[HTTPMethod.GET.value, HTTPMethod.POST.value])
         bp.add_url_rule('/bad/states/', view_func=bad_replicas_states_view, methods=[HTTPMethod.GET.value])
         bp.add_url_rule('/bad/summary/', view_func=bad_replicas_summary_view, methods=[HTTPMethod.GET.value])
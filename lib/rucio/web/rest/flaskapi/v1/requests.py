@@ -12,7 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
 from typing import TYPE_CHECKING, Union, cast
 
 import flask
@@ -20,7 +19,7 @@ from flask import Flask, Response
 
 from rucio.common.constants import HTTPMethod, TransferLimitDirection
 from rucio.common.exception import AccessDenied, RequestNotFound
-from rucio.common.utils import APIEncoder, render_json
+from rucio.common.utils import json_dumps, render_json
 from rucio.core.rse import get_rses_with_attribute_value
 from rucio.db.sqla.constants import RequestState
 from rucio.gateway import request
@@ -189,7 +188,7 @@ class RequestGet(ErrorHandlingMethodView):
                 issuer=flask.request.environ['issuer'],
                 vo=flask.request.environ['vo'],
             )
-            return Response(json.dumps(request_data, cls=APIEncoder), content_type='application/json')
+            return Response(json_dumps(request_data), content_type='application/json')
         except RequestNotFound as error:
             return generate_http_error_flask(404, error.__class__.__name__, f'No request found for DID {scope}:{name} at RSE {rse}')
 
@@ -352,7 +351,7 @@ class RequestHistoryGet(ErrorHandlingMethodView):
                 issuer=flask.request.environ['issuer'],
                 vo=flask.request.environ['vo'],
             )
-            return Response(json.dumps(request_data, cls=APIEncoder), content_type='application/json')
+            return Response(json_dumps(request_data), content_type='application/json')
         except RequestNotFound as error:
             return generate_http_error_flask(404, error.__class__.__name__, f'No request found for DID {scope}:{name} at RSE {rse}')
 
@@ -966,7 +965,7 @@ class RequestMetricsGet(ErrorHandlingMethodView):
         )
 
         if format == 'panda':
-            return Response(json.dumps(metrics, cls=APIEncoder), content_type='application/json')
+            return Response(json_dumps(metrics), content_type='application/json')
 
         def generate() -> "Iterator[str]":
             for result in metrics.values():
@@ -1036,7 +1035,7 @@ class TransferLimits(ErrorHandlingMethodView):
 
         def generate() -> "Iterator[str]":
             for limit in transfer_limits:
-                yield json.dumps(limit, cls=APIEncoder) + '\n'
+                yield json_dumps(limit) + '\n'
         return try_stream(generate())
 
     def put(self) -> Union[flask.Response, tuple[str, int]]:
@@ -12,7 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from json import dumps
 from typing import TYPE_CHECKING
 
 from flask import Flask, Response, jsonify, request
@@ -34,7 +33,7 @@ from rucio.common.exception import (
     RSEProtocolNotSupported,
     RSEProtocolPriorityError,
 )
-from rucio.common.utils import APIEncoder, Availability, render_json
+from rucio.common.utils import Availability, json_dumps, render_json
 from rucio.gateway.account_limit import get_rse_account_usage
 from rucio.gateway.rse import (
     add_distance,
@@ -66,7 +65,7 @@ from rucio.gateway.rse import (
 )
 from rucio.rse import rsemanager
 from rucio.web.rest.flaskapi.authenticated_bp import AuthenticatedBlueprint
-from rucio.web.rest.flaskapi.v1.common import ErrorHandlingMethodView, check_accept_header_wrapper_flask, generate_http_error_flask, json_parameters, param_get, param_get_bool, response_headers, try_stream
+from rucio.web.rest.flaskapi.v1.common import ErrorHandlingMethodView, check_accept_header_wrapper_flask, conditional_response, generate_http_error_flask, json_parameters, param_get, param_get_bool, response_headers, try_stream
 
 if TYPE_CHECKING:
     from rucio.common.types import LFNDict
@@ -509,7 +508,7 @@ class RSE(ErrorHandlingMethodView):
         try:
             rse = get_rse(rse=rse, vo=request.environ['vo'])
             rse['availability'] = Availability(rse['availability_read'], rse['availability_write'], rse['availability_delete']).integer
-            return Response(render_json(**rse), content_type="application/json")
+            return conditional_response(Response(render_json(**rse), content_type="application/json"))
         except RSENotFound as error:
             return generate_http_error_flask(404, error)
 
@@ -834,7 +833,7 @@ class ProtocolList(ErrorHandlingMethodView):
             return generate_http_error_flask(404, error)
 
         if len(p_list['protocols']):
-            return jsonify(p_list['protocols'])
+            return conditional_response(jsonify(p_list['protocols']))
         else:
             return generate_http_error_flask(404, RSEProtocolNotSupported.__name__, 'No protocols found for this RSE')
 
@@ -1881,7 +1880,7 @@ class Distance(ErrorHandlingMethodView):
         """
         try:
             distance = get_distance(source=source, destination=destination, issuer=request.environ['issuer'], vo=request.environ['vo'])
-            return Response(dumps(distance, cls=APIEncoder), content_type="application/json")
+            return Response(json_dumps(distance), content_type="application/json")
         except RSENotFound as error:
             return generate_http_error_flask(404, error)
 
@@ -2200,7 +2199,7 @@ class QoSPolicy(ErrorHandlingMethodView):
         """
         try:
             qos_policies = list_qos_policies(rse=rse, issuer=request.environ['issuer'], vo=request.environ['vo'])
-            return Response(dumps(qos_policies, cls=APIEncoder), content_type='application/json')
+            return Response(json_dumps(qos_policies), content_type='application/json')
         except RSENotFound as error:
             return generate_http_error_flask(404, error)
 
@@ -14,6 +14,7 @@
 
 from json import dumps
 from typing import Any
+from uuid import UUID
 
 from flask import Flask, Response, request
 
@@ -38,7 +39,7 @@ from rucio.common.exception import (
     StagingAreaRuleRequiresLifetime,
     UnsupportedOperation,
 )
-from rucio.common.utils import APIEncoder, render_json
+from rucio.common.utils import render_json
 from rucio.gateway.lock import get_replica_locks_for_rule_id
 from rucio.gateway.rule import (
     add_replication_rule,
@@ -53,7 +54,7 @@ from rucio.gateway.rule import (
     update_replication_rule,
 )
 from rucio.web.rest.flaskapi.authenticated_bp import AuthenticatedBlueprint
-from rucio.web.rest.flaskapi.v1.common import ErrorHandlingMethodView, check_accept_header_wrapper_flask, generate_http_error_flask, json_parameters, param_get, param_get_bool, parse_scope_name, response_headers, try_stream
+from rucio.web.rest.flaskapi.v1.common import ErrorHandlingMethodView, check_accept_header_wrapper_flask, generate_http_error_flask, json_parameters, page_parameters, param_get, param_get_bool, parse_scope_name, response_headers, stream_page, try_stream
 
 
 class Rule(ErrorHandlingMethodView):
@@ -232,9 +233,27 @@ class AllRule(ErrorHandlingMethodView):
         summary: Return all rules for a given account
         tags:
           - Rule
+        parameters:
+        - name: limit
+          in: query
+          description: "List at most this many rules, ordered by id."
+          schema:
+            type: integer
+          required: false
+        - name: cursor
+          in: query
+          description: "The X-Rucio-Next-Cursor header of the previous page, to list the next one."
+          schema:
+            type: string
+          required: false
         responses:
           200:
             description: "OK"
+            headers:
+              X-Rucio-Next-Cursor:
+                description: "The cursor of the next page, if the page is full."
+                schema:
+                  type: string
             content:
               application/json:
                 schema:
@@ -247,11 +266,16 @@ class AllRule(ErrorHandlingMethodView):
             description: "Not Acceptable"
         """
         try:
-            def generate(filters, vo):
-                for rule in list_replication_rules(filters=filters, vo=vo):
-                    yield dumps(rule, cls=APIEncoder) + '\n'
-
-            return try_stream(generate(filters=dict(request.args.items(multi=False)), vo=request.environ['vo']))
+            filters = dict(request.args.items(multi=False))
+            # The rule ids are compared as GUIDs in the database
+            limit, after = page_parameters(filters, key_length=1, validate=lambda key: UUID(key[0]))
+            filters.pop('limit', None)
+            filters.pop('cursor', None)
+
+            rules = list_replication_rules(filters=filters, vo=request.environ['vo'], limit=limit, after=after[0] if after else None)
+            return stream_page(rules, limit, key=lambda rule: [rule['id']])
+        except ValueError as error:
+            return generate_http_error_flask(400, error)
         except RuleNotFound as error:
             return generate_http_error_flask(404, error)
 
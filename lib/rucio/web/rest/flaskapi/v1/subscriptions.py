@@ -12,13 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from json import dumps
 
 from flask import Flask, Response, request
 
 from rucio.common.constants import HTTPMethod
 from rucio.common.exception import AccessDenied, InvalidObject, RuleNotFound, SubscriptionDuplicate, SubscriptionNotFound
-from rucio.common.utils import APIEncoder, render_json
+from rucio.common.utils import json_dumps, render_json
 from rucio.gateway.rule import list_replication_rules
 from rucio.gateway.subscription import add_subscription, get_subscription_by_id, list_subscription_rule_states, list_subscriptions, update_subscription
 from rucio.web.rest.flaskapi.authenticated_bp import AuthenticatedBlueprint
@@ -530,7 +529,7 @@ class States(ErrorHandlingMethodView):
         """
         def generate(vo):
             for row in list_subscription_rule_states(name=name, account=account, vo=vo):
-                yield dumps(row, cls=APIEncoder) + '\n'
+                yield json_dumps(row) + '\n'
 
         return try_stream(generate(vo=request.environ['vo']))
 
@@ -37,6 +37,7 @@ clients_requirements_table = {
         'swift': ['python-swiftclient'],
         'argcomplete': ['argcomplete'],
         'sftp': ['paramiko'],
+        'orjson': ['orjson'],
         'dumper': [
             'python-magic',
         ],
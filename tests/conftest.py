@@ -652,7 +652,9 @@ def core_config_mock(request: pytest.FixtureRequest) -> "Iterator[None]":
         in_memory_config(section=section, opt=option, value=value).save(flush=True, session=session)
     session.commit()
 
-    with mock.patch('rucio.core.config.models.Config', new=in_memory_config):
+    # The configuration snapshot of the process is loaded from the table in use
+    with mock.patch('rucio.core.config.models.Config', new=in_memory_config), \
+            mock.patch('rucio.core.config._SNAPSHOT', new=None):
         yield
 
 
@@ -736,6 +738,9 @@ def caches_mock(request: pytest.FixtureRequest) -> "Iterator[list[CacheRegion]]"
             region = make_region().configure('dogpile.cache.memory', expiration_time=expiration_time)
             stack.enter_context(mock.patch(module, new=region))
             mocked_caches.append(region)
+        if 'rucio.core.config.REGION' in caches_to_mock:
+            # The configuration snapshot of the process is versioned in the cache in use
+            stack.enter_context(mock.patch('rucio.core.config._SNAPSHOT', new=None))
 
         yield mocked_caches
 
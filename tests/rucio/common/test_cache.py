@@ -11,15 +11,20 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from unittest.mock import Mock
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, PropertyMock, patch
 
 import pytest
+from dogpile.cache import make_region
+from dogpile.cache.api import NO_VALUE
 from dogpile.cache.backends.memcached import PyMemcacheBackend
 from dogpile.cache.backends.null import NullBackend
 from dogpile.cache.util import function_key_generator
 
 import rucio.common.cache as cache
-from rucio.common.cache import CacheKey, MemcacheRegion
+from rucio.common.cache import LayeredMemcacheRegion, LocalCacheProxy, MemcacheRegion, SingleFlight, incr_counter
 
 
 class TestCache:
@@ -71,26 +76,154 @@ class TestCache:
             # Change region.backend.memcached_expire_time to region.backend['expire']
             assert region.backend.memcached_expire_time == expected_memcached_expire_time
 
-    class TestCacheKey:
-        section = "test"
-        option = "test2"
-
-        def test_has_section(self):
-            expected = "has_section_test"
-            assert CacheKey.has_section(self.section) == expected
-
-        def test_options(self):
-            expected = "options_test"
-            assert CacheKey.options(self.section) == expected
-
-        def test_has_option(self):
-            expected = "has_option_test_test2"
-            assert CacheKey.has_option(self.section, self.option) == expected
-
-        def test_item(self):
-            expected = "items_test"
-            assert CacheKey.items(self.section) == expected
-
-        def test_value(self):
-            expected = "get_test_test2"
-            assert CacheKey.value(self.section, self.option) == expected
+    class TestLayeredMemcacheRegion:
+        @pytest.mark.parametrize(
+            'caching_enabled,local_expiration_time,expected_backend',
+            [
+                (True, 5, LocalCacheProxy),
+                (True, 0, PyMemcacheBackend),
+                (False, 5, NullBackend)
+            ],
+            ids=['caching_enabled', 'local_cache_disabled', 'caching_disabled']
+        )
+        def test_backend(self, caching_enabled, local_expiration_time, expected_backend):
+            cache.ENABLE_CACHING = caching_enabled
+            region = LayeredMemcacheRegion(60, name='test', local_expiration_time=local_expiration_time)
+            assert isinstance(region.backend, expected_backend)
+            if expected_backend is LocalCacheProxy:
+                assert isinstance(region.backend.proxied, PyMemcacheBackend)
+
+        def test_local_cache(self, metrics_mock, monkeypatch):
+            monkeypatch.setattr(cache, 'METRICS_INTERVAL', 0)
+            local_cache = LocalCacheProxy('test', expiration_time=60, size=2)
+            region = make_region().configure('dogpile.cache.memory', wrap=[local_cache])
+
+            region.set('a', {'value': 1})
+            # The local copy is served even if another process deleted the value, and not shared with the callers
+            local_cache.proxied.delete('a')
+            value = region.get('a')
+            assert value == {'value': 1}
+            value['value'] = 2
+            assert region.get('a') == {'value': 1}
+
+            # The least recently used values are evicted
+            region.set('b', 2)
+            region.set('c', 3)
+            assert list(local_cache._values) == ['b', 'c']
+            assert region.get('a') is NO_VALUE
+
+            region.delete('b')
+            assert region.get('b') is NO_VALUE
+            assert region.get_or_create('b', lambda: 4) == 4
+            assert local_cache.proxied.get('b').payload == 4
+
+            assert metrics_mock.get_sample_value('rucio_common_cache_local_total', {'region': 'test', 'result': 'hit'}) == 2
+            assert metrics_mock.get_sample_value('rucio_common_cache_local_total', {'region': 'test', 'result': 'miss'}) == 4
+
+    def test_incr_counter(self):
+        region = make_region().configure('dogpile.cache.memory')
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: incr_counter(region, 'counter', 2), range(100)))
+        assert incr_counter(region, 'counter', 0) == 200
+
+        assert incr_counter(make_region().configure('dogpile.cache.null'), 'counter', 1) is None
+
+        # With memcached, the counter is created if missing and updated by the server
+        cache.ENABLE_CACHING = True
+        region = MemcacheRegion(60)
+        client = Mock()
+        client.incr.return_value = 5
+        with patch.object(PyMemcacheBackend, 'client', new_callable=PropertyMock, return_value=client):
+            assert incr_counter(region, 'counter', 5) == 5
+            client.add.assert_called_once_with('counter', b'0', noreply=False)
+            client.incr.assert_called_once_with('counter', 5, noreply=False)
+            client.incr.side_effect = OSError
+            assert incr_counter(region, 'counter', 5) is None
+
+    class TestSingleFlight:
+        def test_concurrent_calls(self, metrics_mock):
+            flights = SingleFlight('test', expiration_time=60, enabled=True)
+            started, release = threading.Event(), threading.Event()
+            calls = []
+
+            def read():
+                calls.append(1)
+                started.set()
+                release.wait(timeout=10)
+                return {'value': len(calls)}
+
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                first = executor.submit(flights.call, 'key', read)
+                started.wait(timeout=10)
+                others = [executor.submit(flights.call, 'key', read) for _ in range(3)]
+                deadline = time.monotonic() + 10
+                while metrics_mock.get_sample_value('rucio_common_cache_coalesce_total', {'group': 'test', 'result': 'coalesced'}) != 3 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                release.set()
+                results = [first.result()] + [future.result() for future in others]
+            assert results == [{'value': 1}] * 4
+            assert len(calls) == 1
+
+            # The result is kept, and the callers get their own copy
+            results[1]['value'] = 2
+            assert flights.call('key', read) == {'value': 1}
+            assert len(calls) == 1
+            flights.invalidate()
+            assert flights.call('key', read) == {'value': 2}
+
+        def test_errors_and_invalidation(self):
+            flights = SingleFlight('test', expiration_time=60, enabled=True)
+
+            def fail():
+                raise ValueError('read failed')
+
+            with pytest.raises(ValueError):
+                flights.call('key', fail)
+            # The errors are not kept
+            assert flights.call('key', lambda: 1) == 1
+            assert flights.call('key', lambda: 2) == 1
+
+            @flights.invalidates()
+            def write(value):
+                return value
+
+            assert write(3) == 3
+            assert flights.call('key', lambda: 4) == 4
+
+            # Without expiration time, only the concurrent calls are coalesced
+            flights = SingleFlight('test', expiration_time=0, enabled=True)
+            assert flights.call('key', lambda: 1) == 1
+            assert flights.call('key', lambda: 2) == 2
+
+        def test_invalidation_by_tag(self):
+            flights = SingleFlight('test', expiration_time=60, enabled=True)
+            assert flights.call(('did', 'a'), lambda: 1, tag='a') == 1
+            assert flights.call(('meta', 'a'), lambda: 1, tag='a') == 1
+            assert flights.call(('did', 'b'), lambda: 1, tag='b') == 1
+
+            @flights.invalidates(lambda arguments: [arguments['name']])
+            def write(name, value=None):
+                return value
+
+            # Only the results of the object written are forgotten
+            write('a')
+            assert flights.call(('did', 'a'), lambda: 2, tag='a') == 2
+            assert flights.call(('meta', 'a'), lambda: 2, tag='a') == 2
+            assert flights.call(('did', 'b'), lambda: 2, tag='b') == 1
+
+            # A read running during the write is still awaited, but its result is not kept
+            started, release = threading.Event(), threading.Event()
+
+            def read():
+                started.set()
+                release.wait(timeout=10)
+                return 3
+
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                running = executor.submit(flights.call, ('did', 'c'), read, 'c')
+                started.wait(timeout=10)
+                write(name='c')
+                assert ('did', 'c') in flights._flights
+                release.set()
+                assert running.result() == 3
+            assert flights.call(('did', 'c'), lambda: 4, tag='c') == 4
@@ -12,11 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
+import zlib
 from unittest.mock import Mock
 
 import pytest
 
-from rucio.common.checksum import GLOBALLY_SUPPORTED_CHECKSUMS, adler32, crc32, is_checksum_valid, md5, set_preferred_checksum, sha256
+from rucio.common.bittorrent import merkle_sha256
+from rucio.common.checksum import GLOBALLY_SUPPORTED_CHECKSUMS, adler32, adler32_combine, checksums, crc32, is_checksum_valid, md5, set_preferred_checksum, sha256
 from rucio.common.exception import ChecksumCalculationError
 
 
@@ -82,3 +85,36 @@ class TestChecksumCalculation:
 
     def test_crc32(self, test_file_to_checksum):
         assert crc32(test_file_to_checksum) == 'C843500'
+
+    @pytest.mark.parametrize('num_threads', [1, 4])
+    def test_checksums_single_pass(self, tmp_path, num_threads):
+        file = tmp_path / 'file.bin'
+        file.write_bytes(bytes(range(256)) * 1000)
+        # Blocks smaller than the file, so that several blocks are fed to each algorithm
+        result = checksums(file, ['adler32', 'md5', 'sha256', 'crc32'], num_threads=num_threads, block_size=1000)
+        assert list(result) == ['adler32', 'md5', 'sha256', 'crc32']
+        assert result == {'adler32': adler32(file), 'md5': md5(file), 'sha256': sha256(file), 'crc32': crc32(file)}
+        assert checksums(file, block_size=1000) == {name: result[name] for name in GLOBALLY_SUPPORTED_CHECKSUMS}
+
+    @pytest.mark.parametrize('content', [b'', b'a', bytes(range(256)) * 4])
+    def test_checksums_small_files(self, tmp_path, content):
+        file = tmp_path / 'file.bin'
+        file.write_bytes(content)
+        assert checksums(file, ['adler32', 'md5']) == {'adler32': '%08x' % zlib.adler32(content), 'md5': hashlib.md5(content).hexdigest()}
+
+    def test_checksums_merkle_sha256(self, test_file_to_checksum):
+        result = checksums(test_file_to_checksum, ['merkle_sha256', 'md5'])
+        assert result == {'merkle_sha256': merkle_sha256(test_file_to_checksum), 'md5': '31d50dd6285b9ff9f8611d0762265d04'}
+
+    def test_checksums_errors(self):
+        with pytest.raises(ValueError):
+            checksums('no_file', ['adler32', 'unknown'])
+        with pytest.raises(ChecksumCalculationError) as e:
+            checksums('no_file', ['adler32', 'md5'])
+        assert e.value.algorithm_name == 'adler32,md5'
+
+    def test_adler32_combine(self):
+        data = bytes(range(256)) * 700
+        for split in (0, 1, 1000, 65521, 100000, len(data)):
+            first, second = data[:split], data[split:]
+            assert adler32_combine(zlib.adler32(first), zlib.adler32(second), len(second)) == zlib.adler32(data)
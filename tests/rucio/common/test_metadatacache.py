@@ -0,0 +1,44 @@
+# Copyright European Organization for Nuclear Research (CERN) since 2012
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from rucio.common.metadatacache import MetadataCache
+
+
+def test_metadata_cache_ttl(tmp_path):
+    path = str(tmp_path / 'metadata_cache.db')
+    cache = MetadataCache(path, {'rse': 3600, 'did': 0})
+    assert cache.get('rse', 'key') is None
+
+    cache.set('rse', 'key', b'{"rse": "MOCK"}', '"etag"')
+    cache.set('did', 'key', b'{"name": "file"}')
+    entry = cache.get('rse', 'key')
+    assert (entry.body, entry.etag, entry.fresh) == (b'{"rse": "MOCK"}', '"etag"', True)
+    assert not cache.get('did', 'key').fresh
+    assert cache.get('unknown', 'key') is None
+
+    # The entries are shared with the other processes using the same file
+    other = MetadataCache(path, {'rse': 3600})
+    assert other.get('rse', 'key').body == b'{"rse": "MOCK"}'
+    other.delete('rse', 'key')
+    assert cache.get('rse', 'key') is None
+    cache.clear()
+    assert cache.get('did', 'key') is None
+
+
+def test_metadata_cache_corrupted(tmp_path):
+    path = tmp_path / 'metadata_cache.db'
+    cache = MetadataCache(str(path))
+    path.write_bytes(b'not a database' * 1000)
+    cache.set('rse', 'key', b'{}')
+    assert cache.get('rse', 'key') is None
@@ -12,9 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+import math
+
 import pytest
 
-from rucio.common.utils import ScopeExtractionAlgorithms, _encode_params_as_url_query_string, build_url, invert_dict
+from rucio.common.constants import HTTPMethod
+from rucio.common.types import InternalAccount, InternalScope
+from rucio.common.utils import EXTRA_MODULES, ScopeExtractionAlgorithms, _encode_params_as_url_query_string, build_url, date_to_str, invert_dict, json_dumps, parse_response, parse_response_lines
+from rucio.db.sqla.constants import DIDType
 
 
 class TestUtils:
@@ -66,3 +72,37 @@ class TestUtils:
     )
     def test_default_scope_extraction_algorithm(self, did, scope, name):
         assert ScopeExtractionAlgorithms.extract_scope_default(did=did, scopes=None) == (scope, name)
+
+    @pytest.mark.parametrize('use_orjson', [True, False])
+    def test_parse_response(self, use_orjson, monkeypatch):
+        if not use_orjson:
+            monkeypatch.setitem(EXTRA_MODULES, 'orjson', None)
+        document = '{"a": "Tue, 01 Jan 2019 10:20:30 UTC", "b": [{"c": "Wed, 31 Feb 2019 00:00:00 UTC"}], "d": NaN}'
+        for data in (document, document.encode()):
+            result = parse_response(data)
+            assert result['a'] == datetime.datetime(2019, 1, 1, 10, 20, 30)
+            assert result['b'] == [{'c': 'Wed, 31 Feb 2019 00:00:00 UTC'}]
+            assert math.isnan(result['d'])
+        assert parse_response('[1, "x"]') == [1, 'x']
+
+    @pytest.mark.parametrize('chunk_size', [1, 5, 1024])
+    def test_parse_response_lines(self, chunk_size):
+        stream = b'{"a": 1}\n\n{"b": "Tue, 01 Jan 2019 00:00:00 UTC"}\r\n[2]'
+        chunks = [stream[i:i + chunk_size] for i in range(0, len(stream), chunk_size)]
+        assert list(parse_response_lines(chunks)) == [{'a': 1}, {'b': datetime.datetime(2019, 1, 1)}, [2]]
+
+    @pytest.mark.parametrize('use_orjson', [True, False])
+    def test_json_dumps(self, use_orjson, monkeypatch):
+        if not use_orjson:
+            monkeypatch.setitem(EXTRA_MODULES, 'orjson', None)
+        created_at = datetime.datetime(2019, 1, 1, 10, 20, 30)
+        document = {'scope': InternalScope('user.jdoe'), 'account': InternalAccount('jdoe'), 'type': DIDType.DATASET,
+                    'method': HTTPMethod.GET, 'created_at': created_at, 'lifetime': datetime.timedelta(days=1),
+                    'files': [{'bytes': 2 ** 70, 'md5': None}], 1: True}
+        assert parse_response(json_dumps(document)) == {
+            'scope': 'user.jdoe', 'account': 'jdoe', 'type': 'DATASET', 'method': 'GET', 'created_at': created_at,
+            'lifetime': 86400, 'files': [{'bytes': 2 ** 70, 'md5': None}], '1': True}
+        assert json_dumps({'a': [1, 2], 'b': None}) == '{"a":[1,2],"b":null}'
+        assert date_to_str(created_at) == created_at.strftime('%a, %d %b %Y %H:%M:%S UTC') == 'Tue, 01 Jan 2019 10:20:30 UTC'
+        with pytest.raises(TypeError):
+            json_dumps({'a': {1}})
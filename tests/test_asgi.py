@@ -0,0 +1,157 @@
+# Copyright European Organization for Nuclear Research (CERN) since 2012
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import threading
+
+from rucio.common.utils import parse_response
+from rucio.web.rest.asgi import WSGIToASGI, application
+
+
+def http_scope(path, method='GET', query_string=b'', headers=()):
+    return {'type': 'http', 'method': method, 'path': path, 'query_string': query_string, 'headers': list(headers),
+            'http_version': '1.1', 'scheme': 'http', 'server': ('localhost', 80), 'client': ('127.0.0.1', 12345)}
+
+
+def call(app, scope, body=b'', disconnect_after=None):
+    """Run an ASGI request, returning the status, the headers and the body chunks."""
+    messages = []
+
+    async def run():
+        requests = [{'type': 'http.request', 'body': body, 'more_body': False}]
+        disconnected = asyncio.Event()
+
+        async def receive():
+            if requests:
+                return requests.pop()
+            await disconnected.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            messages.append(message)
+            if disconnect_after is not None and len(messages) > disconnect_after:
+                disconnected.set()
+
+        await app(scope, receive, send)
+
+    asyncio.run(run())
+    headers = dict(messages[0]['headers'])
+    return messages[0]['status'], headers, [message['body'] for message in messages[1:]]
+
+
+def test_asgi_ping():
+    """ ASGI: the REST API is served through the ASGI adapter"""
+    status, headers, chunks = call(application, http_scope('/ping', headers=[(b'accept', b'application/json')]))
+    assert status == 200
+    assert headers[b'content-type'] == b'application/json'
+    assert 'version' in parse_response(b''.join(chunks))
+
+
+def test_asgi_streaming():
+    """ ASGI: the response is sent as it is produced, from the thread of the request"""
+    threads = set()
+    closed = threading.Event()
+
+    def wsgi_app(environ, start_response):
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        assert environ['QUERY_STRING'] == 'a=1'
+        assert environ['HTTP_X_TEST'] == 'x,y'
+        assert environ['wsgi.input'].read() == b'body'
+
+        def generate():
+            try:
+                for i in range(5):
+                    threads.add(threading.get_ident())
+                    yield b'%d\n' % i
+            finally:
+                closed.set()
+        return generate()
+
+    app = WSGIToASGI(wsgi_app, threads=2, buffer_size=1, spool_size=0)
+    status, _, chunks = call(app, http_scope('/', method='POST', query_string=b'a=1', headers=[(b'x-test', b'x'), (b'x-test', b'y')]), body=b'body')
+    assert status == 200
+    assert chunks == [b'0\n', b'1\n', b'2\n', b'3\n', b'4\n', b'']
+    assert len(threads) == 1
+    assert closed.is_set()
+
+
+def test_asgi_spill():
+    """ ASGI: a response larger than the buffer is spilled, so that its thread does not wait for the client"""
+    closed = threading.Event()
+
+    def wsgi_app(environ, start_response):
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+
+        def generate():
+            try:
+                for i in range(100):
+                    yield b'%d\n' % i
+            finally:
+                closed.set()
+        return generate()
+
+    app = WSGIToASGI(wsgi_app, threads=1, buffer_size=10, spool_size=1024 * 1024)
+    messages = []
+
+    async def run():
+        requests = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+        async def receive():
+            if requests:
+                return requests.pop()
+            await asyncio.Event().wait()
+
+        async def send(message):
+            if not messages:
+                # the client only reads once the response is completely produced
+                assert await asyncio.get_running_loop().run_in_executor(None, closed.wait, 10)
+            messages.append(message)
+
+        await app(http_scope('/'), receive, send)
+
+    asyncio.run(run())
+    assert messages[0]['status'] == 200
+    assert b''.join(message['body'] for message in messages[1:]) == b''.join(b'%d\n' % i for i in range(100))
+    assert messages[-1]['more_body'] is False
+
+
+def test_asgi_error():
+    """ ASGI: an error before the response starts gives a 500"""
+    def wsgi_app(environ, start_response):
+        raise RuntimeError('error')
+
+    status, _, chunks = call(WSGIToASGI(wsgi_app, threads=1), http_scope('/'))
+    assert status == 500
+    assert chunks == [b'']
+
+
+def test_asgi_disconnect():
+    """ ASGI: the response stops being produced when the client disconnects"""
+    closed = threading.Event()
+
+    def wsgi_app(environ, start_response):
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+
+        def generate():
+            try:
+                while True:
+                    yield b'line\n'
+            finally:
+                closed.set()
+        return generate()
+
+    status, _, chunks = call(WSGIToASGI(wsgi_app, threads=1, buffer_size=1, spool_size=0), http_scope('/'), disconnect_after=2)
+    assert status == 200
+    assert chunks[0] == b'line\n'
+    assert closed.wait(timeout=10)
@@ -12,15 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import base64
 import datetime
+import json
 import time
+from unittest import mock
 
 import pytest
 from requests import session
 
 from rucio.common.exception import AccessDenied, CannotAuthenticate, Duplicate
-from rucio.common.utils import ssh_sign
-from rucio.core.authentication import strip_x509_proxy_attributes
+from rucio.common.utils import generate_uuid, ssh_sign
+from rucio.core.authentication import strip_x509_proxy_attributes, validate_auth_token
 from rucio.core.identity import add_account_identity, del_account_identity
 from rucio.db.sqla import models
 from rucio.db.sqla.constants import IdentityType
@@ -293,3 +296,30 @@ def test_non_jwt_validation():
     from rucio.gateway.authentication import validate_auth_token
     with pytest.raises(CannotAuthenticate):
         validate_auth_token('a.b.c')
+
+
+def test_invalid_token_cache():
+    """ AUTHENTICATION: invalid tokens are rejected without querying the database again """
+    expired_claims = base64.urlsafe_b64encode(json.dumps({'iss': 'https://test_issuer/', 'exp': 1}).encode()).decode().rstrip('=')
+    expired_jwt = 'eyJhbGciOiJub25lIn0.' + expired_claims + '.'
+    unknown_token = generate_uuid()
+    with mock.patch('rucio.core.authentication.query_token', return_value=None) as query_token:
+        for _ in range(2):
+            with pytest.raises(CannotAuthenticate):
+                validate_auth_token(unknown_token)
+            with pytest.raises(CannotAuthenticate):
+                validate_auth_token(expired_jwt)
+    assert query_token.call_count == 1
+
+
+def test_failed_jwt_validation_not_cached():
+    """ AUTHENTICATION: JWTs failing the validation against the identity provider are checked again by the next requests """
+    claims = base64.urlsafe_b64encode(json.dumps({'iss': 'https://test_issuer/', 'exp': 2 ** 32}).encode()).decode().rstrip('=')
+    valid_jwt = 'eyJhbGciOiJub25lIn0.' + claims + '.'
+    with mock.patch('rucio.core.oidc.check_jwt_locally', return_value=True), \
+            mock.patch('rucio.core.authentication.query_token', return_value=None), \
+            mock.patch('rucio.core.oidc.validate_jwt', side_effect=CannotAuthenticate('Identity provider unavailable')) as validate_jwt:
+        for _ in range(2):
+            with pytest.raises(CannotAuthenticate):
+                validate_auth_token(valid_jwt)
+    assert validate_jwt.call_count == 2
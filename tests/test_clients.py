@@ -180,6 +180,70 @@ class TestBaseClient:
         # The client did back-off multiple times before succeeding: 2 * 0.25s (authentication) + 2 * 0.25s (request) = 1s
         assert datetime.utcnow() - start_time > timedelta(seconds=0.9)
 
+    def test_bulk_call(self, vo):
+        """ CLIENTS (BASECLIENT): Ensure bulk_call keeps the order of the results and concurrent calls get a new token only once"""
+        tokens = []
+        valid_token = {}
+        from rucio.client.baseclient import BaseClient
+
+        class TokenHandler(MockServer.Handler):
+            def do_GET(self):
+                if self.path.startswith('/auth/'):
+                    tokens.append(self.path)
+                    valid_token['value'] = 'token%s' % len(tokens)
+                    self.send_code_and_message(200, {'x-rucio-auth-token': valid_token['value']}, '')
+                elif self.headers.get('X-Rucio-Auth-Token') == valid_token['value']:
+                    self.send_code_and_message(200, {}, self.path)
+                else:
+                    self.send_code_and_message(401, {}, '')
+
+        with MockServer(TokenHandler) as server:
+            creds = {'username': 'ddmlab', 'password': 'secret'}
+            client = BaseClient(rucio_host=server.base_url, auth_host=server.base_url, account='root', auth_type='userpass', creds=creds, vo=vo)
+            valid_token['value'] = 'expired'
+            nb_tokens = len(tokens)
+
+            def get(path):
+                return client._send_request(server.base_url + path, method=HTTPMethod.GET).text  # noqa
+
+            paths = ['/%s' % i for i in range(20)]
+            assert client.bulk_call(get, [(path,) for path in paths], num_threads=5) == paths
+            assert len(tokens) == nb_tokens + 1
+            results = client.bulk_call(get, [{'path': None}, {'path': '/0'}], return_exceptions=True)
+            assert isinstance(results[0], TypeError)
+            assert results[1] == '/0'
+
+    def test_metadata_cache(self, vo, tmp_path):
+        """ CLIENTS (BASECLIENT): Ensure cached metadata is served without request while fresh and revalidated with its ETag once expired"""
+        requests = []
+        from rucio.client.rseclient import RSEClient
+        from rucio.common.metadatacache import MetadataCache
+
+        class RSEHandler(MockServer.Handler):
+            def do_GET(self):
+                if self.path.startswith('/auth/'):
+                    self.send_code_and_message(200, {'x-rucio-auth-token': 'token'}, '')
+                    return
+                requests.append(self.headers.get('If-None-Match'))
+                if self.headers.get('If-None-Match') == '"v1"':
+                    self.send_code_and_message(304, {}, '')
+                else:
+                    self.send_code_and_message(200, {'ETag': '"v1"'}, '{"rse": "MOCK", "deterministic": true}')
+
+        with MockServer(RSEHandler) as server:
+            creds = {'username': 'ddmlab', 'password': 'secret'}
+            client = RSEClient(rucio_host=server.base_url, auth_host=server.base_url, account='root', auth_type='userpass', creds=creds, vo=vo)
+            client.metadata_cache = MetadataCache(str(tmp_path / 'metadata_cache.db'), {'rse': 3600})
+            expected = {'rse': 'MOCK', 'deterministic': True}
+
+            assert client.get_rse('MOCK') == expected
+            assert client.get_rse('MOCK') == expected
+            assert requests == [None]
+
+            client.metadata_cache.ttls['rse'] = 0
+            assert client.get_rse('MOCK') == expected
+            assert requests == [None, '"v1"']
+
 
 class TestRucioClients:
     """ To test Clients"""
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from unittest import mock
+
 import pytest
 
 import rucio.core.config as core_config
@@ -56,6 +58,32 @@ class TestConfigCore:
         value = core_config.get(section, option, use_cache=False, convert_type_fnc=lambda x: x)
         assert value == expected_value
 
+    @pytest.mark.parametrize("caches_mock", [{"caches_to_mock": ['rucio.core.config.REGION']}], indirect=True)
+    def test_snapshot(self, caches_mock):
+        """ CONFIG (CORE): Read the configuration from the snapshot of the process """
+        region, = caches_mock
+        section = str(generate_uuid())
+        core_config.set(section=section, option='option', value='1')
+        assert core_config.get(section, 'option', convert_type_fnc=int) == 1
+        assert core_config.items(section, convert_type_fnc=int) == [('option', 1)]
+        version = region.get(core_config.SNAPSHOT_VERSION_KEY)
+
+        # The changes of this process are seen immediately and published to the others
+        core_config.set(section=section, option='option', value='2')
+        assert core_config.get(section, 'option', convert_type_fnc=int) == 2
+        assert region.get(core_config.SNAPSHOT_VERSION_KEY) != version
+        core_config.remove_option(section, 'option')
+        assert not core_config.has_section(section)
+        assert core_config.get(section, 'option', default=3, convert_type_fnc=int) == 3
+
+        # The snapshot is reloaded when another process publishes a new version
+        snapshot = core_config.snapshot()
+        assert core_config.snapshot() is snapshot
+        with mock.patch('rucio.core.config.SNAPSHOT_CHECK_INTERVAL', 0):
+            assert core_config.snapshot() is snapshot
+            region.set(core_config.SNAPSHOT_VERSION_KEY, str(generate_uuid()))
+            assert core_config.snapshot() is not snapshot
+
 
 def test_config_section_contextless():
     config = ConfigClient()
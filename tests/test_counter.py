@@ -15,10 +15,12 @@ import random
 from time import sleep
 
 import pytest
+from dogpile.cache import make_region
 from sqlalchemy import and_, delete, select, update
 
 from rucio.core import account_counter, rse_counter
 from rucio.core.account import get_usage
+from rucio.core.rse import set_rse_limits, set_rse_usage
 from rucio.daemons.abacus.account import account_update
 from rucio.daemons.abacus.rse import rse_update
 from rucio.db.sqla import models
@@ -87,6 +89,30 @@ class TestCoreRSECounter:
             del cnt['updated_at']
             assert cnt == {'files': count, 'bytes': sum_}
 
+    def test_usage_version(self, rse_factory, monkeypatch):
+        """RSE COUNTER (CORE): The usage versions are published once the updates are committed."""
+        monkeypatch.setattr(rse_counter, 'REGION', make_region().configure('dogpile.cache.memory'))
+        _, rse_id = rse_factory.make_mock_rse()
+        with db_session_context(DatabaseOperationType.WRITE) as session:
+            set_rse_usage(rse_id=rse_id, source='srm', used=1, free=1, session=session)
+            assert rse_counter.get_rse_usage_version(rse_id) is None
+        version = rse_counter.get_rse_usage_version(rse_id)
+        assert version is not None
+
+        # A rolled back update publishes no version
+        with pytest.raises(ValueError), db_session_context(DatabaseOperationType.WRITE) as session:
+            set_rse_limits(rse_id=rse_id, name='MinFreeSpace', value=1, session=session)
+            raise ValueError()
+        assert rse_counter.get_rse_usage_version(rse_id) == version
+
+        # The updates of the counters publish a version only if the current one is old enough
+        with db_session_context(DatabaseOperationType.WRITE) as session:
+            rse_counter.mark_rse_usage_updated(rse_id, 600, session=session)
+        assert rse_counter.get_rse_usage_version(rse_id) == version
+        with db_session_context(DatabaseOperationType.WRITE) as session:
+            set_rse_limits(rse_id=rse_id, name='MinFreeSpace', value=1, session=session)
+        assert rse_counter.get_rse_usage_version(rse_id) != version
+
     def test_fill_counter_history(self, db_session):
         """RSE COUNTER (CORE): Fill the usage history with the current value."""
         stmt = delete(models.RSEUsageHistory)
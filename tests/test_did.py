@@ -19,7 +19,7 @@ import pytest
 from rucio.common import exception
 from rucio.common.exception import DataIdentifierAlreadyExists, DataIdentifierNotFound, DuplicateContent, FileAlreadyExists, FileConsistencyMismatch, InvalidPath, ScopeNotFound, UnsupportedOperation, UnsupportedStatus
 from rucio.common.types import InternalScope
-from rucio.common.utils import generate_uuid
+from rucio.common.utils import generate_uuid, parse_response_lines
 from rucio.core.did import (
     add_did,
     add_did_to_followed,
@@ -44,7 +44,7 @@ from rucio.core.replica import add_replica, get_replica
 from rucio.db.sqla.constants import DIDType
 from rucio.db.sqla.util import json_implemented
 from rucio.gateway import did, scope
-from rucio.tests.common import did_name_generator, rse_name_generator, scope_name_generator
+from rucio.tests.common import auth, did_name_generator, headers, rse_name_generator, scope_name_generator
 
 
 def skip_without_json():
@@ -1299,3 +1299,61 @@ def test_client_bulk_add_containers(mock_scope, did_client, rse_factory):
     returned_names = [did for did in dids]
     for name in container_names:
         assert name in returned_names
+
+
+def test_rest_list_content_pages(root_account, rse_factory, did_factory, rest_client, auth_token):
+    """ DATA IDENTIFIERS (REST): List the content of a dataset by pages"""
+    _, rse_id = rse_factory.make_mock_rse()
+    dataset = did_factory.make_dataset()
+    files = [did_factory.random_file_did() for _ in range(5)]
+    for file in files:
+        add_replica(rse_id=rse_id, bytes_=10, account=root_account, **file)
+    attach_dids(dids=files, account=root_account, **dataset)
+    url = '/dids/%s/%s/dids' % (dataset['scope'].external, dataset['name'])
+
+    names, cursor, pages = [], None, 0
+    while True:
+        response = rest_client.get(url, query_string={'limit': 2, 'cursor': cursor} if cursor else {'limit': 2}, headers=headers(auth(auth_token)))
+        assert response.status_code == 200
+        names.extend(content['name'] for content in parse_response_lines([response.get_data()]))
+        pages += 1
+        cursor = response.headers.get('X-Rucio-Next-Cursor')
+        if not cursor:
+            break
+    # the last page is empty, as the previous one was full
+    assert pages == 3
+    assert names == sorted(file['name'] for file in files)
+
+    response = rest_client.get(url, query_string={'limit': 2, 'cursor': 'invalid'}, headers=headers(auth(auth_token)))
+    assert response.status_code == 400
+    response = rest_client.get(url, query_string={'limit': 0}, headers=headers(auth(auth_token)))
+    assert response.status_code == 400
+
+
+def test_rest_list_dids_pages(root_account, rse_factory, did_factory, rest_client, auth_token):
+    """ DATA IDENTIFIERS (REST): Search the DIDs of a scope by pages"""
+    _, rse_id = rse_factory.make_mock_rse()
+    suffix = generate_uuid()
+    files = [did_factory.random_file_did(name_suffix=suffix) for _ in range(5)]
+    for file in files:
+        add_replica(rse_id=rse_id, bytes_=10, account=root_account, **file)
+    scope = files[0]['scope'].external
+    url = '/dids/%s/dids/search' % scope
+    query = {'type': 'file', 'name': '*' + suffix, 'limit': 2}
+
+    names, cursors = [], [None]
+    while True:
+        response = rest_client.get(url, query_string=dict(query, cursor=cursors[-1]) if cursors[-1] else query, headers=headers(auth(auth_token)))
+        assert response.status_code == 200
+        names.extend(parse_response_lines([response.get_data()]))
+        cursors.append(response.headers.get('X-Rucio-Next-Cursor'))
+        if not cursors[-1]:
+            break
+    # the last page is empty, as the previous one was full
+    assert len(cursors) == 4
+    assert names == sorted(file['name'] for file in files)
+
+    response = rest_client.get(url, query_string=dict(query, cursor='invalid'), headers=headers(auth(auth_token)))
+    assert response.status_code == 400
+    response = rest_client.get(url, query_string=dict(query, recursive=True, cursor=cursors[1]), headers=headers(auth(auth_token)))
+    assert response.status_code == 400
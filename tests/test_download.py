@@ -634,6 +634,55 @@ def test_transfer_timeout(rse_factory, did_factory, download_client):
             mocks_get[0].assert_called_with(ANY, ANY, transfer_timeout=60)
 
 
+def test_protocol_reused_across_files(rse_factory, did_factory, download_client):
+    """ Download (CLIENT): Ensure a download thread connects once per RSE and scheme, not once per file """
+    scope = str(did_factory.default_scope)
+    rse, _ = rse_factory.make_posix_rse()
+    base_name = generate_uuid()
+    for i in range(3):
+        did_factory.upload_test_file(rse, name='%s.%s' % (base_name, i))
+
+    connected = []
+
+    class ConnectCounterPosixProtocol(PosixProtocol):
+        def connect(self):
+            connected.append(self)
+            super(ConnectCounterPosixProtocol, self).connect()
+
+    with patch('rucio.rse.protocols.posix.Default', ConnectCounterPosixProtocol):
+        with TemporaryDirectory() as tmp_dir:
+            result = download_client.download_dids([{'did': '%s:%s.*' % (scope, base_name), 'base_dir': tmp_dir}], num_threads=1)
+            assert len(result) == 3
+            assert all(item['clientState'] == 'DONE' for item in result)
+    assert len(connected) == 1
+
+
+def test_download_segmented(rse_factory, did_factory, download_client):
+    """ Download (CLIENT): Ensure a large file is downloaded in byte ranges when the protocol supports them """
+    rse, _ = rse_factory.make_posix_rse()
+    did = did_factory.upload_test_file(rse, size=1000)
+    did_str = '%s:%s' % (did['scope'], did['name'])
+
+    ranges = []
+
+    class RangedPosixProtocol(PosixProtocol):
+        def get_range(self, pfn, dest, offset, length, transfer_timeout=None):
+            ranges.append((offset, length))
+            with open(self.pfn2path(pfn), 'rb') as source, open(dest, 'r+b') as target:
+                source.seek(offset)
+                target.seek(offset)
+                target.write(source.read(length))
+
+    download_client.segmented_min_size = 500
+    download_client.segment_size = 300
+    with patch('rucio.rse.protocols.posix.Default', RangedPosixProtocol):
+        with TemporaryDirectory() as tmp_dir:
+            result = download_client.download_dids([{'did': did_str, 'base_dir': tmp_dir}])
+            assert result[0]['clientState'] == 'DONE'
+            assert os.path.getsize(result[0]['dest_file_paths'][0]) == 1000
+    assert sorted(ranges) == [(0, 300), (300, 300), (600, 300), (900, 100)]
+
+
 def test_download_file_with_impl(rse_factory, did_factory, download_client, mock_scope):
     """ Download (CLIENT): Ensure the module associated to the impl value is called """
 
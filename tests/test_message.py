@@ -145,3 +145,45 @@ def test_non_existing_service(core_config_mock, caches_mock):
         add_message(event_type='NEW_DID', payload={'name': 'name',
                                                    'name_Y': 'scope_X',
                                                    'type': 'file'})
+
+
+@pytest.mark.noparallel(reason='fails when run in parallel')
+@pytest.mark.parametrize("core_config_mock", [{"table_content": [
+    ('hermes', 'services_list', 'activemq'),
+    ('hermes', 'payload_compression', 'gzip'),
+    ('hermes', 'payload_compression_threshold', '100'),
+]}], indirect=True)
+@pytest.mark.parametrize("caches_mock", [{"caches_to_mock": [
+    'rucio.core.config.REGION',
+]}], indirect=True)
+def test_compressed_payload(core_config_mock, caches_mock):
+    """ MESSAGE (CORE): Test insert and retrieving of messages with compressed payload """
+    truncate_messages()
+
+    small_payload = {'name': 'name', 'scope': 'scope_X'}
+    compressible_payload = {'mylong_message': 'x' * (MAX_MESSAGE_LENGTH * 4)}
+    random_payload = {'mylong_message': ''.join(generate_uuid() for _ in range(MAX_MESSAGE_LENGTH // 8))}
+    event_types = [generate_uuid()[:10] for _ in range(3)]
+    add_messages([{'event_type': event_type, 'payload': payload}
+                  for event_type, payload in zip(event_types, [small_payload, compressible_payload, random_payload])])
+
+    session = get_session()
+    stmt = select(
+        Message.event_type,
+        Message.payload,
+        Message.payload_nolimit
+    ).where(
+        Message.event_type.in_(event_types)
+    )
+    stored = {row.event_type: row for row in session.execute(stmt)}
+    # Short payloads are not compressed
+    assert stored[event_types[0]].payload == json.dumps(small_payload)
+    # Compressed payloads fitting in the payload column do not spill over
+    assert stored[event_types[1]].payload.startswith('gzip:')
+    assert stored[event_types[1]].payload_nolimit is None
+    # Large compressed payloads still spill over to payload_nolimit
+    assert stored[event_types[2]].payload == 'nolimit'
+    assert stored[event_types[2]].payload_nolimit.startswith('gzip:')
+
+    messages = {msg['event_type']: msg['payload'] for msg in retrieve_messages(40)}
+    assert messages == dict(zip(event_types, [small_payload, compressible_payload, random_payload]))
@@ -12,8 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
+import subprocess  # noqa: S404 -- subprocess used to measure the imports of a fresh interpreter
+import sys
+
 from rucio.common.utils import execute
 
+# Modules which must only be imported by the commands using them, not when the CLI starts
+CLI_LAZY_MODULES = ('paramiko', 'rich.traceback', 'rucio.cli.bin_legacy.rucio', 'rucio.cli.bin_legacy.rucio_admin', 'rucio.client.client')
+# Generous, to catch the import of a whole stack rather than small variations between machines
+CLI_IMPORT_BUDGET_US = 1000000
+
 
 class TestModuleImport:
     def test_import(self):
@@ -26,3 +35,21 @@ class TestModuleImport:
         assert 'ImportError' not in out
         assert 'Exception' not in err
         assert 'Exception' not in out
+
+    def test_cli_import_time(self):
+        """
+        RUCIO: Test that the CLI imports the client stack and the commands lazily.
+        """
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(path for path in sys.path if path))
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import rucio.cli.command'],
+                                env=env, capture_output=True, text=True, check=True)
+        imports = {}
+        for line in result.stderr.splitlines():
+            if line.startswith('import time:') and '|' in line:
+                _, cumulative, name = line.split('|')
+                if cumulative.strip().isdigit():
+                    imports[name.strip()] = int(cumulative)
+
+        assert 'rucio.cli.command' in imports
+        assert [module for module in CLI_LAZY_MODULES if module in imports] == []
+        assert imports['rucio.cli.command'] < CLI_IMPORT_BUDGET_US
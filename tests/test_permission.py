@@ -12,9 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import pytest
+
 from rucio.common.config import config_get
 from rucio.common.types import InternalScope
-from rucio.core.account import add_account_attribute
+from rucio.core.account import add_account_attribute, del_account_attribute, has_account_attribute
+from rucio.core.permission import has_permission as core_has_permission
 from rucio.core.scope import add_scope
 from rucio.db.sqla.constants import DatabaseOperationType
 from rucio.db.sqla.session import db_session
@@ -77,3 +80,33 @@ class TestPermissionCoreGateway:
         kwargs = {'options': {'boost_rule': True}}
         assert has_permission(issuer='root', action='update_rule', kwargs=kwargs, vo=vo)
         assert not has_permission(issuer='jdoe', action='update_rule', kwargs=kwargs, vo=vo)
+
+    def test_permission_cache(self, random_account):
+        """ PERMISSION(CORE): Check that the decisions and account attributes are cached until they change"""
+        with db_session(DatabaseOperationType.WRITE) as session:
+            assert not core_has_permission(random_account, 'add_rse', {'rse': 'MOCK'}, session=session)
+            assert not has_account_attribute(random_account, 'admin', session=session)
+            assert session.info['permission_decisions']
+            assert session.info['account_attribute_keys'][random_account] == frozenset()
+
+            add_account_attribute(random_account, 'admin', True, session=session)
+            assert 'permission_decisions' not in session.info
+            assert has_account_attribute(random_account, 'admin', session=session)
+            assert core_has_permission(random_account, 'add_rse', {'rse': 'MOCK'}, session=session)
+
+        # The decision is reused by the next requests, until the attribute is removed
+        with db_session(DatabaseOperationType.WRITE) as session:
+            assert core_has_permission(random_account, 'add_rse', {'rse': 'MOCK'}, session=session)
+            del_account_attribute(random_account, 'admin', session=session)
+            assert not core_has_permission(random_account, 'add_rse', {'rse': 'MOCK'}, session=session)
+
+    def test_permission_cache_rollback(self, random_account):
+        """ PERMISSION(CORE): Check that the decisions taken from uncommitted attributes are forgotten on rollback"""
+        with pytest.raises(ValueError):
+            with db_session(DatabaseOperationType.WRITE) as session:
+                add_account_attribute(random_account, 'admin', True, session=session)
+                assert core_has_permission(random_account, 'add_rse', {'rse': 'MOCK'}, session=session)
+                raise ValueError
+
+        with db_session(DatabaseOperationType.READ) as session:
+            assert not core_has_permission(random_account, 'add_rse', {'rse': 'MOCK'}, session=session)
@@ -25,6 +25,7 @@ from rucio.core import message as message_core
 from rucio.core import replica as replica_core
 from rucio.core import rse as rse_core
 from rucio.core import rule as rule_core
+from rucio.core.quarantined_replica import add_quarantined_replicas, list_quarantined_replicas
 from rucio.daemons.reaper.dark_reaper import reaper as dark_reaper
 from rucio.daemons.reaper.reaper import reaper
 from rucio.daemons.reaper.reaper import run as run_reaper
@@ -137,6 +138,52 @@ def test_reaper_bulk_delete(vo, caches_mock):
     assert len(list(replica_core.list_replicas(dids, rse_expression=rse_name))) == 200
 
 
+@pytest.mark.parametrize("caches_mock", [{"caches_to_mock": [
+    'rucio.daemons.reaper.reaper.REGION',
+    'rucio.core.rse_counter.REGION',
+]}], indirect=True)
+def test_reaper_rse_usage_model(vo, caches_mock):
+    """ REAPER (DAEMON): Test that the cached RSE usage follows the deletions and the usage updates."""
+    [cache_region, _] = caches_mock
+    scope = InternalScope('data13_hip', vo=vo)
+
+    nb_files = 100
+    file_size = 200
+    rse_name, rse_id, dids = __add_test_rse_and_replicas(vo=vo, scope=scope, rse_name=rse_name_generator(),
+                                                         names=['lfn' + generate_uuid() for _ in range(nb_files)], file_size=file_size)
+    rse_core.set_rse_limits(rse_id=rse_id, name='MinFreeSpace', value=50 * file_size)
+    rse_core.set_rse_usage(rse_id=rse_id, source='storage', used=nb_files * file_size, free=1)
+
+    # The needed space is decreased by the deleted bytes after each chunk, so the reaper stops after 50 files
+    for _ in range(4):
+        reaper(once=True, rses=[], include_rses=rse_name, exclude_rses=None, chunk_size=20)
+    assert len(list(replica_core.list_replicas(dids, rse_expression=rse_name))) == nb_files - 50
+
+    # A usage update makes the reaper recompute the needed space
+    rse_core.set_rse_usage(rse_id=rse_id, source='storage', used=nb_files * file_size, free=1)
+    cache_region.delete('pause_deletion_%s' % rse_id)
+    reaper(once=True, rses=[], include_rses=rse_name, exclude_rses=None, chunk_size=20)
+    assert len(list(replica_core.list_replicas(dids, rse_expression=rse_name))) == nb_files - 70
+
+
+def test_dark_reaper_concurrent(vo):
+    """ REAPER (DAEMON): Test the dark reaper deleting quarantined replicas of several RSEs concurrently."""
+    nb_files = 20
+    rse_ids = []
+    for _ in range(2):
+        rse_id = rse_core.add_rse(rse_name_generator(), vo=vo)
+        rse_core.add_protocol(rse_id=rse_id, parameter=__mock_protocol)
+        add_quarantined_replicas(rse_id=rse_id, replicas=[{'path': '/test/reaper/%s' % generate_uuid()} for _ in range(nb_files)])
+        rse_ids.append(rse_id)
+
+    dark_reaper(once=True, rses=rse_ids, chunk_size=nb_files, concurrent_rses=2, threads_per_rse=4)
+
+    for rse_id in rse_ids:
+        real_replicas, dark_replicas = list_quarantined_replicas(rse_id=rse_id, limit=nb_files)
+        assert real_replicas == []
+        assert dark_replicas == []
+
+
 @pytest.mark.parametrize("caches_mock", [{"caches_to_mock": [
     'rucio.daemons.reaper.reaper.REGION'
 ]}], indirect=True)
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import gzip
 import hashlib
 import os
 import time
@@ -28,7 +29,7 @@ from werkzeug.datastructures import Headers, MultiDict
 from rucio.client.ruleclient import RuleClient
 from rucio.common.constants import RseAttr
 from rucio.common.exception import AccessDenied, DatabaseException, DataIdentifierNotFound, InputValidationError, ReplicaIsLocked, ReplicaNotFound, RucioException, ScopeNotFound
-from rucio.common.utils import clean_pfns, generate_uuid, parse_response
+from rucio.common.utils import clean_pfns, generate_uuid, parse_replicas_from_string, parse_replicas_plan, parse_response, parse_response_lines
 from rucio.core.config import set as cconfig_set
 from rucio.core.did import add_did, attach_dids, get_did, get_did_access_cnt, get_did_atime, list_files, set_status
 from rucio.core.replica import add_bad_dids, add_replica, add_replicas, delete_replicas, get_bad_pfns, get_replica, get_replica_atime, get_replicas_state, get_rse_coverage_of_dataset, list_replicas, set_tombstone, touch_replica, update_replica_state
@@ -779,6 +780,60 @@ def test_rest_list_replicas_content_type(rse_factory, mock_scope, replica_client
     assert [header[1] for header in response.headers if header[0] == 'Content-Type'][0] == Mime.JSON_STREAM
 
 
+def test_rest_list_replicas_plan(rse_factory, mock_scope, root_account, rest_client, auth_token):
+    """ REPLICA (REST): the replica plan lists the same sources as the metalink."""
+    rse1, rse1_id = rse_factory.make_posix_rse()
+    rse2, rse2_id = rse_factory.make_posix_rse()
+    files = [{'scope': mock_scope, 'name': did_name_generator('file'), 'bytes': 1, 'adler32': '0cc737eb'} for _ in range(3)]
+    add_replicas(rse_id=rse1_id, files=files, account=root_account)
+    add_replicas(rse_id=rse2_id, files=files[:2], account=root_account)
+    data = {'dids': [{'scope': f['scope'].external, 'name': f['name']} for f in files], 'schemes': ['file']}
+
+    response = rest_client.post('/replicas/list', headers=headers(auth(auth_token), accept(Mime.METALINK)), json=data)
+    assert response.status_code == 200
+    metalink_files = parse_replicas_from_string(response.get_data(as_text=True))
+
+    response = rest_client.post('/replicas/plan', headers=headers(auth(auth_token), accept(Mime.JSON)), json=data)
+    assert response.status_code == 200
+    plan = parse_response(response.get_data(as_text=True))
+    assert sorted(plan['rses']) == sorted([rse1, rse2])
+    assert plan['scopes'] == [mock_scope.external]
+    plan_files = parse_replicas_plan(plan)
+
+    metalink_files = {f['did']: f for f in metalink_files}
+    assert sorted(f['did'] for f in plan_files) == sorted(metalink_files)
+    assert sorted(len(f['sources']) for f in plan_files) == [1, 2, 2]
+    for plan_file in plan_files:
+        metalink_file = metalink_files[plan_file['did']]
+        assert (plan_file['bytes'], plan_file['adler32']) == (metalink_file['bytes'], metalink_file['adler32'])
+        for source in metalink_file['sources']:
+            source['priority'] = int(source['priority'])
+        assert plan_file['sources'] == metalink_file['sources']
+
+    response = rest_client.post('/replicas/plan', headers=headers(auth(auth_token), accept(Mime.JSON)), json={'dids': data['dids'], 'sort': 'unknown'})
+    assert response.status_code == 400
+
+
+def test_rest_list_replicas_compressed(rse_factory, mock_scope, root_account, rest_client, auth_token):
+    """ REPLICA (REST): the streamed replicas are compressed if the client accepts it."""
+    _, rse_id = rse_factory.make_posix_rse()
+    files = [{'scope': mock_scope, 'name': did_name_generator('file'), 'bytes': 1, 'adler32': '0cc737eb'} for _ in range(3)]
+    add_replicas(rse_id=rse_id, files=files, account=root_account)
+    data = {'dids': [{'scope': f['scope'].external, 'name': f['name']} for f in files]}
+
+    response = rest_client.post('/replicas/list', headers=headers(auth(auth_token), accept(Mime.JSON_STREAM), [('Accept-Encoding', 'identity')]), json=data)
+    assert response.status_code == 200
+    assert 'Content-Encoding' not in response.headers
+    expected = sorted(replica['name'] for replica in parse_response_lines([response.get_data()]))
+    assert expected == sorted(f['name'] for f in files)
+
+    response = rest_client.post('/replicas/list', headers=headers(auth(auth_token), accept(Mime.JSON_STREAM), [('Accept-Encoding', 'gzip, deflate')]), json=data)
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert sorted(replica['name'] for replica in parse_response_lines([gzip.decompress(response.get_data())])) == expected
+
+
 def test_client_add_list_replicas(rse_factory, replica_client, mock_scope):
     """ REPLICA (CLIENT): Add, change state and list file replicas """
     rse1, _ = rse_factory.make_posix_rse()
@@ -372,6 +372,25 @@ def test_get_rse_account_usage(rse_factory, rest_client, auth_token):
     assert response.status_code == 200
 
 
+def test_get_rse_etag(rse_factory, rest_client, auth_token):
+    """ RSE (REST): Test the revalidation of the RSE settings with their ETag """
+    rse, rse_id = rse_factory.make_mock_rse()
+    response = rest_client.get(f'/rses/{rse}', headers=headers(auth(auth_token)))
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+
+    response = rest_client.get(f'/rses/{rse}', headers=headers(auth(auth_token), hdrdict({'If-None-Match': etag})))
+    assert response.status_code == 304
+    assert not response.get_data()
+
+    # The reads of the RSE served by this process see its updates at once
+    response = rest_client.put(f'/rses/{rse}', headers=headers(auth(auth_token)), json={'availability_write': False})
+    assert response.status_code == 201
+    response = rest_client.get(f'/rses/{rse}', headers=headers(auth(auth_token), hdrdict({'If-None-Match': etag})))
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
 @pytest.mark.dirty
 def test_delete_rse_attribute(vo, rest_client, auth_token):
     """ RSE (REST): Test the deletion of a RSE attribute """
@@ -13,12 +13,14 @@
 # limitations under the License.
 
 import os
+from unittest import mock
 
 import pytest
 import requests
 
-from rucio.common.exception import FileReplicaAlreadyExists
+from rucio.common.exception import FileReplicaAlreadyExists, ServiceUnavailable
 from rucio.rse import rsemanager
+from rucio.rse.protocols import webdav
 from rucio.tests.common import load_test_conf_file, skip_rse_tests_with_accounts
 
 from .rsemgr_api_test import MgrTestCases
@@ -70,3 +72,30 @@ class TestRseWebDAV(MgrTestCases):
     def setup_obj(self, setup_rse_and_files, vo):
         rse_settings, tmpdir, user = setup_rse_and_files
         self.init(tmpdir=tmpdir, rse_settings=rse_settings, user=user, vo=vo)
+
+
+@pytest.mark.parametrize('content_range,body', [
+    ('bytes 2-5/10', b'cdef'),
+    ('bytes 0-3/10', b'abcd'),
+    ('bytes 2-5/10', b'cdefgh'),
+    ('bytes 2-5/10', b'cd'),
+], ids=['valid', 'other range', 'overlong', 'short'])
+def test_get_range(tmp_path, content_range, body):
+    """ WebDAV (RSE/PROTOCOLS): Only the requested range is written to the destination """
+    dest = tmp_path / 'file'
+    dest.write_bytes(b'0' * 10)
+    response = mock.MagicMock(status_code=206, headers={'Content-Range': content_range})
+    response.iter_content.return_value = [body[:3], body[3:]]
+    protocol = webdav.Default.__new__(webdav.Default)
+    protocol.session = mock.Mock(**{'get.return_value': response})
+    protocol.timeout = 30
+    protocol.cert = None
+
+    if body == b'cdef':
+        protocol.get_range('https://storage/file', str(dest), 2, 4)
+        assert dest.read_bytes() == b'00cdef0000'
+        return
+    with pytest.raises(ServiceUnavailable):
+        protocol.get_range('https://storage/file', str(dest), 2, 4)
+    # The bytes after the range are never overwritten
+    assert dest.read_bytes()[6:] == b'0000'
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import base64
 import json
 import os
 import random
@@ -44,6 +45,7 @@ from rucio.common.exception import (
 )
 from rucio.common.types import InternalAccount, InternalScope
 from rucio.common.utils import generate_uuid as uuid
+from rucio.common.utils import parse_response_lines
 from rucio.core.account import add_account_attribute, get_account, get_usage
 from rucio.core.account_limit import set_global_account_limit, set_local_account_limit
 from rucio.core.did import add_did, attach_dids, set_status
@@ -61,7 +63,7 @@ from rucio.db.sqla import models
 from rucio.db.sqla.constants import OBSOLETE, DatabaseOperationType, DIDType, LockState, RuleState
 from rucio.db.sqla.session import db_session
 from rucio.gateway.account import add_account
-from rucio.tests.common import account_name_generator, did_name_generator, rse_name_generator
+from rucio.tests.common import account_name_generator, auth, did_name_generator, headers, rse_name_generator
 from rucio.tests.common_server import get_vo
 
 if TYPE_CHECKING:
@@ -1640,3 +1642,31 @@ def test_move_rule_invalid_argument(vo, rse_factory, did_factory, mock_scope, ro
 
     with pytest.raises(UnsupportedOperation):
         _ = move_rule(rule_id, new_rse, override={'xX_MyFirstStreetName_Xx': 17})
+
+
+def test_rest_list_rules_pages(rse_factory, mock_scope, root_account, rest_client, auth_token):
+    """ REPLICATION RULE (REST): List the rules by pages"""
+    rses = [rse_factory.make_mock_rse() for _ in range(3)]
+    files = create_files(1, mock_scope, [rse_id for _, rse_id in rses])
+    rule_ids = [add_rule(dids=files, account=root_account, copies=1, rse_expression=rse, grouping='NONE', weight=None, lifetime=None, locked=False, subscription_id=None)[0]
+                for rse, _ in rses]
+
+    rules, cursor = [], None
+    while True:
+        query = {'name': files[0]['name'], 'limit': 2}
+        if cursor:
+            query['cursor'] = cursor
+        response = rest_client.get('/rules/', query_string=query, headers=headers(auth(auth_token)))
+        assert response.status_code == 200
+        page = list(parse_response_lines([response.get_data()]))
+        assert len(page) <= 2
+        rules.extend(page)
+        cursor = response.headers.get('X-Rucio-Next-Cursor')
+        if not cursor:
+            break
+    assert [rule['id'] for rule in rules] == sorted(rule_ids)
+
+    # A tampered cursor is rejected as a bad request
+    cursor = base64.urlsafe_b64encode(json.dumps(['not a rule id']).encode()).decode()
+    response = rest_client.get('/rules/', query_string={'limit': 2, 'cursor': cursor}, headers=headers(auth(auth_token)))
+    assert response.status_code == 400
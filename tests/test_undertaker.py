@@ -18,14 +18,16 @@ from logging import getLogger
 
 import pytest
 
+from rucio.common.exception import DataIdentifierNotFound
 from rucio.common.types import InternalScope
 from rucio.core.account_limit import set_local_account_limit
-from rucio.core.did import add_dids, attach_dids, get_did, list_expired_dids, set_metadata
+from rucio.core.did import add_dids, attach_dids, delete_dids, get_did, list_expired_dids, set_metadata
 from rucio.core.replica import add_replicas, get_replica
 from rucio.core.rse import add_rse
 from rucio.core.rule import add_rules, list_rules
 from rucio.daemons.judge.cleaner import rule_cleaner
 from rucio.daemons.undertaker.undertaker import undertaker
+from rucio.db.sqla.constants import DIDType
 from rucio.db.sqla.util import json_implemented
 from rucio.tests.common import did_name_generator, rse_name_generator
 
@@ -186,3 +188,32 @@ def test_removal_all_replicas2(rse_factory, root_account, mock_scope, core_confi
         assert get_replica(scope=replica['scope'], name=replica['name'], rse_id=rse1_id)['tombstone'] == datetime(year=1970, month=1, day=1)
     for replica in replicas:
         assert get_replica(scope=replica['scope'], name=replica['name'], rse_id=rse2_id)['tombstone'] == datetime(year=1970, month=1, day=1)
+
+
+@pytest.mark.noparallel(reason='runs undertaker, which impacts other tests')
+@pytest.mark.parametrize("core_config_mock", [{"table_content": [
+    ('undertaker', 'expire_rules_locks_size', 1)
+]}], indirect=True)
+@pytest.mark.parametrize("caches_mock", [{"caches_to_mock": [
+    'rucio.core.config.REGION',
+]}], indirect=True)
+def test_delete_dids_with_expired_rules(rse_factory, root_account, mock_scope, core_config_mock, caches_mock):
+    """ UNDERTAKER (CORE): Test that an expired large rule does not prevent the deletion of the other DIDs of the chunk. """
+    rse, rse_id = rse_factory.make_mock_rse()
+    set_local_account_limit(root_account, rse_id, -1)
+
+    dsns = [{'name': did_name_generator('dataset'), 'scope': mock_scope, 'type': 'DATASET'} for _ in range(2)]
+    add_dids(dids=dsns, account=root_account)
+    for dsn in dsns:
+        files = [{'scope': mock_scope, 'name': did_name_generator('file'), 'bytes': 1, 'adler32': '0cc737eb'} for _ in range(2)]
+        attach_dids(scope=mock_scope, name=dsn['name'], rse_id=rse_id, dids=files, account=root_account)
+    # Only the first dataset has a rule with more locks than expire_rules_locks_size
+    add_rules(dids=dsns[:1], rules=[{'account': root_account, 'copies': 1, 'rse_expression': rse, 'grouping': 'DATASET'}])
+
+    dids = [{'scope': mock_scope, 'name': dsn['name'], 'did_type': DIDType.DATASET, 'purge_replicas': True} for dsn in dsns]
+    delete_dids(dids=dids, account=root_account, expire_rules=True)
+
+    assert get_did(scope=mock_scope, name=dsns[0]['name'])['name'] == dsns[0]['name']
+    assert len(list(list_rules(filters={'scope': mock_scope, 'name': dsns[0]['name']}))) == 1
+    with pytest.raises(DataIdentifierNotFound):
+        get_did(scope=mock_scope, name=dsns[1]['name'])
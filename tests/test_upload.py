@@ -585,6 +585,34 @@ def test_upload_repeated_file_dataset(file_factory, rse_factory, rucio_client, u
     assert tmp_file2_name in files
 
 
+def test_upload_pipelined(file_factory, rse_factory, rucio_client, upload_client, scope):
+    """CLIENT(USER): Pipelined upload registers the files, their dataset attachment and rules in bulk"""
+    rse, _ = rse_factory.make_posix_rse()
+    dataset = f"DSet{generate_uuid()}"
+    dataset_files = [file_factory.file_generator() for _ in range(3)]
+    single_file = file_factory.file_generator()
+
+    items: list[FileToUploadDict] = [
+        {"path": path, "rse": rse, "did_scope": scope, "dataset_scope": scope, "dataset_name": dataset} for path in dataset_files
+    ]
+    items.append({"path": single_file, "rse": rse, "did_scope": scope})
+    status = upload_client.upload_pipelined(items, num_threads=3, max_threads_per_rse=2, registration_chunk_size=2)
+    assert status == 0
+
+    files = [f['name'] for f in rucio_client.list_files(scope=scope, name=dataset)]
+    assert sorted(files) == sorted(os.path.basename(path) for path in dataset_files)
+    for path in dataset_files + [single_file]:
+        replicas = list(rucio_client.list_replicas([{'scope': scope, 'name': os.path.basename(path)}]))
+        assert replicas[0]['adler32'] == adler32(path)
+        assert rse in replicas[0]['rses']
+    assert len(list(rucio_client.list_did_rules(scope=scope, name=os.path.basename(single_file)))) == 1
+    assert len(list(rucio_client.list_did_rules(scope=scope, name=dataset))) == 1
+
+    # Files which are already registered are skipped
+    with pytest.raises(NoFilesUploaded):
+        upload_client.upload_pipelined([{"path": single_file, "rse": rse, "did_scope": scope}])
+
+
 def test_upload_adds_md5digest(file_factory, rse_factory, rucio_client, upload_client, scope):
     """CLIENT(USER): Upload Checksums"""
     # user has a file to upload
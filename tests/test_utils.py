@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import datetime
+import hashlib
 import logging
 import os
 import types
@@ -205,6 +206,21 @@ def test_bittorrent_sa256_merkle(file_factory):
         assert (root, layers, piece_size) == _sha256_merkle_via_libtorrent(file, piece_size=piece_size)
 
 
+def test_bittorrent_sha256_merkle_threads(file_factory, tmp_path, monkeypatch):
+    file = tmp_path / 'file.bin'
+    file.write_bytes(bytes(range(256)) * 4097)
+    root, layers, piece_size = bittorrent_v2_merkle_sha256(file, num_threads=1)
+    assert root.hex() == '4370afc811068e459083b285198b6ddb51517ea0b30fc901fc6fda0f8bc31b63'
+    assert hashlib.sha256(layers).hexdigest() == 'ec9b5c8ac9536d8e304f3039eb107e383ca90118c07ff8540aae0c591264b853'
+    assert piece_size == 65536
+
+    # One piece per chunk, hashed by concurrent threads, must give the same tree
+    monkeypatch.setattr('rucio.common.bittorrent._CHUNK_SIZE', 1)
+    for size in (0, 1, 16384, 32769, 65536, 2 ** 20 + 2):
+        file = file_factory.file_generator(size=size)
+        assert bittorrent_v2_merkle_sha256(file, num_threads=4) == bittorrent_v2_merkle_sha256(file, num_threads=1)
+
+
 # A sample callable that deliberately includes:
 #   * positional parameter with a default (b)
 #   * keyword‑only parameter with a default (k)
@@ -11,12 +11,14 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import gzip
 import logging
+import zlib
 
 import pytest
 from werkzeug import exceptions
 
-from rucio.web.rest.flaskapi.v1.common import param_get_bool
+from rucio.web.rest.flaskapi.v1.common import _compress_chunks, _join_chunks, param_get_bool
 
 
 @pytest.mark.parametrize(
@@ -68,3 +70,66 @@ def test_param_get_bool(params, kwargs, raise_log, raise_error, caplog):
 
     if raise_log:
         assert "Booleans should only accept true/false. Please change 0/1 to true/false." in caplog.text
+
+
+@pytest.mark.parametrize('items', [['a\n', 'bc\n', 'def\n', 'g\n'], [b'a\n', b'bc\n', b'def\n', b'g\n']])
+def test_join_chunks(items):
+    assert list(_join_chunks(items, 5)) == [items[0] + items[1], items[2] + items[3]]
+    assert list(_join_chunks(items, 1)) == items
+    assert list(_join_chunks([], 5)) == []
+
+
+def test_join_chunks_error():
+    def items():
+        yield 'a\n'
+        raise ValueError('error while streaming')
+
+    chunks = _join_chunks(items(), 5)
+    assert next(chunks) == 'a\n'
+    with pytest.raises(ValueError):
+        next(chunks)
+
+
+def test_compress_chunks():
+    chunks = list(_compress_chunks(['{"a": 1}\n', b'{"b": 2}\n'], 'gzip'))
+    assert len(chunks) == 3
+    assert gzip.decompress(b''.join(chunks)) == b'{"a": 1}\n{"b": 2}\n'
+    # every chunk is decodable as soon as it is received
+    assert zlib.decompressobj(31).decompress(chunks[0]) == b'{"a": 1}\n'
+
+
+def test_instrumentation_middleware(metrics_mock, caplog, monkeypatch):
+    from flask import Flask
+    from sqlalchemy import text
+    from werkzeug.test import Client
+
+    from rucio.db.sqla.constants import DatabaseOperationType
+    from rucio.db.sqla.session import db_session
+    from rucio.web.rest.flaskapi.v1 import common
+
+    def list_items():
+        with db_session(DatabaseOperationType.READ) as session:
+            session.execute(text('SELECT 1'))
+            session.execute(text('SELECT 2'))
+        return common.try_stream('{"item": %d}\n' % i for i in range(3))
+
+    app = Flask(__name__)
+    app.add_url_rule('/items', 'items', list_items)
+    app.before_request(common.record_endpoint)
+    app.wsgi_app = common.InstrumentationMiddleware(app.wsgi_app)
+    monkeypatch.setattr(common, 'SLOW_REQUEST_THRESHOLD', 0)
+
+    with caplog.at_level(logging.WARNING):
+        response = Client(app).get('/items')
+        assert response.data == b'{"item": 0}\n{"item": 1}\n{"item": 2}\n'
+        response.close()
+
+    labels = {'endpoint': 'items', 'method': 'GET', 'status': '200'}
+    prefix = 'rucio_web_rest_flaskapi_v1_common_requests'
+    assert metrics_mock.get_sample_value(prefix + '_duration_count', labels) == 1
+    assert metrics_mock.get_sample_value(prefix + '_bytes_total', labels) == len(response.data)
+    assert metrics_mock.get_sample_value(prefix + '_items_total', labels) == 3
+    assert metrics_mock.get_sample_value(prefix + '_queries_total', labels) >= 2
+    assert metrics_mock.get_sample_value(prefix + '_query_duration_count', labels) == 1
+    assert 'Slow request GET /items (items, status 200' in caplog.text
+    assert 'SELECT 2' in caplog.text
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# Copyright European Organization for Nuclear Research (CERN) since 2012
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Compare the throughput of the per-algorithm checksum functions with the single-pass
+checksum engine on large files.
+
+The benchmark computes the requested checksums of each file three ways: one function
+per algorithm (the file is read once per algorithm), one pass feeding all algorithms,
+and one pass with the algorithms running in worker threads. The files are generated
+in a temporary directory unless given on the command line. Unless the page cache is
+dropped between the runs, the files are read from memory after the first run.
+
+Example:
+    tools/benchmark_checksum.py --size 4096 --files 2 --algorithms adler32 md5 sha256
+"""
+
+import os.path
+import sys
+
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(base_path)
+os.chdir(base_path)
+
+import json  # noqa: E402
+import tempfile  # noqa: E402
+import time  # noqa: E402
+from argparse import ArgumentParser  # noqa: E402
+
+from rucio.common.checksum import BLOCK_SIZE, CHECKSUM_ALGO_DICT, checksums  # noqa: E402
+
+
+def generate_files(directory, nb_files, size_mb):
+    paths = []
+    block = os.urandom(1024 * 1024)
+    for index in range(nb_files):
+        path = os.path.join(directory, 'benchmark_checksum_%s' % index)
+        with open(path, 'wb') as f:
+            for _ in range(size_mb):
+                f.write(block)
+        paths.append(path)
+    return paths
+
+
+def measure(function, paths, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for path in paths:
+            result = function(path)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_benchmark(args):
+    tmp_dir = None
+    paths = args.paths
+    if not paths:
+        tmp_dir = tempfile.mkdtemp(prefix='benchmark_checksum_')
+        paths = generate_files(tmp_dir, args.files, args.size)
+    total_mb = sum(os.stat(path).st_size for path in paths) / 1024 / 1024
+
+    modes = {
+        'separate': lambda path: {name: CHECKSUM_ALGO_DICT[name](path) for name in args.algorithms},
+        'single_pass': lambda path: checksums(path, args.algorithms, block_size=args.block_size),
+        'single_pass_threads': lambda path: checksums(path, args.algorithms, num_threads=len(args.algorithms), block_size=args.block_size),
+    }
+    report = {'algorithms': args.algorithms, 'files': len(paths), 'total_mb': round(total_mb, 1), 'block_size': args.block_size}
+    results = {}
+    try:
+        for mode, function in modes.items():
+            elapsed, results[mode] = measure(function, paths, args.repeat)
+            report['%s_seconds' % mode] = round(elapsed, 3)
+            report['%s_mb_per_second' % mode] = round(total_mb / elapsed, 1) if elapsed else None
+    finally:
+        if tmp_dir:
+            for path in paths:
+                os.unlink(path)
+            os.rmdir(tmp_dir)
+    report['consistent'] = len({json.dumps(result, sort_keys=True) for result in results.values()}) == 1
+    return report
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser(
+        prog="benchmark_checksum.py",
+        description="Compare the per-algorithm checksum functions with the single-pass checksum engine."
+    )
+    parser.add_argument('paths', nargs='*', help='Files to checksum; generated if not given')
+    parser.add_argument('--files', type=int, default=1, help='Number of files to generate')
+    parser.add_argument('--size', type=int, default=2048, help='Size of the generated files in MiB')
+    parser.add_argument('--algorithms', nargs='+', default=['adler32', 'md5'], choices=sorted(CHECKSUM_ALGO_DICT), help='Checksum algorithms')
+    parser.add_argument('--block-size', type=int, default=BLOCK_SIZE, help='Size of the blocks read by the single-pass engine')
+    parser.add_argument('--repeat', type=int, default=1, help='Number of runs per mode; the best one is reported')
+    parser.add_argument('--json', action='store_true', default=False, help='Print the report as JSON')
+    args = parser.parse_args()
+
+    report = run_benchmark(args)
+    if args.json:
+        print(json.dumps(report))
+    else:
+        for key, value in report.items():
+            print('%-34s %s' % (key, value))
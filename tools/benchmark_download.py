@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# Copyright European Organization for Nuclear Research (CERN) since 2012
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure the download throughput of the download client for several concurrency settings.
+
+The benchmark downloads the given DIDs once per number of threads into a temporary
+directory, with the max_threads_per_rse and max_threads_per_host limits given on the
+command line, and reports the elapsed time, the throughput, the number of protocol
+connections and the highest number of concurrent transfers seen. The DIDs must have
+replicas on an RSE reachable from this host and the client must be configured for a
+Rucio server. A latency can be added to each transfer to simulate a remote storage
+when benchmarking against a local one.
+
+Example:
+    tools/benchmark_download.py user.jdoe:dataset --threads 1 5 10 --max-threads-per-rse 4 --latency 0.2
+"""
+
+import os.path
+import sys
+
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(base_path)
+os.chdir(base_path)
+
+import json  # noqa: E402
+import shutil  # noqa: E402
+import tempfile  # noqa: E402
+import threading  # noqa: E402
+import time  # noqa: E402
+from argparse import ArgumentParser  # noqa: E402
+
+from rucio.client.downloadclient import DownloadClient, FileDownloadState  # noqa: E402
+from rucio.rse import rsemanager as rsemgr  # noqa: E402
+
+
+class TransferStatistics:
+    """
+    Count the protocol connections and the concurrent transfers of the download client.
+    """
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.connects = 0
+        self.transfers = 0
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def wrap(self, protocol):
+        connect, get, get_range = protocol.connect, protocol.get, getattr(protocol, 'get_range', None)
+
+        def counted_connect(*args, **kwargs):
+            with self._lock:
+                self.connects += 1
+            return connect(*args, **kwargs)
+
+        def timed(function):
+            def transfer(*args, **kwargs):
+                with self._lock:
+                    self.transfers += 1
+                    self.running += 1
+                    self.max_running = max(self.max_running, self.running)
+                try:
+                    if self.latency:
+                        time.sleep(self.latency)
+                    return function(*args, **kwargs)
+                finally:
+                    with self._lock:
+                        self.running -= 1
+            return transfer
+
+        protocol.connect = counted_connect
+        protocol.get = timed(get)
+        if get_range is not None:
+            protocol.get_range = timed(get_range)
+        return protocol
+
+
+def directory_size(directory):
+    files, size = 0, 0
+    for root, _, names in os.walk(directory):
+        for name in names:
+            files += 1
+            size += os.path.getsize(os.path.join(root, name))
+    return files, size
+
+
+def run_download(args, num_threads):
+    statistics = TransferStatistics(args.latency)
+    create_protocol = rsemgr.create_protocol
+    rsemgr.create_protocol = lambda *a, **kw: statistics.wrap(create_protocol(*a, **kw))
+
+    client = DownloadClient()
+    client.max_threads = num_threads
+    client.max_threads_per_rse = args.max_threads_per_rse
+    client.max_threads_per_host = args.max_threads_per_host
+
+    base_dir = tempfile.mkdtemp(prefix='benchmark_download_')
+    items = [{'did': did, 'base_dir': base_dir, 'rse': args.rse} for did in args.dids]
+    try:
+        start = time.perf_counter()
+        results = client.download_dids(items, num_threads=num_threads, deactivate_file_download_exceptions=True)
+        elapsed = time.perf_counter() - start
+        files, size = directory_size(base_dir)
+    finally:
+        rsemgr.create_protocol = create_protocol
+        shutil.rmtree(base_dir, ignore_errors=True)
+
+    total_mb = size / 1024 / 1024
+    return {
+        'threads': num_threads,
+        'files': files,
+        'failed': sum(1 for result in results if result.get('clientState') not in (FileDownloadState.DONE, FileDownloadState.ALREADY_DONE)),
+        'total_mb': round(total_mb, 1),
+        'seconds': round(elapsed, 3),
+        'files_per_second': round(files / elapsed, 1) if elapsed else None,
+        'mb_per_second': round(total_mb / elapsed, 1) if elapsed else None,
+        'connects': statistics.connects,
+        'transfers': statistics.transfers,
+        'max_concurrent_transfers': statistics.max_running,
+    }
+
+
+def run_benchmark(args):
+    return [run_download(args, num_threads) for num_threads in args.threads]
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser(
+        prog="benchmark_download.py",
+        description="Measure the download throughput of the download client for several concurrency settings."
+    )
+    parser.add_argument('dids', nargs='+', help='DIDs to download, e.g. scope:name')
+    parser.add_argument('--rse', default=None, help='RSE expression to download from')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 5, 10], help='Numbers of download threads to compare')
+    parser.add_argument('--max-threads-per-rse', type=int, default=0, help='Concurrent transfers allowed per RSE; 0 for no limit')
+    parser.add_argument('--max-threads-per-host', type=int, default=0, help='Concurrent transfers allowed per storage host; 0 for no limit')
+    parser.add_argument('--latency', type=float, default=0, help='Seconds added to each transfer to simulate a remote storage')
+    parser.add_argument('--json', action='store_true', default=False, help='Print the report as JSON')
+    args = parser.parse_args()
+
+    reports = run_benchmark(args)
+    if args.json:
+        print(json.dumps(reports))
+    else:
+        for report in reports:
+            for key, value in report.items():
+                print('%-28s %s' % (key, value))
+            print()
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# Copyright European Organization for Nuclear Research (CERN) since 2012
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure the reaper throughput on a generated dataset, without any real storage.
+
+The benchmark creates temporary RSEs using the mock protocol (nothing is deleted)
+or the posix protocol (empty files are created and deleted in a temporary directory),
+registers tombstoned replicas on them and runs the reaper until all replicas are gone.
+It reports the deleted replicas per second, the number of SQL statements and their
+duration per deleted chunk and the peak memory of the process.
+
+It uses the database configured in rucio.cfg: run it against a dedicated
+SQLite or PostgreSQL database, never against a production instance.
+
+Example:
+    tools/benchmark_reaper.py --rses 5 --replicas 20000 --chunk-size 1000 --threads 4
+"""
+
+import os.path
+import sys
+
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(base_path)
+os.chdir(base_path)
+
+import json  # noqa: E402
+import logging  # noqa: E402
+import math  # noqa: E402
+import resource  # noqa: E402
+import tempfile  # noqa: E402
+import threading  # noqa: E402
+import time  # noqa: E402
+from argparse import ArgumentParser  # noqa: E402
+from datetime import datetime, timedelta  # noqa: E402
+
+from sqlalchemy import event, func, select  # noqa: E402
+
+from rucio.common.exception import Duplicate  # noqa: E402
+from rucio.common.logging import setup_logging  # noqa: E402
+from rucio.common.types import InternalAccount, InternalScope  # noqa: E402
+from rucio.common.utils import chunks, generate_uuid  # noqa: E402
+from rucio.core.replica import add_replicas  # noqa: E402
+from rucio.core.rse import add_protocol, add_rse, del_rse, set_rse_limits, set_rse_usage  # noqa: E402
+from rucio.core.scope import add_scope  # noqa: E402
+from rucio.daemons.reaper import reaper as reaper_daemon  # noqa: E402
+from rucio.db.sqla import models  # noqa: E402
+from rucio.db.sqla.constants import DatabaseOperationType  # noqa: E402
+from rucio.db.sqla.session import db_session, get_engine  # noqa: E402
+from rucio.rse import rsemanager as rsemgr  # noqa: E402
+
+LOG = logging.getLogger(__name__)
+
+PROTOCOLS = {
+    'mock': {'scheme': 'MOCK',
+             'hostname': 'localhost',
+             'port': 123,
+             'prefix': '/benchmark/reaper',
+             'impl': 'rucio.rse.protocols.mock.Default'},
+    'posix': {'scheme': 'file',
+              'hostname': 'localhost',
+              'port': 0,
+              'prefix': None,  # set to a temporary directory per RSE
+              'impl': 'rucio.rse.protocols.posix.Default'},
+}
+
+
+class StatementCounter:
+    """
+    Count the SQL statements executed by the engine and their total duration.
+    """
+
+    def __init__(self, engine):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.count = 0
+        self.duration = 0.0
+        event.listen(engine, 'before_cursor_execute', self._before)
+        event.listen(engine, 'after_cursor_execute', self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        self._local.start = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - getattr(self._local, 'start', time.perf_counter())
+        with self._lock:
+            self.count += 1
+            self.duration += duration
+
+    def snapshot(self):
+        with self._lock:
+            return self.count, self.duration
+
+
+def create_dataset(nb_rses, nb_replicas, file_size, scope, protocol, tmp_dir):
+    """
+    Create the RSEs and register the tombstoned replicas on them.
+
+    :returns: A dictionary {rse_name: rse_id}.
+    """
+    account = InternalAccount('root')
+    try:
+        with db_session(DatabaseOperationType.WRITE) as session:
+            add_scope(scope, account, session=session)
+    except Duplicate:
+        pass
+
+    rses = {}
+    tombstone = datetime.utcnow() - timedelta(days=1)
+    for _ in range(nb_rses):
+        rse_name = 'BENCHMARK-REAPER-%s' % generate_uuid()[:8].upper()
+        rse_id = add_rse(rse_name)
+        parameters = dict(PROTOCOLS[protocol])
+        if protocol == 'posix':
+            parameters['prefix'] = os.path.join(tmp_dir, rse_name)
+            os.makedirs(parameters['prefix'])
+        parameters['domains'] = {'lan': {'read': 1, 'write': 1, 'delete': 1},
+                                 'wan': {'read': 1, 'write': 1, 'delete': 1}}
+        add_protocol(rse_id=rse_id, parameter=parameters)
+
+        files = [{'scope': scope, 'name': 'benchmark_reaper_%s' % generate_uuid(), 'bytes': file_size,
+                  'adler32': '0cc737eb', 'tombstone': tombstone} for _ in range(nb_replicas)]
+        for files_chunk in chunks(files, 100):
+            with db_session(DatabaseOperationType.WRITE) as session:
+                add_replicas(rse_id=rse_id, files=files_chunk, account=account, session=session)
+
+        if protocol == 'posix':
+            rse_info = rsemgr.get_rse_info(rse_id=rse_id)
+            pfns = rsemgr.lfns2pfns(rse_settings=rse_info, lfns=[{'scope': scope.external, 'name': file['name']} for file in files],
+                                    operation='write', scheme='file')
+            for pfn in pfns.values():
+                path = pfn.split('://', 1)[-1]
+                path = path[path.index('/'):]
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                open(path, 'w').close()
+
+        # Make the reaper believe that all the registered space must be freed
+        set_rse_limits(rse_id=rse_id, name='MinFreeSpace', value=nb_replicas * file_size)
+        set_rse_usage(rse_id=rse_id, source='storage', used=nb_replicas * file_size, free=0)
+        rses[rse_name] = rse_id
+    return rses
+
+
+def count_replicas(rse_ids):
+    with db_session(DatabaseOperationType.READ) as session:
+        stmt = select(
+            func.count()
+        ).select_from(
+            models.RSEFileAssociation
+        ).where(
+            models.RSEFileAssociation.rse_id.in_(rse_ids)
+        )
+        return session.execute(stmt).scalar_one()
+
+
+def run_benchmark(args):
+    scope = InternalScope(args.scope)
+    tmp_dir = tempfile.mkdtemp(prefix='benchmark_reaper_') if args.protocol == 'posix' else None
+
+    LOG.info('Creating %s RSEs with %s replicas each', args.rses, args.replicas)
+    start = time.time()
+    rses = create_dataset(args.rses, args.replicas, args.file_size, scope, args.protocol, tmp_dir)
+    LOG.info('Dataset created in %.2f seconds', time.time() - start)
+
+    total_replicas = args.rses * args.replicas
+    counter = StatementCounter(get_engine())
+    statements_start, sql_duration_start = counter.snapshot()
+    iterations = 0
+    remaining = total_replicas
+    start = time.time()
+    while remaining and iterations < args.max_iterations:
+        iterations += 1
+        # The reaper pauses RSEs which returned less than chunk_size replicas; the benchmark wants to go on
+        for rse_id in rses.values():
+            reaper_daemon.REGION.delete('pause_deletion_%s' % rse_id)
+        reaper_daemon.run(threads=args.threads, chunk_size=args.chunk_size, once=True, greedy=args.greedy,
+                          rses=list(rses), scheme=PROTOCOLS[args.protocol]['scheme'])
+        remaining = count_replicas(list(rses.values()))
+        LOG.info('Iteration %s: %s replicas remaining', iterations, remaining)
+    elapsed = time.time() - start
+    statements, sql_duration = counter.snapshot()
+    statements -= statements_start
+    sql_duration -= sql_duration_start
+
+    deleted = total_replicas - remaining
+    nb_chunks = max(1, math.ceil(deleted / args.chunk_size))
+    report = {
+        'protocol': args.protocol,
+        'rses': args.rses,
+        'replicas': total_replicas,
+        'chunk_size': args.chunk_size,
+        'threads': args.threads,
+        'greedy': args.greedy,
+        'iterations': iterations,
+        'deleted': deleted,
+        'remaining': remaining,
+        'elapsed': round(elapsed, 3),
+        'deleted_per_second': round(deleted / elapsed, 1) if elapsed else None,
+        'sql_statements': statements,
+        'sql_statements_per_chunk': round(statements / nb_chunks, 1),
+        'sql_seconds_per_chunk': round(sql_duration / nb_chunks, 4),
+        'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+    if not args.keep:
+        for rse_id in rses.values():
+            if count_replicas([rse_id]) == 0:
+                del_rse(rse_id)
+        if tmp_dir:
+            for root, dirs, files in os.walk(tmp_dir, topdown=False):
+                for name in dirs:
+                    os.rmdir(os.path.join(root, name))
+            os.rmdir(tmp_dir)
+    return report
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser(
+        prog="benchmark_reaper.py",
+        description="Measure the reaper throughput on a generated dataset using the mock or posix protocol."
+    )
+    parser.add_argument('--rses', type=int, default=1, help='Number of RSEs to create')
+    parser.add_argument('--replicas', type=int, default=10000, help='Number of replicas per RSE')
+    parser.add_argument('--file-size', type=int, default=1000, help='Size in bytes registered for each replica')
+    parser.add_argument('--protocol', choices=sorted(PROTOCOLS), default='mock', help='Protocol used by the RSEs')
+    parser.add_argument('--scope', default='mock', help='Scope of the generated replicas, created if needed')
+    parser.add_argument('--chunk-size', type=int, default=100, help='Reaper chunk size')
+    parser.add_argument('--threads', type=int, default=1, help='Number of reaper threads')
+    parser.add_argument('--greedy', action='store_true', default=False, help='Run the reaper in greedy mode')
+    parser.add_argument('--max-iterations', type=int, default=1000, help='Maximum number of reaper cycles')
+    parser.add_argument('--keep', action='store_true', default=False, help='Do not delete the generated RSEs at the end')
+    parser.add_argument('--json', action='store_true', default=False, help='Print the report as JSON')
+    args = parser.parse_args()
+
+    setup_logging(process_name='benchmark-reaper')
+    report = run_benchmark(args)
+    if args.json:
+        print(json.dumps(report))
+    else:
+        for key, value in report.items():
+            print('%-26s %s' % (key, value))
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# Copyright European Organization for Nuclear Research (CERN) since 2012
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure the undertaker throughput for one or several chunk sizes.
+
+For each chunk size, the benchmark registers expired datasets with their files on a
+temporary mock RSE (optionally protected by rules) and runs the undertaker until
+all of them are deleted. It reports the deleted DIDs per second and the number of
+SQL statements and their duration per deleted dataset.
+
+It uses the database configured in rucio.cfg: run it against a dedicated
+SQLite or PostgreSQL database, never against a production instance.
+
+Example:
+    tools/benchmark_undertaker.py --datasets 2000 --files 10 --chunk-size 10 100 1000
+"""
+
+import os.path
+import sys
+
+base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(base_path)
+os.chdir(base_path)
+
+import json  # noqa: E402
+import logging  # noqa: E402
+import threading  # noqa: E402
+import time  # noqa: E402
+from argparse import ArgumentParser  # noqa: E402
+
+from sqlalchemy import event, func, select  # noqa: E402
+
+from rucio.common.exception import Duplicate  # noqa: E402
+from rucio.common.logging import setup_logging  # noqa: E402
+from rucio.common.types import InternalAccount, InternalScope  # noqa: E402
+from rucio.common.utils import chunks, generate_uuid  # noqa: E402
+from rucio.core.account_limit import set_local_account_limit  # noqa: E402
+from rucio.core.did import add_dids, attach_dids  # noqa: E402
+from rucio.core.rse import add_protocol, add_rse  # noqa: E402
+from rucio.core.rule import add_rules  # noqa: E402
+from rucio.core.scope import add_scope  # noqa: E402
+from rucio.daemons.undertaker import undertaker as undertaker_daemon  # noqa: E402
+from rucio.db.sqla import models  # noqa: E402
+from rucio.db.sqla.constants import DatabaseOperationType, DIDType  # noqa: E402
+from rucio.db.sqla.session import db_session, get_engine  # noqa: E402
+
+LOG = logging.getLogger(__name__)
+
+
+class StatementCounter:
+    """
+    Count the SQL statements executed by the engine and their total duration.
+    """
+
+    def __init__(self, engine):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.count = 0
+        self.duration = 0.0
+        event.listen(engine, 'before_cursor_execute', self._before)
+        event.listen(engine, 'after_cursor_execute', self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        self._local.start = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - getattr(self._local, 'start', time.perf_counter())
+        with self._lock:
+            self.count += 1
+            self.duration += duration
+
+    def snapshot(self):
+        with self._lock:
+            return self.count, self.duration
+
+
+def create_dataset(prefix, nb_datasets, nb_files, with_rules, scope):
+    """
+    Register the expired datasets and their files on a new mock RSE.
+
+    :returns: The name of the RSE.
+    """
+    account = InternalAccount('root')
+    try:
+        with db_session(DatabaseOperationType.WRITE) as session:
+            add_scope(scope, account, session=session)
+    except Duplicate:
+        pass
+
+    rse_name = 'BENCHMARK-UNDERTAKER-%s' % generate_uuid()[:8].upper()
+    rse_id = add_rse(rse_name)
+    add_protocol(rse_id=rse_id, parameter={'scheme': 'MOCK', 'hostname': 'localhost', 'port': 123,
+                                           'prefix': '/benchmark/undertaker', 'impl': 'rucio.rse.protocols.mock.Default',
+                                           'domains': {'lan': {'read': 1, 'write': 1, 'delete': 1},
+                                                       'wan': {'read': 1, 'write': 1, 'delete': 1}}})
+    set_local_account_limit(account, rse_id, -1)
+
+    datasets = [{'scope': scope, 'name': '%s_%s' % (prefix, generate_uuid()), 'type': 'DATASET', 'lifetime': -1} for _ in range(nb_datasets)]
+    for datasets_chunk in chunks(datasets, 100):
+        with db_session(DatabaseOperationType.WRITE) as session:
+            add_dids(dids=datasets_chunk, account=account, session=session)
+            for dataset in datasets_chunk:
+                files = [{'scope': scope, 'name': '%s_file_%s' % (prefix, generate_uuid()), 'bytes': 1, 'adler32': '0cc737eb'} for _ in range(nb_files)]
+                attach_dids(scope=scope, name=dataset['name'], rse_id=rse_id, dids=files, account=account, session=session)
+        if with_rules:
+            with db_session(DatabaseOperationType.WRITE) as session:
+                add_rules(dids=datasets_chunk, rules=[{'account': account, 'copies': 1, 'rse_expression': rse_name, 'grouping': 'DATASET'}], session=session)
+    return rse_name
+
+
+def count_datasets(prefix, scope):
+    with db_session(DatabaseOperationType.READ) as session:
+        stmt = select(
+            func.count()
+        ).select_from(
+            models.DataIdentifier
+        ).where(
+            models.DataIdentifier.scope == scope,
+            models.DataIdentifier.name.startswith(prefix, autoescape=True),
+            models.DataIdentifier.did_type == DIDType.DATASET
+        )
+        return session.execute(stmt).scalar_one()
+
+
+def run_benchmark(args, chunk_size, counter):
+    scope = InternalScope(args.scope)
+    prefix = 'benchmark_undertaker_%s' % generate_uuid()[:8]
+
+    LOG.info('Creating %s expired datasets with %s files each', args.datasets, args.files)
+    start = time.time()
+    rse_name = create_dataset(prefix, args.datasets, args.files, args.rules, scope)
+    LOG.info('Dataset created in %.2f seconds', time.time() - start)
+
+    statements_start, sql_duration_start = counter.snapshot()
+    iterations = 0
+    remaining = args.datasets
+    start = time.time()
+    while remaining and iterations < args.max_iterations:
+        iterations += 1
+        undertaker_daemon.undertaker(once=True, chunk_size=chunk_size)
+        remaining = count_datasets(prefix, scope)
+        LOG.info('Iteration %s: %s datasets remaining', iterations, remaining)
+    elapsed = time.time() - start
+    statements, sql_duration = counter.snapshot()
+    statements -= statements_start
+    sql_duration -= sql_duration_start
+
+    deleted = args.datasets - remaining
+    return {
+        'chunk_size': chunk_size,
+        'rse': rse_name,
+        'datasets': args.datasets,
+        'files_per_dataset': args.files,
+        'rules': args.rules,
+        'iterations': iterations,
+        'deleted': deleted,
+        'remaining': remaining,
+        'elapsed': round(elapsed, 3),
+        'deleted_per_second': round(deleted / elapsed, 1) if elapsed else None,
+        'sql_statements': statements,
+        'sql_statements_per_dataset': round(statements / max(1, deleted), 1),
+        'sql_seconds_per_dataset': round(sql_duration / max(1, deleted), 5),
+    }
+
+
+if __name__ == '__main__':
+
+    parser = ArgumentParser(
+        prog="benchmark_undertaker.py",
+        description="Measure the undertaker throughput on generated expired datasets for several chunk sizes."
+    )
+    parser.add_argument('--datasets', type=int, default=1000, help='Number of expired datasets to create per run')
+    parser.add_argument('--files', type=int, default=5, help='Number of files attached to each dataset')
+    parser.add_argument('--rules', action='store_true', default=False, help='Protect each dataset with a rule')
+    parser.add_argument('--scope', default='mock', help='Scope of the generated DIDs, created if needed')
+    parser.add_argument('--chunk-size', type=int, nargs='+', default=[10], help='Undertaker chunk sizes to compare, one run each')
+    parser.add_argument('--max-iterations', type=int, default=1000, help='Maximum number of undertaker cycles per run')
+    parser.add_argument('--json', action='store_true', default=False, help='Print the reports as JSON')
+    args = parser.parse_args()
+
+    setup_logging(process_name='benchmark-undertaker')
+    counter = StatementCounter(get_engine())
+    reports = [run_benchmark(args, chunk_size, counter) for chunk_size in args.chunk_size]
+    if args.json:
+        print(json.dumps(reports))
+    else:
+        for report in reports:
+            for key, value in report.items():
+                print('%-28s %s' % (key, value))
+            print()